@@ -0,0 +1,173 @@
+"""Report the memory and disk footprint of the clean accounts with compact dtypes.
+
+Compares the clean accounts of ``ALL_COUNTRY_CODES`` as written by default against
+``compact_eu_klems_accounts`` with float64 and float32 values. Each mode is written to
+a clean accounts dataset with ``write_accounts`` and read back per country with
+``read_accounts``, like the analysis does. Reported are the size of the Parquet
+dataset on disk, the memory of the accounts read of all countries and of their
+concatenation per account, and whether the industry and country codes are still
+categorical after the concatenation. The accounts are the ones in
+``bld/python/data_clean``, so run ``pytask`` first, or synthetic ones with
+``SYNTHETIC_INDUSTRIES`` industries if they are missing.
+
+Run from the project root with ``python -m benchmarks.benchmark_compact_dtypes``.
+
+"""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from measuring_intangible_capital.config import (
+    ALL_COUNTRY_CODES,
+    DATA_CLEAN_PATH,
+    EU_KLEMS_INDUSTRIES,
+    SRC,
+)
+from measuring_intangible_capital.data_management.accounts_dataset import (
+    read_accounts,
+    write_accounts,
+)
+from measuring_intangible_capital.data_management.clean_eu_klems_data import (
+    compact_eu_klems_accounts,
+    get_shared_categories,
+)
+from measuring_intangible_capital.utilities import get_account_data_paths, read_yaml
+
+SYNTHETIC_INDUSTRIES = [f"I{industry}" for industry in range(40)]
+SYNTHETIC_YEARS = range(1995, 2020)
+SHEETS_BY_ACCOUNT = {
+    "capital": "intangible_analytical_detailed",
+    "national": "national_accounts",
+    "growth": "growth_accounts",
+}
+
+
+def main():
+    data_info = read_yaml(SRC / "data_management" / "eu_klems_data_info.yaml")
+    accounts, industries = _read_clean_accounts()
+    if accounts is None:
+        print("No clean accounts, run pytask first to include them. Using synthetic.")
+        accounts = _synthetic_accounts(data_info)
+        industries = SYNTHETIC_INDUSTRIES
+
+    categories = get_shared_categories(data_info, industries)
+    modes = {
+        "default": accounts,
+        "compact": _compact(accounts, categories, float32=False),
+        "compact + float32": _compact(accounts, categories, float32=True),
+    }
+
+    print(f"Clean accounts of {len(ALL_COUNTRY_CODES)} countries:")
+    print(
+        f"  {'':<20} {'memory':>10} {'concat':>10} {'parquet':>10} "
+        f"{'categorical':>12}",
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, mode_accounts in modes.items():
+            footprint = _footprint(mode_accounts, Path(tmp) / mode)
+            memory, memory_concat, disk, categorical = footprint
+            print(
+                f"  {mode:<20} {_mb(memory):>10} {_mb(memory_concat):>10} "
+                f"{_mb(disk):>10} {'yes' if categorical else 'no':>12}",
+            )
+
+
+def _read_clean_accounts() -> tuple[dict | None, list[str] | None]:
+    paths = {
+        country_code: get_account_data_paths(country_code)
+        for country_code in ALL_COUNTRY_CODES
+    }
+    if not all(path.exists() for by_key in paths.values() for path in by_key.values()):
+        return None, None
+
+    accounts = {
+        key: [
+            read_accounts(DATA_CLEAN_PATH, key, country_codes=[country_code])
+            for country_code in paths
+        ]
+        for key in SHEETS_BY_ACCOUNT
+    }
+    return accounts, EU_KLEMS_INDUSTRIES
+
+
+def _synthetic_accounts(data_info: dict) -> dict[str, list[pd.DataFrame]]:
+    rng = np.random.default_rng(0)
+    accounts = {}
+    for key, sheets in SHEETS_BY_ACCOUNT.items():
+        variables = [
+            data_info["variable_name_mapping"].get(sheet, sheet)
+            for sheet in data_info["sheets_to_read"][sheets]
+        ]
+        accounts[key] = []
+        for country_code in ALL_COUNTRY_CODES:
+            index = pd.MultiIndex.from_product(
+                [
+                    pd.CategoricalIndex(SYNTHETIC_INDUSTRIES),
+                    pd.array(list(SYNTHETIC_YEARS), dtype=pd.Int16Dtype()),
+                    pd.CategoricalIndex([country_code]),
+                ],
+                names=["industry_code", "year", "country_code"],
+            )
+            accounts[key].append(
+                pd.DataFrame(
+                    rng.normal(size=(len(index), len(variables))),
+                    index=index,
+                    columns=pd.CategoricalIndex(variables, categories=variables),
+                ),
+            )
+    return accounts
+
+
+def _compact(
+    accounts: dict[str, list[pd.DataFrame]],
+    categories: dict[str, list[str]],
+    float32: bool,
+) -> dict[str, list[pd.DataFrame]]:
+    return {
+        key: [compact_eu_klems_accounts(df, categories, float32) for df in dfs]
+        for key, dfs in accounts.items()
+    }
+
+
+def _footprint(
+    accounts: dict[str, list[pd.DataFrame]],
+    path_to_dataset: Path,
+) -> tuple[int, int, int, bool]:
+    disk = 0
+    for key, dfs in accounts.items():
+        for country_code, df in zip(ALL_COUNTRY_CODES, dfs):
+            path = get_account_data_paths(country_code, path_to_dataset)[key]
+            write_accounts(df, path)
+            disk += path.stat().st_size
+
+    memory = memory_concat = 0
+    categorical = True
+    for key in accounts:
+        dfs = [
+            read_accounts(path_to_dataset, key, country_codes=[country_code])
+            for country_code in ALL_COUNTRY_CODES
+        ]
+        memory += sum(_memory(df) for df in dfs)
+        df_concat = pd.concat(dfs)
+        memory_concat += _memory(df_concat)
+        categorical &= all(
+            isinstance(
+                df_concat.index.get_level_values(name).dtype, pd.CategoricalDtype
+            )
+            for name in ["industry_code", "country_code"]
+        )
+
+    return memory, memory_concat, disk, categorical
+
+
+def _memory(df: pd.DataFrame) -> int:
+    return df.memory_usage(deep=True, index=True).sum()
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1024**2:.2f} MB"
+
+
+if __name__ == "__main__":
+    main()
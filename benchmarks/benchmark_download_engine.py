@@ -0,0 +1,56 @@
+"""Benchmark the concurrent download engine against sequential ``urlretrieve``.
+
+A local HTTP server stands in for the EU KLEMS file host and serves a mock workbook
+for every (country, file) pair. Each request waits ``LATENCY`` seconds before
+answering, to mimic the round trip to the real host.
+
+Run from the project root with ``python -m benchmarks.benchmark_download_engine``.
+
+"""
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from measuring_intangible_capital.config import ALL_COUNTRY_CODES, EU_KLEMS_FILE_NAMES
+from measuring_intangible_capital.data_management.download.download_engine import (
+    download_files,
+    format_download_statistics,
+)
+
+from tests.data_management.mocks.mock import (
+    mock_eu_klems_workbook,
+    start_mock_http_server,
+)
+
+LATENCY = 0.2
+
+
+def main():
+    workbook = mock_eu_klems_workbook()
+    files = {
+        f"/{country}_{file_name}.xlsx": workbook
+        for country in ALL_COUNTRY_CODES
+        for file_name in EU_KLEMS_FILE_NAMES
+    }
+    server, base_url = start_mock_http_server(files, latency=LATENCY)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        downloads = [
+            (f"{base_url}{url_path}", Path(tmp) / "engine" / url_path.strip("/"))
+            for url_path in files
+        ]
+        statistics = download_files(downloads)
+        print(f"engine:     {format_download_statistics(statistics)}")
+
+        start = time.perf_counter()
+        for url, path in downloads:
+            urllib.request.urlretrieve(url, Path(tmp) / path.name)
+        seconds = time.perf_counter() - start
+        print(f"sequential: Downloaded {len(downloads)} files in {seconds:.1f}s")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
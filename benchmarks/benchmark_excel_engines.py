@@ -0,0 +1,117 @@
+"""Benchmark the engines reading the EU KLEMS workbooks.
+
+Times reading the sheets listed in ``eu_klems_data_info.yaml`` with every available
+engine: openpyxl, calamine (if python-calamine is installed) and the Parquet cache,
+both cold (parsing the workbook and filling the cache) and warm. The workbooks are
+the downloaded ones of ``COUNTRY_CODES``, so run ``pytask`` first, and synthetic ones
+with ``SYNTHETIC_ROWS`` rows per sheet.
+
+Run from the project root with ``python -m benchmarks.benchmark_excel_engines``.
+
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from measuring_intangible_capital.config import SRC
+from measuring_intangible_capital.data_management.raw_cache import (
+    read_excel_sheets_cached,
+)
+from measuring_intangible_capital.data_management.utilities import (
+    is_calamine_available,
+    read_excel_sheets,
+)
+from measuring_intangible_capital.utilities import (
+    get_eu_klems_download_paths,
+    read_yaml,
+)
+
+COUNTRY_CODES = ["AT", "DK"]
+SYNTHETIC_ROWS = 2_000
+SYNTHETIC_YEARS = range(1970, 2021)
+
+
+def main():
+    data_info = read_yaml(SRC / "data_management" / "eu_klems_data_info.yaml")
+    sheet_names = data_info["sheets_to_read"]["intangible_analytical_detailed"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workbooks = {
+            f"{country_code} intangible_analytical": path
+            for country_code in COUNTRY_CODES
+            if (
+                path := get_eu_klems_download_paths(
+                    country_code,
+                    ["intangible_analytical"],
+                )["intangible_analytical"]
+            ).exists()
+        }
+        if not workbooks:
+            print("No downloaded workbooks, run pytask first to include them.")
+
+        start = time.perf_counter()
+        workbooks["synthetic"] = _write_synthetic_workbook(Path(tmp), sheet_names)
+        print(f"Wrote the synthetic workbook in {time.perf_counter() - start:.1f}s")
+
+        for name, path in workbooks.items():
+            print(f"{name} ({len(sheet_names)} sheets):")
+            for engine, seconds in _time_engines(path, sheet_names, Path(tmp)).items():
+                print(f"  {engine:<12} {seconds:.2f}s")
+
+
+def _time_engines(
+    path: Path,
+    sheet_names: list[str],
+    path_to_cache: Path,
+) -> dict[str, float]:
+    engines = ["openpyxl", "calamine"] if is_calamine_available() else ["openpyxl"]
+    readers = {
+        engine: lambda engine=engine: read_excel_sheets(
+            path,
+            sheet_names,
+            engine=engine,
+        )
+        for engine in engines
+    }
+    readers["cache cold"] = readers["cache warm"] = lambda: read_excel_sheets_cached(
+        path,
+        sheet_names,
+        path_to_cache / "raw_cache",
+    )
+
+    seconds = {}
+    for engine, reader in readers.items():
+        start = time.perf_counter()
+        reader()
+        seconds[engine] = time.perf_counter() - start
+    return seconds
+
+
+def _write_synthetic_workbook(path_to_folder: Path, sheet_names: list[str]) -> Path:
+    """Write a workbook in the EU KLEMS layout with SYNTHETIC_ROWS rows per sheet."""
+    rng = np.random.default_rng(0)
+    path = path_to_folder / "synthetic.xlsx"
+
+    with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
+        for sheet in sheet_names:
+            pd.DataFrame(
+                {
+                    "nace_r2_code": [f"I{row}" for row in range(SYNTHETIC_ROWS)],
+                    "geo_code": "AT",
+                    "geo_name": "Austria",
+                    "nace_r2_name": "Industry",
+                    "var": sheet,
+                    **{
+                        str(year): rng.normal(size=SYNTHETIC_ROWS)
+                        for year in SYNTHETIC_YEARS
+                    },
+                },
+            ).to_excel(writer, sheet_name=sheet, index=False)
+
+    return path
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark reading the EU KLEMS sheets per ``pd.read_excel`` call against one pass.
+
+Reads the sheets listed in ``eu_klems_data_info.yaml`` from the downloaded workbooks of
+``COUNTRY_CODE``, so run ``pytask`` first to download the real workbooks.
+
+Run from the project root with ``python -m benchmarks.benchmark_read_excel_sheets``.
+
+"""
+import time
+
+import pandas as pd
+from measuring_intangible_capital.config import SRC
+from measuring_intangible_capital.data_management.utilities import read_excel_sheets
+from measuring_intangible_capital.utilities import (
+    get_eu_klems_download_paths,
+    read_yaml,
+)
+
+COUNTRY_CODE = "AT"
+SHEETS_BY_FILE_NAME = {
+    "intangible_analytical": "intangible_analytical_detailed",
+    "national_accounts": "national_accounts",
+    "growth_accounts": "growth_accounts",
+}
+
+
+def main():
+    data_info = read_yaml(SRC / "data_management" / "eu_klems_data_info.yaml")
+    paths = get_eu_klems_download_paths(COUNTRY_CODE, list(SHEETS_BY_FILE_NAME))
+
+    for file_name, sheets_key in SHEETS_BY_FILE_NAME.items():
+        path = paths[file_name]
+        if not path.exists():
+            print(f"{file_name}: {path} is missing, run pytask first.")
+            continue
+        sheet_names = data_info["sheets_to_read"][sheets_key]
+
+        start = time.perf_counter()
+        per_sheet = [pd.read_excel(path, sheet_name=sheet) for sheet in sheet_names]
+        seconds_per_sheet = time.perf_counter() - start
+
+        start = time.perf_counter()
+        one_pass = read_excel_sheets(path, sheet_names)
+        seconds_one_pass = time.perf_counter() - start
+
+        assert all(map(pd.DataFrame.equals, per_sheet, one_pass))
+        print(
+            f"{file_name} ({len(sheet_names)} sheets): "
+            f"read_excel per sheet {seconds_per_sheet:.2f}s, "
+            f"one pass {seconds_one_pass:.2f}s "
+            f"({seconds_per_sheet / seconds_one_pass:.1f}x)",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark the vectorized reshape of ``clean_and_reshape_eu_klems`` against melt and
+pivot_table.
+
+Both reshape synthetic sheets in the EU KLEMS layout, one per variable of the
+intangible analytical accounts, with ``INDUSTRIES`` industries each, and are checked
+to give the same data frame.
+
+Run from the project root with ``python -m benchmarks.benchmark_reshape``.
+
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from measuring_intangible_capital.config import SRC
+from measuring_intangible_capital.data_management.clean_eu_klems_data import (
+    clean_and_reshape_eu_klems,
+)
+from measuring_intangible_capital.utilities import read_yaml
+
+from tests.data_management.mocks.mock import reshape_eu_klems_with_pivot_table
+
+INDUSTRIES = 20_000
+YEARS = range(1995, 2020)
+REPEATS = 3
+
+
+def main():
+    data_info = read_yaml(SRC / "data_management" / "eu_klems_data_info.yaml")
+    sheet_names = data_info["sheets_to_read"]["intangible_analytical_detailed"]
+    raw = [_synthetic_sheet(sheet) for sheet in sheet_names]
+
+    timings = {}
+    results = {}
+    for name, reshape in {
+        "melt + pivot_table": reshape_eu_klems_with_pivot_table,
+        "vectorized": clean_and_reshape_eu_klems,
+    }.items():
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            results[name] = reshape(raw, data_info, years=YEARS)
+        timings[name] = (time.perf_counter() - start) / REPEATS
+
+    pd.testing.assert_frame_equal(
+        results["vectorized"],
+        results["melt + pivot_table"],
+    )
+    print(f"{len(sheet_names)} sheets x {INDUSTRIES} industries x {len(YEARS)} years:")
+    for name, seconds in timings.items():
+        print(f"  {name:<20} {seconds:.2f}s")
+
+
+def _synthetic_sheet(variable: str) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "nace_r2_code": [f"I{industry}" for industry in range(INDUSTRIES)],
+            "geo_code": "AT",
+            "geo_name": "Austria",
+            "nace_r2_name": "Industry",
+            "var": variable,
+            **{str(year): rng.normal(size=INDUSTRIES) for year in YEARS},
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,8 @@ import pandas as pd
 
 from measuring_intangible_capital.config import (
     ALL_COUNTRY_CODES,
-    INTANGIBLE_AGGREGATE_CATEGORIES,
-    INTANGIBLE_AGGREGATE_CATEGORIES_TYPE,
+    INTANGIBLE_AGGREGATE_CATEGORY_MAPPING,
     INTANGIBLE_DETAIL_CATEGORIES,
-    INTANGIBLE_DETAIL_CATEGORIES_TYPE,
     LABOUR_COMPOSITION_COLUMNS,
 )
 from measuring_intangible_capital.error_handling_utilities import (
@@ -48,7 +46,7 @@ def get_share_of_intangible_investment_per_gdp(
     df = pd.DataFrame()
 
     df["investment_level"] = capital_accounts[INTANGIBLE_DETAIL_CATEGORIES].sum(axis=1)
-    df["share_intangible"] = _calculate_investment_share_in_gdp(
+    df["share_intangible"] = calculate_investment_share_in_gdp(
         df["investment_level"],
         national_accounts["gdp"],
     )
@@ -87,7 +85,7 @@ def get_composition_of_value_added(growth_accounts: pd.DataFrame, country_code:
         df[column] = growth_accounts[column].mean()
 
     df["labour_productivity"] = growth_accounts["labour_productivity"].mean()
-    df["mfp"] = _calculate_mfp(
+    df["mfp"] = calculate_mfp(
         labour_productivity=df["labour_productivity"],
         labour_composition=df[LABOUR_COMPOSITION_COLUMNS],
     )
@@ -99,43 +97,112 @@ def get_intangible_investment_aggregate_types(
     capital_accounts: pd.DataFrame,
     national_accounts: pd.DataFrame,
     country_code: str,
+    aggregation_matrix: pd.DataFrame | None = None,
 ) -> pd.DataFrame:
     """Calculate the share of intangible investment for each aggregate category for a given year.
     For each category, calculate the share of intangible investment of GDP.
     Categories are: computerized_information, innovative_property, economic_competencies.
 
+    The accounts are those of one country, as selected from the KLEMS cube by
+    prepare_accounts, so they are already aligned on their index.
+
     Args:
         capital_accounts (pd.DataFrame): The capital accounts data set for a given country.
         national_accounts (pd.DataFrame): The national accounts with GDP of a given country.
+        country_code (str): The country code of the accounts.
+        aggregation_matrix (pd.DataFrame, optional): The aggregation matrix of the
+            categories. If None, the aggregate categories, see get_aggregation_matrix.
 
     Returns:
         pd.DataFrame: The share of intangible investment for each aggregate category.
     """
+    raise_country_code_invalid(country_code, ALL_COUNTRY_CODES)
     _raise_index_not_equal(capital_accounts, national_accounts)
 
-    df = pd.DataFrame(
-        index=capital_accounts.index,
-        columns=INTANGIBLE_AGGREGATE_CATEGORIES,
+    if aggregation_matrix is None:
+        aggregation_matrix = get_aggregation_matrix(total=None)
+
+    return calculate_investment_shares_in_gdp(
+        aggregate_intangible_investment(capital_accounts, aggregation_matrix),
+        national_accounts["gdp"],
     )
 
-    gdp = national_accounts.xs(country_code, level="country_code")["gdp"]
-    investment = capital_accounts.xs(country_code, level="country_code")
 
-    for category in INTANGIBLE_AGGREGATE_CATEGORIES:
-        aggregate_intangible_investment = _aggregate_intangible_investment(
-            sr=investment,
-            mode=category,
-        )
+def get_aggregation_matrix(
+    mapping: dict[str, list[str]] = INTANGIBLE_AGGREGATE_CATEGORY_MAPPING,
+    total: str | None = "total",
+) -> pd.DataFrame:
+    """Get the matrix which aggregates the detail categories of intangible investment.
 
-        investment_share = _calculate_investment_share_in_gdp(
-            aggregate_intangible_investment,
-            gdp,
-        )
-        investment_share.index = df.index
+    The matrix has a row per detail category and a column per aggregate category, with
+    a one where the detail category belongs to the aggregate category. The aggregates
+    of investment are the product of the investment and the matrix, see
+    aggregate_intangible_investment. Other groupings, e.g. innovative property
+    including research_and_development, are a different mapping or matrix.
 
-        df[category] = investment_share
+    Args:
+        mapping (dict[str, list[str]]): The detail categories of each aggregate
+            category. Defaults to INTANGIBLE_AGGREGATE_CATEGORY_MAPPING.
+        total (str, optional): The name of a column for the total of all detail
+            categories. If None, there is no total.
 
-    return df
+    Returns:
+        pd.DataFrame: The aggregation matrix, with index INTANGIBLE_DETAIL_CATEGORIES.
+
+    """
+    raise_variable_wrong_type(mapping, dict, "mapping")
+    _raise_mapping_invalid(mapping)
+
+    matrix = pd.DataFrame(
+        0.0,
+        index=INTANGIBLE_DETAIL_CATEGORIES,
+        columns=list(mapping),
+    )
+    for category, detail_categories in mapping.items():
+        matrix.loc[detail_categories, category] = 1.0
+
+    if total is not None:
+        matrix[total] = 1.0
+
+    return matrix
+
+
+def aggregate_intangible_investment(
+    investment: pd.DataFrame,
+    aggregation_matrix: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Aggregate the detail categories of intangible investment in one matrix product.
+    Missing investment counts as zero.
+
+    Args:
+        investment (pd.DataFrame): The investment with a column per detail category,
+            e.g. of all countries and years.
+        aggregation_matrix (pd.DataFrame, optional): The aggregation matrix. If None,
+            the aggregate categories and their total, see get_aggregation_matrix.
+
+    Returns:
+        pd.DataFrame: The investment of each column of the aggregation matrix.
+
+    """
+    raise_variable_wrong_type(investment, pd.DataFrame, "investment")
+    if aggregation_matrix is None:
+        aggregation_matrix = get_aggregation_matrix()
+    raise_variable_wrong_type(aggregation_matrix, pd.DataFrame, "aggregation_matrix")
+    _raise_data_wrong_columns(
+        investment,
+        list(aggregation_matrix.index),
+        "investment",
+    )
+
+    return pd.DataFrame(
+        investment[list(aggregation_matrix.index)].to_numpy(
+            dtype=float,
+            na_value=0.0,
+        )
+        @ aggregation_matrix.to_numpy(dtype=float),
+        index=investment.index,
+        columns=aggregation_matrix.columns,
+    )
 
 
 def get_share_of_tangible_investment_per_gdp(
@@ -145,83 +212,81 @@ def get_share_of_tangible_investment_per_gdp(
 ):
     """Calculate the share of tangible investment of GDP for a given year.
 
+    The accounts are those of one country, as selected from the KLEMS cube by
+    prepare_accounts, so they are already aligned on their index.
+
     Args:
         capital_accounts (pd.DataFrame): The capital accounts data set for a given industry, year and country.
         national_accounts (pd.DataFrame): The national accounts with GDP of a given industry, year and country.
+        country_code (str): The country code of the accounts.
 
     Returns:
         pd.Series: The share of tangible investment as percent of GDP.
 
     """
+    raise_country_code_invalid(country_code, ALL_COUNTRY_CODES)
     _raise_index_not_equal(capital_accounts, national_accounts)
 
     df = pd.DataFrame(index=capital_accounts.index)
+    df["share_tangible"] = calculate_investment_share_in_gdp(
+        capital_accounts["tangible_assets"],
+        national_accounts["gdp"],
+    )
 
-    tangible_assets = capital_accounts.xs(country_code, level="country_code")[
-        "tangible_assets"
-    ]
-    gdp = national_accounts.xs(country_code, level="country_code")["gdp"]
+    return df
 
-    share_tangible = _calculate_investment_share_in_gdp(tangible_assets, gdp)
-    share_tangible.index = df.index
-    df["share_tangible"] = share_tangible
 
-    return df
+def calculate_mfp(
+    labour_productivity: pd.Series,
+    labour_composition: pd.DataFrame,
+) -> pd.Series:
+    """Calculate multi factor productivity, the part of labour productivity growth not
+    explained by the contributions of labour composition and capital.
 
+    Args:
+        labour_productivity (pd.Series): labour productivity growth.
+        labour_composition (pd.DataFrame): the contributions to labour productivity
+            growth, LABOUR_COMPOSITION_COLUMNS.
+
+    Returns:
+        pd.Series: multi factor productivity.
 
-def _calculate_mfp(labour_productivity: pd.Series, labour_composition: pd.Series):
+    """
     return labour_productivity - labour_composition.sum(axis=1)
 
 
-def _calculate_investment_share_in_gdp(
-    intangible_investment: pd.Series,
+def calculate_investment_share_in_gdp(
+    investment: pd.Series,
     gdp: pd.Series,
 ) -> pd.Series:
-    """Calculate intangible investment.
+    """Calculate the share of investment in GDP, in percent.
 
     Args:
-        capital_accounts (pandas.DataFrame): Capital accounts data set.
-        national_accounts (pandas.DataFrame): National accounts data set.
+        investment (pd.Series): the investment.
+        gdp (pd.Series): the GDP, on the same index as the investment.
 
     Returns:
-        pandas.DataFrame: The intangible investment data set.
+        pd.Series: the share of investment in GDP, rounded to 3 decimals.
 
     """
-    return round((intangible_investment / gdp) * 100, 3)
+    return round((investment / gdp) * 100, 3)
 
 
-def _aggregate_intangible_investment(
-    sr: pd.Series,
-    mode: INTANGIBLE_AGGREGATE_CATEGORIES_TYPE,
-) -> pd.Series:
-    """Aggregate the total market intangible investment data set for a given year.
-    Categories are: computerized_information, innovative_property, economic_competencies
-    Sum up sub-categories which belong to the aggregate category.
-    Ex: computerized_information - software_and_databases, research_and_development.
+def calculate_investment_shares_in_gdp(
+    investment: pd.DataFrame,
+    gdp: pd.Series,
+) -> pd.DataFrame:
+    """Calculate the share in GDP of each column of investment, in percent.
 
     Args:
-        sr (pd.Series): The total market intangible investment data set for a given year.
-        mode (INTANGIBLE_AGGREGATE_CATEGORIES_TYPE): The aggregate category for which to aggregate the data.
-            computerized_information: this includes the columns software_and_databases and research_and_development
-            innovative_property: this includes the columns entertainment_and_artistic, new_financial_product, design
-            economic_competencies: this includes the columns organizational_capital, brand, training
+        investment (pd.DataFrame): the investment, e.g. of each intangible category.
+        gdp (pd.Series): the GDP, on the same index as the investment.
+
     Returns:
-        pd.Series: The aggregate category of intangible investment for a given year.
+        pd.DataFrame: the shares of investment in GDP, rounded to 3 decimals.
 
     """
-    raise_variable_none(mode, "mode")
-    _raise_aggregate_mode_invalid(mode)
-
-    index: INTANGIBLE_DETAIL_CATEGORIES_TYPE = None
-
-    if mode == "computerized_information":
-        index = ["software_and_databases", "research_and_development"]
-    elif mode == "innovative_property":
-        index = ["entertainment_and_artistic", "new_financial_product", "design"]
-    elif mode == "economic_competencies":
-        index = ["organizational_capital", "brand", "training"]
-
-    return sr[index].sum(axis=1)
+    return round(investment.div(gdp, axis=0) * 100, 3)
 
 
 def _raise_index_not_equal(
@@ -233,10 +298,15 @@ def _raise_index_not_equal(
         raise ValueError(msg)
 
 
-def _raise_aggregate_mode_invalid(mode):
-    if mode not in INTANGIBLE_AGGREGATE_CATEGORIES:
-        msg = "Invalid mode"
-        raise ValueError(msg)
+def _raise_mapping_invalid(mapping: dict[str, list[str]]):
+    for category, detail_categories in mapping.items():
+        for detail_category in detail_categories:
+            if detail_category not in INTANGIBLE_DETAIL_CATEGORIES:
+                msg = (
+                    f"The detail category {detail_category} of {category} is not one "
+                    f"of {INTANGIBLE_DETAIL_CATEGORIES}."
+                )
+                raise ValueError(msg)
 
 
 def _raise_data_wrong_columns(data: pd.DataFrame, columns: list[str], name: str):
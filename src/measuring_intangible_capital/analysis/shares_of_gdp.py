@@ -0,0 +1,383 @@
+"""Functions to calculate the shares of investment of GDP of all countries at once."""
+
+import warnings
+from collections.abc import Mapping
+
+import pandas as pd
+
+from measuring_intangible_capital.analysis.intangible_investment import (
+    aggregate_intangible_investment,
+    calculate_investment_share_in_gdp,
+    calculate_investment_shares_in_gdp,
+    get_aggregation_matrix,
+)
+from measuring_intangible_capital.analysis.utilities import select_accounts
+from measuring_intangible_capital.config import (
+    ALL_COUNTRY_CODES,
+    CAPITAL_ACCOUNT_INDUSTRY_CODE,
+    CAPITAL_ACCOUNT_INDUSTRY_CODE_OVERRIDES,
+    INTANGIBLE_DETAIL_CATEGORIES,
+    NATIONAL_ACCOUNT_INDUSTRY_CODE,
+)
+from measuring_intangible_capital.error_handling_utilities import (
+    raise_variable_wrong_type,
+)
+from measuring_intangible_capital.klems_cube import KlemsCube
+
+SHARES_OF_GDP = ["share_intangible", "share_intangible_aggregate", "share_tangible"]
+
+
+def get_years_name(years: range | list[int]) -> str:
+    """Get the name of a year window, as used in the names of the output files.
+
+    Args:
+        years (range | list[int]): the years, e.g. range(1995, 2007) or [2006].
+
+    Returns:
+        str: the first and the last year, e.g. 1995_2006, or the year of a single year.
+
+    """
+    years = list(years)
+    if len(years) == 1:
+        return f"{years[0]}"
+    return f"{years[0]}_{years[-1]}"
+
+
+def get_all_years(years_by_share: dict[str, list[range | list[int]]]) -> list[int]:
+    """Get the sorted years of all windows of all shares.
+
+    Args:
+        years_by_share (dict[str, list[range | list[int]]]): the year windows of each
+            share.
+
+    Returns:
+        list[int]: the years.
+
+    """
+    return sorted(
+        {
+            year
+            for windows in years_by_share.values()
+            for window in windows
+            for year in window
+        },
+    )
+
+
+def get_capital_account_industry_codes(
+    country_codes: list[str] = ALL_COUNTRY_CODES,
+) -> dict[str, str]:
+    """Get the industry of the capital accounts of each country.
+
+    This is CAPITAL_ACCOUNT_INDUSTRY_CODE, except for the countries in
+    CAPITAL_ACCOUNT_INDUSTRY_CODE_OVERRIDES, e.g. TOT for Greece.
+
+    Args:
+        country_codes (list[str]): the countries. Defaults to ALL_COUNTRY_CODES.
+
+    Returns:
+        dict[str, str]: the industry code by country code.
+
+    """
+    return {
+        country_code: CAPITAL_ACCOUNT_INDUSTRY_CODE_OVERRIDES.get(
+            country_code,
+            CAPITAL_ACCOUNT_INDUSTRY_CODE,
+        )
+        for country_code in country_codes
+    }
+
+
+def get_shares_of_intangible_investment_per_gdp(
+    capital_accounts: KlemsCube | pd.DataFrame,
+    national_accounts: KlemsCube | pd.DataFrame,
+    years: range | list[int],
+    industry_codes: str | Mapping[str, str] = CAPITAL_ACCOUNT_INDUSTRY_CODE,
+    country_codes: list[str] = ALL_COUNTRY_CODES,
+) -> pd.DataFrame:
+    """Calculate investment levels and shares of intangible investment of GDP for all
+    countries, like ``get_share_of_intangible_investment_per_gdp`` does for one.
+
+    Args:
+        capital_accounts (KlemsCube | pd.DataFrame): the capital accounts of all
+            countries, as a cube or stacked in the clean layout.
+        national_accounts (KlemsCube | pd.DataFrame): the national accounts of all
+            countries, as a cube or stacked in the clean layout.
+        years (range | list[int]): the years.
+        industry_codes (str | Mapping[str, str]): the industry of the capital accounts,
+            for all countries or by country code. Defaults to
+            CAPITAL_ACCOUNT_INDUSTRY_CODE.
+        country_codes (list[str]): the countries. Defaults to ALL_COUNTRY_CODES.
+
+    Returns:
+        pd.DataFrame: investment levels and shares of intangible investment with index
+        (year, country_code).
+
+    """
+    capital, gdp = _get_capital_and_gdp(
+        capital_accounts,
+        national_accounts,
+        years,
+        industry_codes,
+        country_codes,
+    )
+
+    df = pd.DataFrame(index=capital.index)
+    df["investment_level"] = capital[INTANGIBLE_DETAIL_CATEGORIES].sum(axis=1)
+    df["share_intangible"] = calculate_investment_share_in_gdp(
+        df["investment_level"],
+        gdp,
+    )
+
+    if (df["share_intangible"] > 100).any():
+        warnings.warn("Share of intangible investment is greater than 100% of GDP")
+
+    return df
+
+
+def get_intangible_investment_aggregate_shares(
+    capital_accounts: KlemsCube | pd.DataFrame,
+    national_accounts: KlemsCube | pd.DataFrame,
+    years: range | list[int],
+    industry_codes: str | Mapping[str, str] | None = None,
+    country_codes: list[str] = ALL_COUNTRY_CODES,
+    aggregation_matrix: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Calculate the share of intangible investment of GDP of each aggregate category
+    for all countries, like ``get_intangible_investment_aggregate_types`` does for one.
+
+    All aggregates of all countries and years are one product of the investment and
+    the aggregation matrix, see ``aggregate_intangible_investment``.
+
+    Args:
+        capital_accounts (KlemsCube | pd.DataFrame): the capital accounts of all
+            countries, as a cube or stacked in the clean layout.
+        national_accounts (KlemsCube | pd.DataFrame): the national accounts of all
+            countries, as a cube or stacked in the clean layout.
+        years (range | list[int]): the years.
+        industry_codes (str | Mapping[str, str], optional): the industry of the
+            capital accounts, for all countries or by country code. If None, see
+            ``get_capital_account_industry_codes``.
+        country_codes (list[str]): the countries. Defaults to ALL_COUNTRY_CODES.
+        aggregation_matrix (pd.DataFrame, optional): the aggregation matrix. If None,
+            the aggregate categories and their total, share_intangible, see
+            ``get_aggregation_matrix``.
+
+    Returns:
+        pd.DataFrame: the share of each column of the aggregation matrix with index
+        (year, country_code).
+
+    """
+    capital, gdp = _get_capital_and_gdp(
+        capital_accounts,
+        national_accounts,
+        years,
+        industry_codes,
+        country_codes,
+    )
+    if aggregation_matrix is None:
+        aggregation_matrix = get_aggregation_matrix(total="share_intangible")
+
+    return calculate_investment_shares_in_gdp(
+        aggregate_intangible_investment(capital, aggregation_matrix),
+        gdp,
+    )
+
+
+def get_shares_of_tangible_investment_per_gdp(
+    capital_accounts: KlemsCube | pd.DataFrame,
+    national_accounts: KlemsCube | pd.DataFrame,
+    years: range | list[int],
+    industry_codes: str | Mapping[str, str] | None = None,
+    country_codes: list[str] = ALL_COUNTRY_CODES,
+) -> pd.DataFrame:
+    """Calculate the share of tangible investment of GDP for all countries, like
+    ``get_share_of_tangible_investment_per_gdp`` does for one.
+
+    Args:
+        capital_accounts (KlemsCube | pd.DataFrame): the capital accounts of all
+            countries, as a cube or stacked in the clean layout.
+        national_accounts (KlemsCube | pd.DataFrame): the national accounts of all
+            countries, as a cube or stacked in the clean layout.
+        years (range | list[int]): the years.
+        industry_codes (str | Mapping[str, str], optional): the industry of the
+            capital accounts, for all countries or by country code. If None, see
+            ``get_capital_account_industry_codes``.
+        country_codes (list[str]): the countries. Defaults to ALL_COUNTRY_CODES.
+
+    Returns:
+        pd.DataFrame: the share of tangible investment with index (year, country_code).
+
+    """
+    capital, gdp = _get_capital_and_gdp(
+        capital_accounts,
+        national_accounts,
+        years,
+        industry_codes,
+        country_codes,
+    )
+
+    df = pd.DataFrame(index=capital.index)
+    df["share_tangible"] = calculate_investment_share_in_gdp(
+        capital["tangible_assets"],
+        gdp,
+    )
+
+    return df
+
+
+def get_yearly_shares_of_gdp(
+    capital_accounts: KlemsCube,
+    national_accounts: KlemsCube,
+    years: range | list[int],
+    shares: list[str] = SHARES_OF_GDP,
+    country_codes: list[str] = ALL_COUNTRY_CODES,
+) -> dict[str, pd.DataFrame]:
+    """Calculate the shares of investment of GDP of all countries for all years at
+    once.
+
+    Windows of years are selections of these yearly shares, see ``get_shares_of_gdp``,
+    and their means are answered by ``get_share_year_windows``, so no window needs
+    the shares to be calculated again.
+
+    Args:
+        capital_accounts (KlemsCube): the capital accounts of all countries.
+        national_accounts (KlemsCube): the national accounts of all countries.
+        years (range | list[int]): the years.
+        shares (list[str]): the shares to calculate, see ``get_shares_of_gdp``.
+            Defaults to SHARES_OF_GDP.
+        country_codes (list[str]): the countries. Defaults to ALL_COUNTRY_CODES.
+
+    Returns:
+        dict[str, pd.DataFrame]: the shares of all countries with index (year,
+        country_code), by share.
+
+    """
+    raise_variable_wrong_type(capital_accounts, KlemsCube, "capital_accounts")
+    raise_variable_wrong_type(national_accounts, KlemsCube, "national_accounts")
+    _raise_share_invalid(shares)
+
+    get_share = {
+        "share_intangible": get_shares_of_intangible_investment_per_gdp,
+        "share_intangible_aggregate": get_intangible_investment_aggregate_shares,
+        "share_tangible": get_shares_of_tangible_investment_per_gdp,
+    }
+
+    return {
+        share: get_share[share](
+            capital_accounts=capital_accounts,
+            national_accounts=national_accounts,
+            years=years,
+            country_codes=country_codes,
+        )
+        for share in shares
+    }
+
+
+def get_shares_of_gdp(
+    capital_accounts: KlemsCube,
+    national_accounts: KlemsCube,
+    years_by_share: dict[str, list[range | list[int]]],
+    country_codes: list[str] = ALL_COUNTRY_CODES,
+) -> dict[str, dict[str, pd.DataFrame]]:
+    """Calculate the shares of investment of GDP for all year windows.
+
+    The shares are:
+
+    - share_intangible: investment level and share of intangible investment of GDP,
+      see ``get_shares_of_intangible_investment_per_gdp``.
+    - share_intangible_aggregate: share of intangible investment of GDP of each
+      aggregate category and their sum, see
+      ``get_intangible_investment_aggregate_shares``.
+    - share_tangible: share of tangible investment of GDP, see
+      ``get_shares_of_tangible_investment_per_gdp``.
+
+    Each share is calculated once for the years of all its windows, see
+    ``get_yearly_shares_of_gdp``, and each window selects its years.
+
+    Args:
+        capital_accounts (KlemsCube): the capital accounts of all countries.
+        national_accounts (KlemsCube): the national accounts of all countries.
+        years_by_share (dict[str, list[range | list[int]]]): the year windows of each
+            share to calculate.
+        country_codes (list[str]): the countries. Defaults to ALL_COUNTRY_CODES.
+
+    Returns:
+        dict[str, dict[str, pd.DataFrame]]: the shares of all countries with index
+        (year, country_code), by share and name of the year window, see
+        ``get_years_name``.
+
+    """
+    _raise_share_invalid(years_by_share)
+
+    yearly_shares = get_yearly_shares_of_gdp(
+        capital_accounts,
+        national_accounts,
+        get_all_years(years_by_share),
+        shares=list(years_by_share),
+        country_codes=country_codes,
+    )
+
+    return {
+        share: {
+            get_years_name(years): select_years(yearly_shares[share], years)
+            for years in windows
+        }
+        for share, windows in years_by_share.items()
+    }
+
+
+def select_years(df: pd.DataFrame, years: range | list[int]) -> pd.DataFrame:
+    """Select the rows of a window of years from yearly shares.
+
+    Args:
+        df (pd.DataFrame): the yearly shares with index (year, country_code), see
+            ``get_yearly_shares_of_gdp``.
+        years (range | list[int]): the years of the window.
+
+    Returns:
+        pd.DataFrame: the shares of the years.
+
+    """
+    return df[df.index.get_level_values("year").isin(list(years))]
+
+
+def _get_capital_and_gdp(
+    capital_accounts: KlemsCube | pd.DataFrame,
+    national_accounts: KlemsCube | pd.DataFrame,
+    years: range | list[int],
+    industry_codes: str | Mapping[str, str] | None,
+    country_codes: list[str],
+) -> tuple[pd.DataFrame, pd.Series]:
+    """The capital accounts of all countries, each at its industry, and the GDP on
+    their index."""
+    if industry_codes is None:
+        industry_codes = get_capital_account_industry_codes(country_codes)
+
+    capital = select_accounts(
+        _to_cube(capital_accounts, "capital_accounts"),
+        years,
+        industry_codes,
+        country_codes,
+    )
+    national = select_accounts(
+        _to_cube(national_accounts, "national_accounts"),
+        years,
+        NATIONAL_ACCOUNT_INDUSTRY_CODE,
+        country_codes,
+    )
+    return capital, national["gdp"].reindex(capital.index)
+
+
+def _to_cube(accounts: KlemsCube | pd.DataFrame, name: str) -> KlemsCube:
+    raise_variable_wrong_type(accounts, (KlemsCube, pd.DataFrame), name)
+    if isinstance(accounts, pd.DataFrame):
+        return KlemsCube.from_accounts(accounts)
+    return accounts
+
+
+def _raise_share_invalid(shares: list[str] | dict) -> None:
+    for share in shares:
+        if share not in SHARES_OF_GDP:
+            msg = f"The share {share} is not one of {SHARES_OF_GDP}."
+            raise ValueError(msg)
@@ -14,10 +14,11 @@ from measuring_intangible_capital.config import (
     BLD_PYTHON,
     INTANGIBLE_AGGREGATE_CATEGORIES,
 )
+from measuring_intangible_capital.utilities import read_arrow, write_arrow
 
 intangible_components_labour_productivity_composition_deps = {
     "scripts": [Path("labour_productivity.py")],
-    "data": Path(BLD_PYTHON / "labour_productivity" / "composition_1995_2006.pkl"),
+    "data": Path(BLD_PYTHON / "labour_productivity" / "composition_1995_2006.arrow"),
 }
 
 
@@ -25,15 +26,16 @@ def task_intangible_components_labour_productivity_composition(
     depends_on=intangible_components_labour_productivity_composition_deps,
     path_to_data: Annotated[Path, Product] = BLD_PYTHON
     / "labour_productivity"
-    / "intangible_composition.pkl",
+    / "intangible_composition.arrow",
 ):
     """Store share of each intangible investment aggregate category in labour
     productivity."""
-    labour_productivity_composition = pd.read_pickle(depends_on["data"])
+    labour_productivity_composition = read_arrow(depends_on["data"])
 
     df = pd.DataFrame(
         index=labour_productivity_composition.index,
         columns=INTANGIBLE_AGGREGATE_CATEGORIES,
+        dtype=float,
     )
 
     for country_code in ALL_COUNTRY_CODES_LESS_SK:
@@ -44,4 +46,4 @@ def task_intangible_components_labour_productivity_composition(
         )
         df.loc[country_code, :] = sub_components
 
-    pd.to_pickle(df, path_to_data)
+    write_arrow(df, path_to_data)
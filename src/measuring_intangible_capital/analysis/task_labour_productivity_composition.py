@@ -3,21 +3,30 @@
 from pathlib import Path
 from typing import Annotated
 
-import pandas as pd
-from pytask import Product, task
+from pytask import Product
 
-from measuring_intangible_capital.analysis.intangible_investment import (
-    get_composition_of_value_added,
+from measuring_intangible_capital.analysis.shares_of_gdp import get_years_name
+from measuring_intangible_capital.analysis.utilities import load_accounts
+from measuring_intangible_capital.analysis.year_windows import (
+    get_composition_of_value_added_for_window,
+    get_growth_year_windows,
 )
 from measuring_intangible_capital.config import (
     ALL_COUNTRY_CODES_LESS_SK,
     BLD_PYTHON,
     CAPITAL_ACCOUNT_INDUSTRY_CODE,
 )
-from measuring_intangible_capital.utilities import get_account_data_path_for_countries
+from measuring_intangible_capital.utilities import (
+    get_account_data_path_for_countries,
+    write_arrow,
+)
 
 labour_productivity_composition_deps = {
-    "scripts": [Path("intangible_investment.py")],
+    "scripts": [
+        Path("intangible_investment.py"),
+        Path("utilities.py"),
+        Path("year_windows.py"),
+    ],
     "growth_accounts": get_account_data_path_for_countries(
         "growth",
         ALL_COUNTRY_CODES_LESS_SK,
@@ -26,40 +35,46 @@ labour_productivity_composition_deps = {
 
 labour_productivity_composition_year_ranges = [range(1995, 2007)]
 
-for years in labour_productivity_composition_year_ranges:
 
-    @task(id=f"{years.start}_{years.stop - 1}")
-    def task_labour_productivity_composition(
-        years=years,
-        depends_on=labour_productivity_composition_deps,
-        path_to_labour_productivity_composition: Annotated[Path, Product] = BLD_PYTHON
+def task_labour_productivity_composition(
+    year_ranges: list[range] = labour_productivity_composition_year_ranges,
+    depends_on=labour_productivity_composition_deps,
+    paths_to_labour_productivity_composition: Annotated[
+        dict[str, Path],
+        Product,
+    ] = {
+        get_years_name(years): BLD_PYTHON
         / "labour_productivity"
-        / f"composition_{years.start}_{years.stop - 1}.pkl",
-    ):
-        """Calculate the composition of labour productivity growth for each country.
+        / f"composition_{get_years_name(years)}.arrow"
+        for years in labour_productivity_composition_year_ranges
+    },
+):
+    """Calculate the composition of labour productivity growth for each country.
 
-        For each country, select the growth accounts data for the years 1995 to 2006 and calculate the composition of labour productivity growth.
-        Store the data frame for each country and concatenate at the end.
-        The result is a data frame for all countries with columns: year, country, composition.
-        Lastly, save the data frame to a pickle file.
+    Load the growth accounts of all countries once, for all years, and sum up the
+    contributions to labour productivity growth along the years.
+    For each window of years, e.g. 1995 to 2006, the composition of labour productivity
+    growth of all countries is then the mean of the contributions over the window.
+    The result is a data frame for all countries with columns: country, composition.
+    Lastly, save each data frame to an Arrow file.
 
-        """
-        dfs = []
+    """
+    growth_accounts = load_accounts(
+        "growth",
+        industries=[CAPITAL_ACCOUNT_INDUSTRY_CODE],
+    )
+    growth_windows = get_growth_year_windows(growth_accounts)
 
-        for index, country_code in enumerate(ALL_COUNTRY_CODES_LESS_SK):
-            growth_accounts: pd.DataFrame = pd.read_pickle(
-                depends_on["growth_accounts"][index],
+    for years in year_ranges:
+        labour_productivity_growth_composition = (
+            get_composition_of_value_added_for_window(
+                growth_windows,
+                start=years.start,
+                end=years.stop - 1,
+                country_codes=ALL_COUNTRY_CODES_LESS_SK,
             )
-            growth_accounts_for_years = growth_accounts.loc[
-                (CAPITAL_ACCOUNT_INDUSTRY_CODE, list(years), slice(None)),
-                :,
-            ]
-
-            df = get_composition_of_value_added(growth_accounts_for_years, country_code)
-            dfs.append(df)
-
-        labour_productivity_growth_composition = pd.concat(dfs)
-        pd.to_pickle(
+        )
+        write_arrow(
             labour_productivity_growth_composition,
-            path_to_labour_productivity_composition,
+            paths_to_labour_productivity_composition[get_years_name(years)],
         )
@@ -0,0 +1,93 @@
+"""Task to calculate the shares of intangible and tangible investment of GDP for all
+countries and years."""
+
+from pathlib import Path
+from typing import Annotated
+
+from pytask import Product
+
+from measuring_intangible_capital.analysis.shares_of_gdp import (
+    get_all_years,
+    get_years_name,
+    get_yearly_shares_of_gdp,
+    select_years,
+)
+from measuring_intangible_capital.analysis.utilities import load_accounts
+from measuring_intangible_capital.analysis.year_windows import (
+    get_share_year_windows,
+)
+from measuring_intangible_capital.config import (
+    BLD_PYTHON,
+    CAPITAL_ACCOUNT_INDUSTRY_CODE,
+    NATIONAL_ACCOUNT_INDUSTRY_CODE,
+)
+from measuring_intangible_capital.utilities import (
+    get_account_data_path_for_countries,
+    write_arrow,
+)
+
+shares_of_gdp_deps = {
+    "scripts": [
+        Path("intangible_investment.py"),
+        Path("shares_of_gdp.py"),
+        Path("utilities.py"),
+        Path("year_windows.py"),
+    ],
+    "capital_accounts": get_account_data_path_for_countries("capital"),
+    "national_accounts": get_account_data_path_for_countries("national"),
+}
+
+shares_of_gdp_year_ranges = {
+    "share_intangible": [range(1995, 2007), range(2000, 2005)],
+    "share_intangible_aggregate": [[2006]],
+    "share_tangible": [[2006], range(2000, 2005)],
+}
+
+
+def task_shares_of_gdp(
+    depends_on=shares_of_gdp_deps,
+    years_by_share: dict = shares_of_gdp_year_ranges,
+    paths_to_shares: Annotated[dict[str, dict[str, Path]], Product] = {
+        share: {
+            get_years_name(years): BLD_PYTHON
+            / share.removesuffix("_aggregate")
+            / f"gdp_aggregate_{get_years_name(years)}.arrow"
+            for years in year_ranges
+        }
+        for share, year_ranges in shares_of_gdp_year_ranges.items()
+    },
+    path_to_share_windows: Annotated[Path, Product] = BLD_PYTHON
+    / "shares_of_gdp_windows.arrow",
+):
+    """Calculate the shares of intangible and tangible investment of GDP.
+
+    Load the capital and national accounts of all countries once, for all years and
+    the two industries used. Then calculate each share for all countries and years at
+    once and select the years of each window:
+    the share of intangible investment of GDP from 1995 until 2006 and from 2000 to 2004,
+    the share of each aggregate intangible investment category of GDP for 2006
+    (computerized_information, innovative_property, economic_competencies)
+    and the share of tangible investment of GDP for 2006 and from 2000 to 2004.
+    Save each data frame to an Arrow file. Lastly, save the mean shares of every
+    country over every window of these years, from the prefix sums of
+    ``get_share_year_windows``.
+
+    """
+    industries = [CAPITAL_ACCOUNT_INDUSTRY_CODE, NATIONAL_ACCOUNT_INDUSTRY_CODE]
+    years = get_all_years(years_by_share)
+    capital_accounts = load_accounts("capital", years=years, industries=industries)
+    national_accounts = load_accounts("national", years=years, industries=industries)
+
+    yearly_shares = get_yearly_shares_of_gdp(capital_accounts, national_accounts, years)
+
+    for share, paths in paths_to_shares.items():
+        for window in years_by_share[share]:
+            write_arrow(
+                select_years(yearly_shares[share], window),
+                paths[get_years_name(window)],
+            )
+
+    write_arrow(
+        get_share_year_windows(yearly_shares).all_means(),
+        path_to_share_windows,
+    )
@@ -1,9 +1,52 @@
 """Analysis utilities."""
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
 import pandas as pd
 
+from measuring_intangible_capital.config import DATA_CLEAN_PATH
+from measuring_intangible_capital.data_management.accounts_dataset import (
+    read_accounts,
+)
+from measuring_intangible_capital.error_handling_utilities import (
+    raise_variable_wrong_type,
+)
+from measuring_intangible_capital.klems_cube import KlemsCube
+
+
+def load_accounts(
+    account: Literal["capital", "national", "growth"],
+    years: range | list[int] | None = None,
+    industries: list[str] | None = None,
+    path_to_dataset: Path = DATA_CLEAN_PATH,
+) -> KlemsCube:
+    """Load the clean accounts of all countries into a KLEMS cube.
+
+    Only the rows of the years and industries are read from the clean accounts
+    dataset.
+
+    Args:
+        account (str): the account type: capital, national or growth.
+        years (range | list[int], optional): years to load. If None, all years are
+            loaded.
+        industries (list[str], optional): industry codes to load. If None, all
+            industries are loaded.
+        path_to_dataset (Path): the folder of the clean accounts dataset. Defaults to
+            DATA_CLEAN_PATH.
+
+    Returns:
+        KlemsCube: the accounts of all countries.
+
+    """
+    return KlemsCube.from_accounts(
+        read_accounts(path_to_dataset, account, industries=industries, years=years),
+    )
+
 
 def prepare_accounts(
-    accounts: pd.DataFrame,
+    accounts: KlemsCube,
     years: range,
     industry_code: str,
     country_code: str | None = None,
@@ -14,16 +57,70 @@ def prepare_accounts(
     Dropping the industry code is done so that calculations between capital accounts and national accounts are straight forward.
 
     Args:
-        accounts (pd.DataFrame): The accounts data set for a given country.
+        accounts (KlemsCube): The accounts data set for all countries.
         years (range): The years for which to prepare the data.
-        country_code (str): The country code for which to prepare the data.
+        country_code (str): The country code for which to prepare the data. If None, all countries are kept.
         industry_code (str): The industry code for which to prepare the data.
 
     Returns:
-        pd.DataFrame: The prepared accounts data set.
+        pd.DataFrame: The prepared accounts data set, with index (year, country_code).
 
     """
-    country_code_selector = country_code if country_code else slice(None)
+    raise_variable_wrong_type(accounts, KlemsCube, "accounts")
+
+    labels = {"industry_code": industry_code, "year": list(years)}
+    if country_code:
+        labels["country_code"] = country_code
 
-    accounts = accounts.loc[(industry_code, list(years), country_code_selector)]
+    accounts = accounts.sel(**labels).to_frame()
     return accounts.reset_index(level="industry_code", drop=True)
+
+
+def select_accounts(
+    accounts: KlemsCube,
+    years: range | list[int],
+    industry_codes: str | Mapping[str, str],
+    country_codes: list[str],
+) -> pd.DataFrame:
+    """Select the accounts of each country at one industry in a single indexing of the
+    cube, like ``prepare_accounts`` does for one country.
+
+    Args:
+        accounts (KlemsCube): the accounts of all countries.
+        years (range | list[int]): the years to select.
+        industry_codes (str | Mapping[str, str]): the industry code of all countries,
+            or the industry code of each country.
+        country_codes (list[str]): the countries to select.
+
+    Returns:
+        pd.DataFrame: the accounts with index (year, country_code). Rows without any
+        value are dropped.
+
+    """
+    raise_variable_wrong_type(accounts, KlemsCube, "accounts")
+
+    if isinstance(industry_codes, str):
+        industry_codes = dict.fromkeys(country_codes, industry_codes)
+
+    years = list(years)
+    values = accounts.values[
+        accounts.positions("country_code", country_codes)[:, None],
+        accounts.positions(
+            "industry_code",
+            [industry_codes[country_code] for country_code in country_codes],
+        )[:, None],
+        accounts.positions("year", years)[None, :],
+    ]
+
+    df = pd.DataFrame(
+        values.reshape(len(country_codes) * len(years), -1),
+        index=pd.MultiIndex.from_arrays(
+            [
+                pd.array(np.tile(years, len(country_codes)), dtype=pd.Int16Dtype()),
+                np.repeat(country_codes, len(years)).astype(object),
+            ],
+            names=["year", "country_code"],
+        ),
+        columns=list(accounts.labels["variable_name"]),
+    )
+    return df.dropna(how="all")
@@ -0,0 +1,329 @@
+"""Sums and means of yearly series over any window of years, from prefix sums."""
+
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+from measuring_intangible_capital.analysis.intangible_investment import (
+    calculate_mfp,
+)
+from measuring_intangible_capital.analysis.utilities import select_accounts
+from measuring_intangible_capital.config import (
+    ALL_COUNTRY_CODES_LESS_SK,
+    CAPITAL_ACCOUNT_INDUSTRY_CODE,
+    LABOUR_COMPOSITION_COLUMNS,
+)
+from measuring_intangible_capital.error_handling_utilities import (
+    raise_variable_wrong_type,
+)
+from measuring_intangible_capital.klems_cube import KlemsCube
+
+
+class YearWindows:
+    """Yearly series of all countries with their cumulative sums along the years.
+
+    The sum of a series over the years ``start`` to ``end`` is the difference of two
+    cumulative sums, and its mean divides by the difference of two cumulative counts
+    of the years with a value. So any window of any country is answered in constant
+    time, without going through its years, and all windows at once are a difference
+    of two arrays. Missing values are skipped, like ``pd.Series.mean`` does.
+
+    Args:
+        values (np.ndarray): the values, with shape (countries, years, series).
+        country_codes (Iterable[str]): the countries.
+        years (Iterable[int]): the years, sorted.
+        series_names (Iterable[str]): the names of the series.
+
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        country_codes: Iterable[str],
+        years: Iterable[int],
+        series_names: Iterable[str],
+    ):
+        raise_variable_wrong_type(values, np.ndarray, "values")
+        self.country_codes = tuple(country_codes)
+        self.years = np.array(list(years), dtype=np.int64)
+        self.series_names = tuple(series_names)
+        _raise_shape_invalid(values, self.country_codes, self.years, self.series_names)
+        _raise_years_not_sorted(self.years)
+
+        self._country_positions = {
+            country_code: position
+            for position, country_code in enumerate(self.country_codes)
+        }
+        # A leading zero, so the sum of the positions i to j is sums[j + 1] - sums[i].
+        padding = ((0, 0), (1, 0), (0, 0))
+        self._sums = np.pad(np.nan_to_num(values).cumsum(axis=1), padding)
+        self._counts = np.pad((~np.isnan(values)).cumsum(axis=1), padding)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "YearWindows":
+        """Build the windows from yearly series.
+
+        Args:
+            df (pd.DataFrame): the series of all countries with index (year,
+                country_code) and a column per series, e.g. the shares of
+                ``get_shares_of_intangible_investment_per_gdp``.
+
+        Returns:
+            YearWindows: the windows. Countries and years are sorted.
+
+        """
+        raise_variable_wrong_type(df, pd.DataFrame, "df")
+        _raise_index_invalid(df)
+
+        country_codes = sorted(df.index.unique(level="country_code"))
+        years = sorted(int(year) for year in df.index.unique(level="year"))
+        values = np.full((len(country_codes), len(years), len(df.columns)), np.nan)
+        values[
+            pd.Index(country_codes).get_indexer(
+                df.index.get_level_values("country_code"),
+            ),
+            pd.Index(years).get_indexer(df.index.get_level_values("year").astype(int)),
+        ] = df.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        return cls(values, country_codes, years, map(str, df.columns))
+
+    def sum(
+        self,
+        start: int,
+        end: int,
+        country_codes: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """The sum of each series over the years ``start`` to ``end``.
+
+        Args:
+            start (int): the first year of the window.
+            end (int): the last year of the window.
+            country_codes (list[str], optional): the countries. If None, all countries.
+
+        Returns:
+            pd.DataFrame: the sums with index country_code and a column per series.
+            The sum of a window without values is 0.
+
+        """
+        sums, _ = self._window(start, end, country_codes)
+        return self._to_frame(sums, country_codes)
+
+    def mean(
+        self,
+        start: int,
+        end: int,
+        country_codes: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """The mean of each series over the years ``start`` to ``end``.
+
+        Args:
+            start (int): the first year of the window.
+            end (int): the last year of the window.
+            country_codes (list[str], optional): the countries. If None, all countries.
+
+        Returns:
+            pd.DataFrame: the means with index country_code and a column per series.
+            The mean of a window without values is NaN.
+
+        """
+        sums, counts = self._window(start, end, country_codes)
+        return self._to_frame(_divide(sums, counts), country_codes)
+
+    def all_means(self) -> pd.DataFrame:
+        """The mean of each series over every window of years, e.g. for heatmaps.
+
+        Returns:
+            pd.DataFrame: the means with index (country_code, start, end), for every
+            start and end year with start <= end, and a column per series. Unstack
+            start or end for a matrix of windows.
+
+        """
+        starts, ends = np.triu_indices(len(self.years))
+        sums = self._sums[:, ends + 1] - self._sums[:, starts]
+        counts = self._counts[:, ends + 1] - self._counts[:, starts]
+
+        index = pd.MultiIndex.from_arrays(
+            [
+                np.repeat(self.country_codes, len(starts)).astype(object),
+                np.tile(self.years[starts], len(self.country_codes)),
+                np.tile(self.years[ends], len(self.country_codes)),
+            ],
+            names=["country_code", "start", "end"],
+        )
+        return pd.DataFrame(
+            _divide(sums, counts).reshape(-1, len(self.series_names)),
+            index=index,
+            columns=list(self.series_names),
+        )
+
+    def _window(
+        self,
+        start: int,
+        end: int,
+        country_codes: list[str] | None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        _raise_window_invalid(start, end)
+        first = np.searchsorted(self.years, start, side="left")
+        last = np.searchsorted(self.years, end, side="right")
+        positions = self._positions(country_codes)
+        return (
+            self._sums[positions, last] - self._sums[positions, first],
+            self._counts[positions, last] - self._counts[positions, first],
+        )
+
+    def _positions(self, country_codes: list[str] | None) -> np.ndarray | slice:
+        if country_codes is None:
+            return slice(None)
+        for country_code in country_codes:
+            if country_code not in self._country_positions:
+                msg = f"There are no series of {country_code}."
+                raise KeyError(msg)
+        return np.array(
+            [self._country_positions[country_code] for country_code in country_codes],
+            dtype=np.intp,
+        )
+
+    def _to_frame(
+        self,
+        values: np.ndarray,
+        country_codes: list[str] | None,
+    ) -> pd.DataFrame:
+        return pd.DataFrame(
+            values,
+            index=pd.Index(
+                list(self.country_codes if country_codes is None else country_codes),
+                name="country_code",
+            ),
+            columns=list(self.series_names),
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"YearWindows(country_code: {len(self.country_codes)}, "
+            f"year: {len(self.years)}, series: {len(self.series_names)})"
+        )
+
+
+def get_share_year_windows(yearly_shares: dict[str, pd.DataFrame]) -> YearWindows:
+    """Get the windows of the yearly shares of investment of GDP.
+
+    The series are the columns of all shares, e.g. investment_level, share_intangible,
+    the aggregate categories and share_tangible. A column of a later share with the
+    name of an earlier one, like the total share_intangible of the aggregate
+    categories, is left out.
+
+    Args:
+        yearly_shares (dict[str, pd.DataFrame]): the yearly shares of all countries by
+            share, as returned by ``get_yearly_shares_of_gdp``.
+
+    Returns:
+        YearWindows: the windows of the shares.
+
+    """
+    raise_variable_wrong_type(yearly_shares, dict, "yearly_shares")
+
+    series = []
+    for df in yearly_shares.values():
+        names = [name for series_df in series for name in series_df.columns]
+        series.append(df.loc[:, ~df.columns.isin(names)])
+    return YearWindows.from_frame(pd.concat(series, axis=1))
+
+
+def get_growth_year_windows(
+    growth_accounts: KlemsCube,
+    country_codes: list[str] = ALL_COUNTRY_CODES_LESS_SK,
+) -> YearWindows:
+    """Get the windows of the contributions to labour productivity growth.
+
+    The series are LABOUR_COMPOSITION_COLUMNS and labour_productivity of the growth
+    accounts of CAPITAL_ACCOUNT_INDUSTRY_CODE, for all years of the accounts.
+
+    Args:
+        growth_accounts (KlemsCube): the growth accounts of all countries.
+        country_codes (list[str]): the countries. Defaults to
+            ALL_COUNTRY_CODES_LESS_SK.
+
+    Returns:
+        YearWindows: the windows of the contributions.
+
+    """
+    raise_variable_wrong_type(growth_accounts, KlemsCube, "growth_accounts")
+
+    growth = select_accounts(
+        growth_accounts,
+        growth_accounts.labels["year"],
+        CAPITAL_ACCOUNT_INDUSTRY_CODE,
+        country_codes,
+    )
+    return YearWindows.from_frame(
+        growth[[*LABOUR_COMPOSITION_COLUMNS, "labour_productivity"]],
+    )
+
+
+def get_composition_of_value_added_for_window(
+    growth_windows: YearWindows,
+    start: int,
+    end: int,
+    country_codes: list[str] | None = None,
+) -> pd.DataFrame:
+    """Calculate the composition of value added of all countries over a window of
+    years, like ``get_composition_of_value_added`` does for one country.
+
+    Args:
+        growth_windows (YearWindows): the windows of the contributions to labour
+            productivity growth, see ``get_growth_year_windows``.
+        start (int): the first year of the window.
+        end (int): the last year of the window.
+        country_codes (list[str], optional): the countries. If None, all countries.
+
+    Returns:
+        pd.DataFrame: the mean contributions, labour_productivity and mfp with index
+        country_code.
+
+    """
+    raise_variable_wrong_type(growth_windows, YearWindows, "growth_windows")
+
+    df = growth_windows.mean(start, end, country_codes)
+    df["mfp"] = calculate_mfp(
+        labour_productivity=df["labour_productivity"],
+        labour_composition=df[LABOUR_COMPOSITION_COLUMNS],
+    )
+    return df
+
+
+def _divide(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    return np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
+
+
+def _raise_shape_invalid(
+    values: np.ndarray,
+    country_codes: tuple,
+    years: np.ndarray,
+    series_names: tuple,
+) -> None:
+    shape = (len(country_codes), len(years), len(series_names))
+    if values.shape != shape:
+        msg = f"The values have shape {values.shape}, but the labels {shape}."
+        raise ValueError(msg)
+
+
+def _raise_years_not_sorted(years: np.ndarray) -> None:
+    if (np.diff(years) <= 0).any():
+        msg = "The years must be sorted and unique."
+        raise ValueError(msg)
+
+
+def _raise_window_invalid(start: int, end: int) -> None:
+    if start > end:
+        msg = f"The window must start before it ends, not {start} to {end}."
+        raise ValueError(msg)
+
+
+def _raise_index_invalid(df: pd.DataFrame) -> None:
+    if list(df.index.names) != ["year", "country_code"]:
+        msg = (
+            "The series must have the index (year, country_code), "
+            f"not {tuple(df.index.names)}."
+        )
+        raise ValueError(msg)
@@ -1,5 +1,6 @@
 """All the general configuration of the project."""
 
+import os
 from pathlib import Path
 from typing import Literal
 
@@ -23,11 +24,50 @@ EU_KLEMS_FILE_NAMES = [
     "growth_accounts",
 ]
 
+# Download engine: number of parallel downloads overall and per host, and the size
+# of the chunks streamed to disk.
+EU_KLEMS_DOWNLOAD_MAX_WORKERS = 8
+EU_KLEMS_DOWNLOAD_MAX_PER_HOST = 4
+EU_KLEMS_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+EU_KLEMS_DOWNLOAD_TIMEOUT = 60
+# Retries of throttled (429) and failed (5xx) requests with jittered exponential
+# backoff in seconds, and the sustained and burst number of requests per second.
+EU_KLEMS_DOWNLOAD_MAX_RETRIES = 5
+EU_KLEMS_DOWNLOAD_BACKOFF = 1.0
+EU_KLEMS_DOWNLOAD_MAX_BACKOFF = 60.0
+# Longest wait in seconds honoured from a Retry-After header.
+EU_KLEMS_DOWNLOAD_MAX_RETRY_AFTER = 300.0
+EU_KLEMS_DOWNLOAD_REQUESTS_PER_SECOND = 4.0
+EU_KLEMS_DOWNLOAD_REQUESTS_BURST = 8
+# Download and clean each country in one step over in-memory buffers, without writing
+# the workbooks to disk (unless EU_KLEMS_IN_MEMORY_KEEP_RAW is set too). Useful in
+# ephemeral CI containers. Set with the environment variables of the same name.
+EU_KLEMS_IN_MEMORY = os.environ.get("EU_KLEMS_IN_MEMORY", "0") == "1"
+EU_KLEMS_IN_MEMORY_KEEP_RAW = os.environ.get("EU_KLEMS_IN_MEMORY_KEEP_RAW", "0") == "1"
+# Download into memory and clean all countries in one pipelined task, which starts
+# cleaning a country as soon as its workbooks have arrived.
+EU_KLEMS_PIPELINE = os.environ.get("EU_KLEMS_PIPELINE", "0") == "1"
+EU_KLEMS_PIPELINE_MAX_CLEAN_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+EU_KLEMS_PIPELINE_QUEUE_SIZE = 4
+# Engine reading the Excel workbooks: openpyxl, calamine (if python-calamine is
+# installed), the Parquet cache of the sheets, or auto, which picks the cache if there
+# is one and otherwise the fastest installed engine. Set with EXCEL_ENGINE. With a
+# cache, the engine only parses the sheets missing from it.
+EXCEL_ENGINE_TYPE = Literal["auto", "openpyxl", "calamine", "cache"]
+EXCEL_ENGINE = os.environ.get("EXCEL_ENGINE", "auto")
+# Seconds for which the parsed download links are used without asking the website.
+EU_KLEMS_LINK_INDEX_TTL = 24 * 60 * 60
+
 # Paths
 SRC = Path(__file__).parent.resolve()
 BLD = SRC.joinpath("..", "..", "bld").resolve()
 EU_KLEMS_DATA_DOWNLOAD_PATH = BLD.joinpath("original_data").resolve()
+EU_KLEMS_LINK_INDEX_PATH = EU_KLEMS_DATA_DOWNLOAD_PATH.joinpath("link_index.json")
+EU_KLEMS_MANIFEST_PATH = EU_KLEMS_DATA_DOWNLOAD_PATH.joinpath("manifest.json")
+EU_KLEMS_RAW_CACHE_PATH = BLD.joinpath("raw_cache").resolve()
+GDP_RAW_CACHE_PATH = BLD.joinpath("raw_cache", "gdp").resolve()
 DATA_CLEAN_PATH = BLD.joinpath("python", "data_clean").resolve()
+DATA_CLEAN_FULL_PATH = BLD.joinpath("python", "data_clean_full").resolve()
 BLD_PYTHON = BLD.joinpath("python").resolve()
 
 TEST_DIR = SRC.joinpath("..", "..", "tests").resolve()
@@ -94,32 +134,39 @@ INTANGIBLE_DETAIL_CATEGORIES = [
     "software_and_databases",
     "training",
 ]
-
-INTANGIBLE_DETAIL_CATEGORIES_TYPE = Literal[
-    "brand",
-    "design",
-    "new_financial_product",
-    "entertainment_and_artistic",
-    "organizational_capital",
-    "research_and_development",
-    "software_and_databases",
-    "training",
-]
 # Columns on intangible investment as classified by CHS (2005)
 INTANGIBLE_AGGREGATE_CATEGORIES = [
     "computerized_information",
     "innovative_property",
     "economic_competencies",
 ]
-
-INTANGIBLE_AGGREGATE_CATEGORIES_TYPE = Literal[
-    "computerized_information",
-    "innovative_property",
-    "economic_competencies",
-]
+# Detail categories which make up each aggregate category, @see get_aggregation_matrix
+INTANGIBLE_AGGREGATE_CATEGORY_MAPPING = {
+    "computerized_information": ["software_and_databases", "research_and_development"],
+    "innovative_property": [
+        "entertainment_and_artistic",
+        "new_financial_product",
+        "design",
+    ],
+    "economic_competencies": ["organizational_capital", "brand", "training"],
+}
 
 CAPITAL_ACCOUNT_INDUSTRY_CODE = "MARKT"
 NATIONAL_ACCOUNT_INDUSTRY_CODE = "TOT"
+# For Greece, the investment is under TOT industry code. There's no data on the industry
+# level.
+CAPITAL_ACCOUNT_INDUSTRY_CODE_OVERRIDES = {"EL": NATIONAL_ACCOUNT_INDUSTRY_CODE}
+# Only these industries are read from the EU KLEMS sheets by the cleaning tasks. With
+# EU_KLEMS_FULL_STORE=1, the accounts of all industries are also stored separately.
+EU_KLEMS_INDUSTRIES = [CAPITAL_ACCOUNT_INDUSTRY_CODE, NATIONAL_ACCOUNT_INDUSTRY_CODE]
+EU_KLEMS_FULL_STORE = os.environ.get("EU_KLEMS_FULL_STORE", "0") == "1"
+# With EU_KLEMS_COMPACT=1, the clean accounts of all countries share fixed categories
+# for their ids, and with EU_KLEMS_COMPACT_FLOAT32=1 also store float32 values.
+EU_KLEMS_COMPACT = os.environ.get("EU_KLEMS_COMPACT", "0") == "1"
+EU_KLEMS_COMPACT_FLOAT32 = os.environ.get("EU_KLEMS_COMPACT_FLOAT32", "0") == "1"
+# Rows per row group of the files of the clean accounts dataset. Smaller row groups
+# let readers skip more rows by the statistics of each row group.
+ACCOUNTS_DATASET_ROW_GROUP_SIZE = 1_000
 
 LABOUR_COMPOSITION_COLUMNS = [
     "intangible",
@@ -5,13 +5,13 @@ from measuring_intangible_capital.data_management.clean_eu_klems_data import (
     read_data,
 )
 from measuring_intangible_capital.data_management.download.eu_klems_download import (
-    get_eu_klems_download_page,
-    get_urls_file_names_by_country,
+    get_eu_klems_link_index,
+    get_link_index,
 )
 
 __all__ = [
     clean_and_reshape_eu_klems,
     read_data,
-    get_eu_klems_download_page,
-    get_urls_file_names_by_country,
+    get_eu_klems_link_index,
+    get_link_index,
 ]
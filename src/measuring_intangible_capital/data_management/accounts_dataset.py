@@ -0,0 +1,216 @@
+"""Functions for storing the clean EU KLEMS accounts in one partitioned Parquet
+dataset."""
+
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from measuring_intangible_capital.config import ACCOUNTS_DATASET_ROW_GROUP_SIZE
+from measuring_intangible_capital.error_handling_utilities import (
+    raise_variable_wrong_type,
+)
+
+ACCOUNTS_INDEX_NAMES = ["industry_code", "year", "country_code"]
+CATEGORICAL_INDEX_NAMES = ["industry_code", "country_code"]
+VARIABLE_NAMES_METADATA_KEY = b"variable_names"
+CATEGORIES_METADATA_KEY = b"categories"
+
+
+def write_accounts(df: pd.DataFrame, path: Path) -> None:
+    """Write the clean accounts of a country to their file in the dataset.
+
+    The dataset is partitioned by account type and country, so the file of the
+    capital accounts of Austria is ``<dataset>/account=capital/country_code=AT/
+    accounts.parquet``, see ``get_account_data_paths``. The country code is only
+    stored in the path. Rows are in the order of the clean layout, by industry and
+    year, so the statistics of each row group let readers skip the row groups of
+    other industries and years. The file is written to a temporary file first and
+    then moved into place, so readers never see a partial file. The categories of
+    categorical industry and country codes, e.g. the shared categories of
+    ``compact_eu_klems_accounts``, are stored in the metadata of the file, so that
+    ``read_accounts`` restores them.
+
+    Args:
+        df (pd.DataFrame): clean accounts of one country with index (industry_code,
+            year, country_code) and a column per variable. Empty accounts, e.g. of a
+            country without growth accounts, are written as an empty file.
+        path (Path): the file of the accounts in the dataset.
+
+    """
+    raise_variable_wrong_type(df, pd.DataFrame, "df")
+    raise_variable_wrong_type(path, Path, "path")
+
+    if df.empty:
+        table = pa.table({})
+    else:
+        _raise_index_invalid(df)
+        _raise_country_not_partition(df, path)
+        table = pa.Table.from_pandas(
+            df.set_axis(df.columns.astype(str), axis=1)
+            .reset_index()
+            .drop(columns="country_code"),
+            preserve_index=False,
+        )
+        metadata = {VARIABLE_NAMES_METADATA_KEY: json.dumps(_get_variable_names(df))}
+        categories = _get_index_categories(df)
+        if categories:
+            metadata[CATEGORIES_METADATA_KEY] = json.dumps(categories)
+        table = table.replace_schema_metadata(metadata)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path_to_tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    pq.write_table(table, path_to_tmp, row_group_size=ACCOUNTS_DATASET_ROW_GROUP_SIZE)
+    os.replace(path_to_tmp, path)
+
+
+def read_accounts(
+    path_to_dataset: Path,
+    account: str,
+    country_codes: list[str] | None = None,
+    industries: list[str] | None = None,
+    years: range | list[int] | None = None,
+) -> pd.DataFrame:
+    """Read the clean accounts of an account type from the dataset.
+
+    The filters are pushed down to the dataset: countries not asked for are not
+    opened at all and row groups without the industries or years are skipped by their
+    statistics.
+
+    Args:
+        path_to_dataset (Path): the folder of the dataset.
+        account (str): the account type: capital, national or growth.
+        country_codes (list[str], optional): countries to read. If None, all
+            countries are read.
+        industries (list[str], optional): industry codes to read. If None, all
+            industries are read.
+        years (range | list[int], optional): years to read. If None, all years are
+            read.
+
+    Returns:
+        pd.DataFrame: the accounts with index (industry_code, year, country_code) and
+        a column per variable, as written by the cleaning tasks. The industry and
+        country codes get the categories stored by ``write_accounts`` if all files
+        share them, so the accounts read with different filters have the same dtypes.
+        Otherwise they get the categories of the codes read.
+
+    """
+    raise_variable_wrong_type(path_to_dataset, Path, "path_to_dataset")
+    path_to_account = path_to_dataset / f"account={account}"
+    _raise_account_missing(path_to_account, account)
+
+    files = sorted(path_to_account.glob("country_code=*/*.parquet"))
+    schemas = [pq.read_schema(path) for path in files]
+    schema = pa.unify_schemas(schemas, promote_options="permissive")
+    if "industry_code" not in schema.names:
+        return pd.DataFrame()
+
+    variable_names = dict.fromkeys(
+        variable_name
+        for file_schema in schemas
+        if file_schema.metadata
+        for variable_name in json.loads(
+            file_schema.metadata[VARIABLE_NAMES_METADATA_KEY],
+        )
+    )
+
+    filters = [
+        (column, "in", list(values))
+        for column, values in {
+            "country_code": country_codes,
+            "industry_code": industries,
+            "year": years,
+        }.items()
+        if values is not None
+    ]
+    dataset = ds.dataset(
+        [str(path) for path in files],
+        schema=schema.append(pa.field("country_code", pa.string())),
+        format="parquet",
+        partitioning="hive",
+        partition_base_dir=str(path_to_account),
+    )
+    table = dataset.to_table(
+        filter=pq.filters_to_expression(filters) if filters else None,
+    )
+
+    df = table.replace_schema_metadata(None).to_pandas()
+    categories = _get_shared_index_categories(schemas)
+    df = df.astype(
+        {
+            **{
+                name: pd.CategoricalDtype(categories[name])
+                if name in categories
+                else "category"
+                for name in CATEGORICAL_INDEX_NAMES
+            },
+            "year": pd.Int16Dtype(),
+        },
+    ).set_index(ACCOUNTS_INDEX_NAMES)
+
+    return df.set_axis(
+        pd.CategoricalIndex(df.columns, categories=list(variable_names)),
+        axis=1,
+    )
+
+
+def _get_variable_names(df: pd.DataFrame) -> list[str]:
+    if isinstance(df.columns, pd.CategoricalIndex):
+        return list(map(str, df.columns.categories))
+    return list(map(str, df.columns))
+
+
+def _get_index_categories(df: pd.DataFrame) -> dict[str, list[str]]:
+    categories = {}
+    for name in CATEGORICAL_INDEX_NAMES:
+        dtype = df.index.get_level_values(name).dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            categories[name] = list(map(str, dtype.categories))
+    return categories
+
+
+def _get_shared_index_categories(schemas: list[pa.Schema]) -> dict[str, list[str]]:
+    """The categories of each id which all files with accounts store, and agree on."""
+    categories_by_file = [
+        json.loads(schema.metadata.get(CATEGORIES_METADATA_KEY, b"{}"))
+        for schema in schemas
+        if schema.metadata and VARIABLE_NAMES_METADATA_KEY in schema.metadata
+    ]
+    if not categories_by_file:
+        return {}
+    return {
+        name: categories
+        for name, categories in categories_by_file[0].items()
+        if all(other.get(name) == categories for other in categories_by_file[1:])
+    }
+
+
+def _raise_index_invalid(df: pd.DataFrame) -> None:
+    if list(df.index.names) != ACCOUNTS_INDEX_NAMES:
+        msg = (
+            f"The accounts must have the index {tuple(ACCOUNTS_INDEX_NAMES)}, "
+            f"not {tuple(df.index.names)}."
+        )
+        raise ValueError(msg)
+
+
+def _raise_country_not_partition(df: pd.DataFrame, path: Path) -> None:
+    country_codes = set(df.index.get_level_values("country_code").astype(str))
+    if {f"country_code={country_code}" for country_code in country_codes} != {
+        path.parent.name,
+    }:
+        msg = (
+            f"The accounts of {sorted(country_codes)} must be written to the "
+            f"partition of their country, not to {path.parent.name}."
+        )
+        raise ValueError(msg)
+
+
+def _raise_account_missing(path_to_account: Path, account: str) -> None:
+    if not path_to_account.is_dir():
+        msg = f"There are no {account} accounts in the dataset."
+        raise FileNotFoundError(msg)
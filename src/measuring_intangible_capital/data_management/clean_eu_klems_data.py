@@ -1,10 +1,25 @@
 """Function(s) for cleaning the EU KLEMS data set(s)."""
 
+from collections.abc import Callable
+from io import BytesIO
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
-from measuring_intangible_capital.data_management.utilities import clean_data
+from measuring_intangible_capital.config import ALL_COUNTRY_CODES, EXCEL_ENGINE_TYPE
+from measuring_intangible_capital.data_management.raw_cache import (
+    read_excel_sheets_cached,
+)
+from measuring_intangible_capital.data_management.stream_eu_klems_data import (
+    build_eu_klems_cube,
+    stream_and_reshape_eu_klems,
+)
+from measuring_intangible_capital.data_management.utilities import (
+    clean_data,
+    get_excel_engine,
+    read_excel_sheets,
+)
 from measuring_intangible_capital.error_handling_utilities import (
     raise_data_info_invalid,
     raise_variable_none,
@@ -14,15 +29,31 @@ from measuring_intangible_capital.error_handling_utilities import (
 
 def read_data(
     data_info: dict,
-    path_to_capital_accounts: Path,
-    path_to_national_accounts: Path,
+    path_to_capital_accounts: Path | BytesIO,
+    path_to_national_accounts: Path | BytesIO,
+    path_to_cache: Path | None = None,
+    years: range | None = None,
+    industries: list[str] | None = None,
+    engine: EXCEL_ENGINE_TYPE = "auto",
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
     """Read investment and national accounts data from the EU KLEMS data set. The data
     is read for a specific country and the sheets specified in the data_info object.
+    The workbooks are read either from a file or from an in-memory buffer.
 
     Args:
         data_info (dict): yaml file with information on the data set.
         country_code (str): AT, CZ, DK, EL, SK, UK, US
+        path_to_cache (Path, optional): folder of the Parquet cache of the sheets. If
+            None, the sheets are parsed from the workbooks. Otherwise, ``engine`` only
+            parses the sheets missing from the cache.
+        years (range, optional): years to read. If given, only these year columns and
+            the id columns kept by ``clean_data`` are read. If None, all columns are
+            read.
+        industries (list[str], optional): industry codes to read (MARKT, TOT, etc).
+            The other rows are dropped while streaming through the sheets. If None,
+            all industries are read.
+        engine (str): openpyxl, calamine, cache (needs ``path_to_cache``) or auto,
+            see ``get_excel_engine``.
 
     Returns:
         tuple[list[pd.DataFrame], list[pd.DataFrame]]: list of capital accounts data frames, list of national accounts data frames
@@ -35,32 +66,45 @@ def read_data(
     )
     raise_variable_wrong_type(
         path_to_capital_accounts,
-        Path,
+        (Path, BytesIO),
         "path_to_capital_accounts",
     )
     raise_variable_wrong_type(
         path_to_national_accounts,
-        Path,
+        (Path, BytesIO),
         "path_to_national_accounts",
     )
 
-    national_accounts_dfs = []
-    capital_accounts_dfs = []
+    usecols = _get_columns_to_read(data_info, years)
+    filters = _get_rows_to_read(data_info, industries)
     # BLD / EU_KLEMS_DATA_DOWNLOAD_PATH / country_code / "intangible_analytical.xlsx"
-    for sheet in data_info["sheets_to_read"]["intangible_analytical_detailed"]:
-        data_sheet = pd.read_excel(path_to_capital_accounts, sheet_name=sheet)
-        capital_accounts_dfs.append(data_sheet)
-
-    for sheet in data_info["sheets_to_read"]["national_accounts"]:
-        data_sheet = pd.read_excel(path_to_national_accounts, sheet_name=sheet)
-        national_accounts_dfs.append(data_sheet)
+    capital_accounts_dfs = _read_sheets(
+        path_to_capital_accounts,
+        data_info["sheets_to_read"]["intangible_analytical_detailed"],
+        path_to_cache,
+        usecols,
+        filters,
+        engine,
+    )
+    national_accounts_dfs = _read_sheets(
+        path_to_national_accounts,
+        data_info["sheets_to_read"]["national_accounts"],
+        path_to_cache,
+        usecols,
+        filters,
+        engine,
+    )
 
     return capital_accounts_dfs, national_accounts_dfs
 
 
 def read_growth_accounts(
     data_info: dict,
-    path_to_growth_accounts: Path,
+    path_to_growth_accounts: Path | BytesIO,
+    path_to_cache: Path | None = None,
+    years: range | None = None,
+    industries: list[str] | None = None,
+    engine: EXCEL_ENGINE_TYPE = "auto",
 ) -> list[pd.DataFrame]:
     """Read growth accounts data from the EU KLEMS data set. The data is read for a
     specific country and the sheets specified in the data_info object.
@@ -68,6 +112,17 @@ def read_growth_accounts(
     Args:
         data_info (dict): yaml file with information on the data set.
         country_code (str): AT, CZ, DK, EL
+        path_to_cache (Path, optional): folder of the Parquet cache of the sheets. If
+            None, the sheets are parsed from the workbook. Otherwise, ``engine`` only
+            parses the sheets missing from the cache.
+        years (range, optional): years to read. If given, only these year columns and
+            the id columns kept by ``clean_data`` are read. If None, all columns are
+            read.
+        industries (list[str], optional): industry codes to read (MARKT, TOT, etc).
+            The other rows are dropped while streaming through the sheets. If None,
+            all industries are read.
+        engine (str): openpyxl, calamine, cache (needs ``path_to_cache``) or auto,
+            see ``get_excel_engine``.
 
     Returns:
         tuple[list[pd.DataFrame], list[pd.DataFrame]]: list of capital accounts data frames, list of national accounts data frames
@@ -75,27 +130,127 @@ def read_growth_accounts(
     """
     raise_data_info_invalid(data_info)
     _raise_keys_not_valid(data_info, ["growth_accounts"])
-    raise_variable_wrong_type(path_to_growth_accounts, Path, "path_to_growth_accounts")
+    raise_variable_wrong_type(
+        path_to_growth_accounts,
+        (Path, BytesIO),
+        "path_to_growth_accounts",
+    )
 
-    growth_accounts_dfs = []
+    return _read_sheets(
+        path_to_growth_accounts,
+        data_info["sheets_to_read"]["growth_accounts"],
+        path_to_cache,
+        _get_columns_to_read(data_info, years),
+        _get_rows_to_read(data_info, industries),
+        engine,
+    )
 
-    for sheet in data_info["sheets_to_read"]["growth_accounts"]:
-        data_sheet = pd.read_excel(path_to_growth_accounts, sheet_name=sheet)
-        growth_accounts_dfs.append(data_sheet)
 
-    return growth_accounts_dfs
+def clean_eu_klems_accounts(
+    data_info: dict,
+    raw_files: dict[str, Path | BytesIO],
+    years: range,
+    path_to_cache: Path | None = None,
+    industries: list[str] | None = None,
+    streaming: bool = False,
+    engine: EXCEL_ENGINE_TYPE = "auto",
+) -> dict[str, pd.DataFrame]:
+    """Read, clean and reshape all accounts of a country.
+
+    Args:
+        data_info (dict): Information on data set stored in eu_klems_data_info.yaml.
+        raw_files (dict[str, Path | BytesIO]): the downloaded workbooks of the country,
+            as files or in-memory buffers, by file name (intangible_analytical, etc).
+        years (range): years to keep.
+        path_to_cache (Path, optional): folder of the Parquet cache of the sheets.
+        industries (list[str], optional): industry codes to keep. If None, all
+            industries are kept.
+        streaming (bool): whether to stream the sheets straight into the clean layout
+            with ``stream_and_reshape_eu_klems``, instead of reading them as data
+            frames first. The cache is not used then.
+        engine (str): the engine to read the sheets as data frames with, see
+            ``get_excel_engine``.
+
+    Returns:
+        dict[str, pd.DataFrame]: the clean capital, national and growth accounts. The
+        growth accounts are empty if there is no growth accounts workbook (Slovakia).
+
+    """
+    _raise_raw_files_missing(raw_files, ["intangible_analytical", "national_accounts"])
+
+    if streaming:
+        return {
+            key: stream_and_reshape_eu_klems(
+                path=raw_files[file_name],
+                sheet_names=data_info["sheets_to_read"][sheets_key],
+                data_info=data_info,
+                years=years,
+                industries=industries,
+            )
+            if file_name in raw_files
+            else pd.DataFrame()
+            for key, file_name, sheets_key in [
+                ("capital", "intangible_analytical", "intangible_analytical_detailed"),
+                ("national", "national_accounts", "national_accounts"),
+                ("growth", "growth_accounts", "growth_accounts"),
+            ]
+        }
+
+    capital_accounts_raw, national_accounts_raw = read_data(
+        data_info=data_info,
+        path_to_capital_accounts=raw_files["intangible_analytical"],
+        path_to_national_accounts=raw_files["national_accounts"],
+        path_to_cache=path_to_cache,
+        years=years,
+        industries=industries,
+        engine=engine,
+    )
+
+    accounts = {
+        "capital": clean_and_reshape_eu_klems(
+            capital_accounts_raw,
+            data_info,
+            years=years,
+        ),
+        "national": clean_and_reshape_eu_klems(
+            national_accounts_raw,
+            data_info,
+            years=years,
+        ),
+        "growth": pd.DataFrame(),
+    }
+
+    if "growth_accounts" in raw_files:
+        growth_accounts_raw = read_growth_accounts(
+            data_info=data_info,
+            path_to_growth_accounts=raw_files["growth_accounts"],
+            path_to_cache=path_to_cache,
+            years=years,
+            industries=industries,
+            engine=engine,
+        )
+        accounts["growth"] = clean_and_reshape_eu_klems(
+            growth_accounts_raw,
+            data_info,
+            years=years,
+        )
+
+    return accounts
 
 
 def clean_and_reshape_eu_klems(
     raw: list[pd.DataFrame],
     data_info: dict,
     years: range,
+    industries: list[str] | None = None,
 ) -> pd.DataFrame:
     """Clean and reshape the EU KLEMS data set.
 
     Args:
         raw (pd.DataFrame): The raw data set.
         data_info (dict): Information on data set stored in eu_klems_data_info.yaml.
+        industries (list[str], optional): industry codes to keep. If None, all
+            industries are kept.
 
     Returns:
         pd.DataFrame: The cleaned and reshaped data set.
@@ -112,142 +267,215 @@ def clean_and_reshape_eu_klems(
 
     for df in raw:
         data_clean = clean_data(df, data_info)
-        data_clean = data_clean.set_index(["industry_code"])
+        if industries is not None:
+            data_clean = data_clean[data_clean["industry_code"].isin(industries)]
         data.append(data_clean)
 
-    df = _concat_eu_klems_data(dfs=data)
-    df = _transform_years_columns(df=df, years=years)
-
-    df["variable_name"] = _rename_variable_category(
-        sr=df["variable_name"],
-        category_names=data_info["variable_name_mapping"],
+    return _reshape_years_to_cube(
+        df=pd.concat(data, ignore_index=True),
+        years=years,
+        variable_name_mapping=data_info["variable_name_mapping"],
     )
-    return _pivot_investment_level_to_concrete_investment_categories(df)
 
 
-def _pivot_investment_level_to_concrete_investment_categories(
-    df: pd.DataFrame,
-) -> pd.DataFrame:
-    """Pivot the investment_level column to investment categories as columns. Investment
-    categories are the variable_name column. Values for the investment categories are
-    the investment_level column. Finally, round all values to 3 decimal places and
-    removes the name of the columns.
+def get_shared_categories(
+    data_info: dict,
+    industries: list[str] | None = None,
+    country_codes: list[str] = ALL_COUNTRY_CODES,
+) -> dict[str, list[str]]:
+    """Get the categories of the ids of the clean accounts, shared by all countries.
 
-    The investment categories can be seen in the data_info.yaml file.
+    The variable names are the new names of all sheets in ``sheets_to_read``, so the
+    capital, national and growth accounts share them too.
 
     Args:
-        df (pd.DataFrame): The data set.
+        data_info (dict): Information on data set stored in eu_klems_data_info.yaml.
+        industries (list[str], optional): the industry codes kept. If None, the
+            industry codes are not known in advance and get no shared categories.
+        country_codes (list[str]): the country codes. Defaults to ALL_COUNTRY_CODES.
 
     Returns:
-        pd.DataFrame: The pivoted data set.
+        dict[str, list[str]]: the sorted categories of industry_code, country_code and
+        variable_name.
 
     """
-    df = df.pivot_table(
-        values="investment_level",
-        index=["industry_code", "year", "country_code"],
-        columns="variable_name",
-        observed=True,
-    )
-    df.round(3)
-    df.columns.name = None
+    raise_data_info_invalid(data_info)
+
+    mapping = data_info["variable_name_mapping"]
+    variable_names = {
+        mapping.get(sheet, sheet)
+        for sheet_names in data_info["sheets_to_read"].values()
+        for sheet in sheet_names
+    }
+    categories = {
+        "country_code": sorted(country_codes),
+        "variable_name": sorted(variable_names | set(mapping.values())),
+    }
+    if industries is not None:
+        categories["industry_code"] = sorted(industries)
 
-    return df
+    return categories
 
 
-def _concat_eu_klems_data(dfs: list[pd.DataFrame]) -> pd.DataFrame:
-    """Concatenate all sheets of data into one DataFrame. Sets the variable_name column
-    to categorical type.
+def compact_eu_klems_accounts(
+    df: pd.DataFrame,
+    categories: dict[str, list[str]],
+    float32: bool = False,
+) -> pd.DataFrame:
+    """Store the clean accounts with compact, shared dtypes.
+
+    The industry and country codes of the index and the variable names of the columns
+    get the fixed categories of ``get_shared_categories`` instead of the ones observed
+    in a country, so the accounts of all countries have the same dtypes and stay
+    categorical after ``pd.concat``. Years are nullable Int16.
 
     Args:
-        dfs (list[pd.DataFrame]): The list of data frames to concatenate.
+        df (pd.DataFrame): clean accounts with index (industry_code, year,
+            country_code) and a column per variable.
+        categories (dict[str, list[str]]): the categories by id, see
+            ``get_shared_categories``. Ids without categories keep theirs.
+        float32 (bool): whether to store the values as float32 instead of float64.
+            This halves their size, with about seven significant digits.
 
     Returns:
-        pd.DataFrame: The concatenated data set.
+        pd.DataFrame: the accounts with compact dtypes.
 
     """
-    concatenated = pd.concat(dfs)
-    # Category type is not preserved when concatenating dataframes
-    # @see https://stackoverflow.com/questions/45639350/retaining-categorical-dtype-upon-dataframe-concatenation
-    concatenated["variable_name"] = concatenated["variable_name"].astype(
-        pd.CategoricalDtype(),
-    )
+    raise_variable_wrong_type(df, pd.DataFrame, "df")
+    if df.empty:
+        return df
+
+    levels = []
+    for name in df.index.names:
+        level = df.index.get_level_values(name)
+        if name == "year":
+            level = level.astype(pd.Int16Dtype())
+        elif name in categories:
+            _raise_categories_missing(level, categories[name], name)
+            level = pd.CategoricalIndex(level, categories=categories[name])
+        levels.append(level)
+
+    columns = df.columns
+    if "variable_name" in categories:
+        _raise_categories_missing(columns, categories["variable_name"], "variable_name")
+        columns = pd.CategoricalIndex(
+            columns.astype(str),
+            categories=categories["variable_name"],
+        )
 
-    return concatenated
+    return pd.DataFrame(
+        df.to_numpy(dtype=np.float32 if float32 else np.float64),
+        index=pd.MultiIndex.from_arrays(levels, names=df.index.names),
+        columns=columns,
+    )
 
 
-def _transform_years_columns(
+def _reshape_years_to_cube(
     df: pd.DataFrame,
     years: range,
-    var_name="year",
-    value_name="investment_level",
+    variable_name_mapping: dict[str, str],
 ) -> pd.DataFrame:
-    """Transform the data set from wide to long format based on the years columns.
+    """Reshape the year columns of the sheets to the clean layout, with index
+    (industry_code, year, country_code) and a column per variable.
 
-    The dataset has values under every year column. The returned data set has a year column and the values
-    for each each year are stacked under the investment_level column.
+    Instead of melting every year column into rows and pivoting the long table back,
+    the ids are factorized and the block of year columns of each row is placed as a
+    whole in a preallocated (industry, year, country, variable) array. The result is
+    the same as with ``melt`` and ``pivot_table``.
 
     Args:
-        df (pd.DataFrame): The data set.
-        years (range): years from to range (2000, 2020) for example
-        var_name (str, optional): The name of the variable column passed to the ``melt`` method. Defaults to "year".
-        value_name (str, optional): The name of the value column passed to the ``melt`` method. Defaults to "investment_level".
+        df (pd.DataFrame): the concatenated clean sheets.
+        years (range): years to keep.
+        variable_name_mapping (dict[str, str]): new names of the variables.
 
     Returns:
-        pd.DataFrame: The transformed data set.
+        pd.DataFrame: The reshaped data set.
 
     """
-    years_as_str = list(map(str, years))
-
-    df = df.melt(
-        value_vars=years_as_str,
-        value_name=value_name,
-        var_name=var_name,
-        id_vars=["variable_name", "country_code"],
-        ignore_index=False,
+    id_columns = ["industry_code", "country_code", "variable_name"]
+    keys = np.empty((len(df), len(id_columns)), dtype=np.intp)
+    codes = {}
+
+    for dimension, column in enumerate(id_columns):
+        keys[:, dimension], uniques = pd.factorize(df[column])
+        codes[column] = {id_: code for code, id_ in enumerate(uniques)}
+
+    # Like groupby, drop the rows with a missing id.
+    observed = (keys >= 0).all(axis=1)
+    values = df[list(map(str, years))].to_numpy(dtype=np.float64)
+
+    return build_eu_klems_cube(
+        keys=keys[observed],
+        values=values[observed],
+        codes=codes,
+        years=years,
+        variable_name_mapping=variable_name_mapping,
     )
 
-    df["year"] = df["year"].astype(pd.Int16Dtype())
 
-    return df
+def _read_sheets(
+    path: Path | BytesIO,
+    sheet_names: list[str],
+    path_to_cache: Path | None,
+    usecols: Callable[[str], bool] | None,
+    filters: dict[str, list] | None,
+    engine: EXCEL_ENGINE_TYPE,
+) -> list[pd.DataFrame]:
+    engine = get_excel_engine(engine, path_to_cache)
+    if path_to_cache is not None:
+        return read_excel_sheets_cached(
+            path,
+            sheet_names,
+            path_to_cache,
+            usecols,
+            filters,
+            engine=engine,
+        )
+    return read_excel_sheets(path, sheet_names, usecols, filters, engine)
 
 
-def _rename_variable_category(sr: pd.Series, category_names: dict) -> pd.Series:
-    """Rename variable_name category. When we read a data set the variable_name is the
-    name of data set. For capital accounts for example we read I_Soft_DB, which is
-    computer software and databases. For national accounts we read VA_CP which is value
-    we use as GDP here. This function renames this crude names to more descriptive ones.
+def _get_columns_to_read(
+    data_info: dict,
+    years: range | None,
+) -> Callable[[str], bool] | None:
+    """Get the function selecting the columns of the EU KLEMS sheets to read.
 
-    The rename dict can be seen in eu_klems_data_info.yaml file.
-    ### Aggregate components
-    I_Innovprop: intellectual_property
-    I_EconComp: economic_competencies
+    The id columns are the renamed columns which are not dropped by ``clean_data``
+    (var, nace_r2_code, geo_code). All other columns are years.
 
-    ### Computerized Information
-    I_Soft_DB: software_and_databases
-    I_RD: research_and_development
+    """
+    if years is None:
+        return None
 
-    ### Intangible Assets national accounts
-    I_OIPP: entertainment_and_artistic
-    I_NFP: new_financial_product
-    I_Design: design
+    id_columns = set(data_info["column_rename_mapping"]) - set(
+        data_info["columns_to_drop"],
+    )
+    years_as_str = set(map(str, years))
 
-    ### Economic competencies
-    I_OrgCap: organizational_capital
-    I_Brand: brand
-    I_Train: training
+    return lambda column: column in id_columns or str(column) in years_as_str
 
-    ### National accounts
-    VA_CP: gdp
 
-    Args:
-        sr (pd.Series): the series to rename
-        category_names (dict): category name map in the form of {'old_name': 'new_name'}
+def _get_rows_to_read(
+    data_info: dict,
+    industries: list[str] | None,
+) -> dict[str, list] | None:
+    """Get the industry codes to read, by the name of the industry code column."""
+    if industries is None:
+        return None
 
-    Returns:
-        pd.Series: renamed series
+    industry_column = {
+        new_name: column
+        for column, new_name in data_info["column_rename_mapping"].items()
+    }["industry_code"]
 
-    """
-    return sr.cat.rename_categories(category_names)
+    return {industry_column: industries}
+
+
+def _raise_categories_missing(ids: pd.Index, categories: list[str], name: str):
+    missing = set(ids.astype(str)) - set(categories)
+    if missing:
+        msg = f"The {name} ids {sorted(missing)} are not in the shared categories."
+        raise ValueError(msg)
 
 
 def _raise_raw_empty(raw):
@@ -256,6 +484,13 @@ def _raise_raw_empty(raw):
         raise ValueError(msg)
 
 
+def _raise_raw_files_missing(raw_files, file_names: list[str]):
+    for file_name in file_names:
+        if file_name not in raw_files:
+            msg = f"The raw_files argument must contain {file_name}."
+            raise KeyError(msg)
+
+
 def _raise_keys_not_valid(data_info, sheet_names: list[str]):
     if "sheets_to_read" not in data_info:
         msg = "The data_info dictionary must contain the key 'sheets_to_read'."
@@ -4,8 +4,19 @@ from pathlib import Path
 
 import pandas as pd
 
-from measuring_intangible_capital.config import ALL_COUNTRY_CODES, ALL_COUNTRY_CODES_MAP
-from measuring_intangible_capital.data_management.utilities import clean_data
+from measuring_intangible_capital.config import (
+    ALL_COUNTRY_CODES,
+    ALL_COUNTRY_CODES_MAP,
+    EXCEL_ENGINE_TYPE,
+)
+from measuring_intangible_capital.data_management.raw_cache import (
+    read_excel_sheets_cached,
+)
+from measuring_intangible_capital.data_management.utilities import (
+    clean_data,
+    get_excel_engine,
+    read_excel_sheets,
+)
 from measuring_intangible_capital.error_handling_utilities import (
     raise_data_info_invalid,
     raise_variable_none,
@@ -13,12 +24,21 @@ from measuring_intangible_capital.error_handling_utilities import (
 )
 
 
-def read_data(path: Path, data_info: dict) -> pd.DataFrame:
+def read_data(
+    path: Path,
+    data_info: dict,
+    engine: EXCEL_ENGINE_TYPE = "auto",
+    path_to_cache: Path | None = None,
+) -> pd.DataFrame:
     """Read the data from the World Bank. Read the first N rows for each country in the
     analysis.
 
     Args:
         data_info (dict): yaml file with information on the data set.
+        engine (str): openpyxl, calamine, cache (needs ``path_to_cache``) or auto, see
+            ``get_excel_engine``.
+        path_to_cache (Path, optional): folder of the Parquet cache of the sheets. If
+            given, ``engine`` only parses the sheet if it is missing from the cache.
 
     Returns:
         pd.DataFrame: GDP per capita data
@@ -29,11 +49,22 @@ def read_data(path: Path, data_info: dict) -> pd.DataFrame:
     raise_data_info_invalid(data_info)
     raise_variable_wrong_type(path, Path, "path")
 
-    return pd.read_excel(
-        path,
-        sheet_name=data_info["sheets_to_read"],
-        nrows=len(ALL_COUNTRY_CODES),
-    )
+    engine = get_excel_engine(engine, path_to_cache)
+    sheet_names = [data_info["sheets_to_read"]]
+    nrows = len(ALL_COUNTRY_CODES)
+
+    if path_to_cache is not None:
+        (gdp,) = read_excel_sheets_cached(
+            path,
+            sheet_names,
+            path_to_cache,
+            nrows=nrows,
+            engine=engine,
+        )
+    else:
+        (gdp,) = read_excel_sheets(path, sheet_names, engine=engine, nrows=nrows)
+
+    return gdp
 
 
 def clean_gdp_per_capita(raw: pd.DataFrame, data_info: dict):
@@ -0,0 +1,591 @@
+"""Functions to download many EU KLEMS files concurrently over one HTTP session."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from measuring_intangible_capital.config import (
+    EU_KLEMS_DOWNLOAD_BACKOFF,
+    EU_KLEMS_DOWNLOAD_CHUNK_SIZE,
+    EU_KLEMS_DOWNLOAD_MAX_PER_HOST,
+    EU_KLEMS_DOWNLOAD_MAX_RETRIES,
+    EU_KLEMS_DOWNLOAD_MAX_WORKERS,
+    EU_KLEMS_DOWNLOAD_REQUESTS_BURST,
+    EU_KLEMS_DOWNLOAD_REQUESTS_PER_SECOND,
+    EU_KLEMS_DOWNLOAD_TIMEOUT,
+)
+from measuring_intangible_capital.data_management.download.retry import (
+    TokenBucket,
+    call_with_retries,
+)
+from measuring_intangible_capital.error_handling_utilities import (
+    raise_variable_wrong_type,
+)
+
+
+def create_download_session(
+    pool_size: int = EU_KLEMS_DOWNLOAD_MAX_WORKERS,
+) -> requests.Session:
+    """Create a HTTP session which keeps connections alive between downloads.
+
+    The connection pool is sized to the number of workers, so that every worker can
+    reuse an open connection instead of opening a new one for every file.
+
+    Args:
+        pool_size (int): number of connections kept open per host.
+
+    Returns:
+        requests.Session: the session to share between all downloads.
+
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def create_rate_limiter(
+    requests_per_second: float | None = EU_KLEMS_DOWNLOAD_REQUESTS_PER_SECOND,
+) -> TokenBucket | None:
+    """Create the token bucket limiting the request rate of all downloads of a run.
+
+    Args:
+        requests_per_second (float, optional): sustained request rate over all
+            workers. None for no limit.
+
+    Returns:
+        TokenBucket: the rate limiter, None if there is no limit.
+
+    """
+    if requests_per_second is None:
+        return None
+    return TokenBucket(rate=requests_per_second, burst=EU_KLEMS_DOWNLOAD_REQUESTS_BURST)
+
+
+class HostLimits:
+    """Limit the number of downloads running against each host at the same time.
+
+    Share one instance between all downloads of a run, also between several calls of
+    ``download_to_memory`` running at once, so that the limit holds for all of them.
+
+    Args:
+        max_per_host (int): maximum number of downloads running against one host.
+
+    """
+
+    def __init__(self, max_per_host: int = EU_KLEMS_DOWNLOAD_MAX_PER_HOST):
+        _raise_limit_invalid(max_per_host, "max_per_host")
+        self.max_per_host = max_per_host
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> threading.BoundedSemaphore:
+        """Return the semaphore of the host of ``url``, to hold during each attempt of
+        a download, see ``call_with_retries``."""
+        host = _get_host(url)
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._semaphores[host]
+
+
+def download_files(
+    downloads: list[tuple[str, Path]],
+    max_workers: int = EU_KLEMS_DOWNLOAD_MAX_WORKERS,
+    max_per_host: int = EU_KLEMS_DOWNLOAD_MAX_PER_HOST,
+    session: requests.Session | None = None,
+    path_to_manifest: Path | None = None,
+    revalidate: bool = False,
+    max_retries: int = EU_KLEMS_DOWNLOAD_MAX_RETRIES,
+    backoff: float = EU_KLEMS_DOWNLOAD_BACKOFF,
+    requests_per_second: float | None = EU_KLEMS_DOWNLOAD_REQUESTS_PER_SECOND,
+) -> dict:
+    """Download all files at once with a bounded pool of workers.
+
+    All workers share one keep-alive session. The number of downloads running against
+    the same host at the same time is limited by ``max_per_host``.
+
+    Each file is first written to a ``.part`` file next to its destination and only
+    renamed once complete, so an interrupted download never leaves a truncated file
+    behind. The next run resumes the ``.part`` file with a HTTP Range request.
+
+    If ``path_to_manifest`` is given, the SHA-256 and size of every downloaded file is
+    recorded there. Files whose size and modification time still match the manifest
+    are not downloaded again. With ``revalidate``, the server is asked for each of
+    these files whether it has changed since (If-None-Match/If-Modified-Since). A file
+    is only replaced if its content differs, otherwise it is left untouched, so that
+    pytask does not rerun the tasks depending on it.
+
+    Throttled (429) and failed (5xx) requests are retried with a jittered exponential
+    backoff, honouring Retry-After headers. Retries resume from the ``.part`` file. All
+    workers share a token bucket which limits the overall request rate.
+
+    Args:
+        downloads (list[tuple[str, Path]]): pairs of (url, path to save the file to).
+        max_workers (int): maximum number of downloads running at the same time.
+        max_per_host (int): maximum number of downloads running against one host.
+        session (requests.Session, optional): session to use. A new one is created
+            and closed if not provided.
+        path_to_manifest (Path, optional): json file with the checksums of downloaded
+            files.
+        revalidate (bool): whether to ask the server if files in the manifest have
+            changed.
+        max_retries (int): number of retries of a failed download.
+        backoff (float): base of the exponential backoff in seconds.
+        requests_per_second (float, optional): sustained request rate over all
+            workers. None for no limit.
+
+    Returns:
+        dict: download statistics. Keys are files (number of files downloaded),
+        skipped (number of files which were already up to date), bytes, seconds,
+        throughput (bytes per second) and decisions ("downloaded" or "unchanged" for
+        the path of every file).
+
+    """
+    raise_variable_wrong_type(downloads, list, "downloads")
+    _raise_limit_invalid(max_workers, "max_workers")
+    _raise_limit_invalid(max_per_host, "max_per_host")
+
+    manifest = read_manifest(path_to_manifest) if path_to_manifest else {}
+    manifest_keys = [_get_manifest_key(path, path_to_manifest) for _, path in downloads]
+
+    owns_session = session is None
+    if owns_session:
+        session = create_download_session(pool_size=max_workers)
+
+    rate_limiter = create_rate_limiter(requests_per_second)
+    host_limits = HostLimits(max_per_host)
+
+    def download(download_and_key) -> tuple[str, int]:
+        (url, path), key = download_and_key
+        manifest_entry = manifest.get(key)
+        verified = verify_file(path, manifest_entry)
+
+        if verified and not revalidate:
+            return "unchanged", 0
+
+        decision, downloaded_bytes, response_headers = call_with_retries(
+            lambda: _download_file(
+                session=session,
+                url=url,
+                path=path,
+                manifest_entry=manifest_entry if verified else None,
+            ),
+            max_retries=max_retries,
+            backoff=backoff,
+            rate_limiter=rate_limiter,
+            host_limit=host_limits.for_url(url),
+        )
+
+        if decision == "downloaded":
+            manifest[key] = _get_manifest_entry(url, path, response_headers)
+        else:
+            manifest[key] = {**manifest_entry, **_get_validators(response_headers)}
+        return decision, downloaded_bytes
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(download, zip(downloads, manifest_keys)))
+    finally:
+        if owns_session:
+            session.close()
+        if path_to_manifest:
+            write_manifest(manifest, path_to_manifest)
+    seconds = time.perf_counter() - start
+
+    return _get_download_statistics(
+        decisions={
+            str(path): decision for (_, path), (decision, _) in zip(downloads, results)
+        },
+        total_bytes=sum(downloaded_bytes for _, downloaded_bytes in results),
+        seconds=seconds,
+    )
+
+
+def download_to_memory(
+    urls: dict[str, str],
+    max_workers: int = EU_KLEMS_DOWNLOAD_MAX_WORKERS,
+    max_per_host: int = EU_KLEMS_DOWNLOAD_MAX_PER_HOST,
+    session: requests.Session | None = None,
+    max_retries: int = EU_KLEMS_DOWNLOAD_MAX_RETRIES,
+    backoff: float = EU_KLEMS_DOWNLOAD_BACKOFF,
+    requests_per_second: float | None = EU_KLEMS_DOWNLOAD_REQUESTS_PER_SECOND,
+    rate_limiter: TokenBucket | None = None,
+    host_limits: HostLimits | None = None,
+) -> dict[str, BytesIO]:
+    """Download files at once into memory buffers instead of files on disk.
+
+    Downloads are retried and rate limited like in ``download_files``. To download
+    several sets of files at the same time, e.g. the files of several countries, pass
+    the same session, rate limiter and host limits to every call, so that the limits
+    hold for the whole run.
+
+    Args:
+        urls (dict[str, str]): the url of each file, by name.
+        max_workers (int): maximum number of downloads running at the same time.
+        max_per_host (int): maximum number of downloads running against one host. Not
+            used if ``host_limits`` is given.
+        session (requests.Session, optional): session to use. A new one is created
+            and closed if not provided.
+        max_retries (int): number of retries of a failed download.
+        backoff (float): base of the exponential backoff in seconds.
+        requests_per_second (float, optional): sustained request rate over all
+            workers. None for no limit. Not used if ``rate_limiter`` is given.
+        rate_limiter (TokenBucket, optional): rate limiter shared with other
+            downloads, see ``create_rate_limiter``.
+        host_limits (HostLimits, optional): host limits shared with other downloads.
+
+    Returns:
+        dict[str, BytesIO]: the content of each file, by name, positioned at the start.
+
+    """
+    raise_variable_wrong_type(urls, dict, "urls")
+    _raise_limit_invalid(max_workers, "max_workers")
+    _raise_limit_invalid(max_per_host, "max_per_host")
+
+    owns_session = session is None
+    if owns_session:
+        session = create_download_session(pool_size=max_workers)
+    if rate_limiter is None:
+        rate_limiter = create_rate_limiter(requests_per_second)
+    if host_limits is None:
+        host_limits = HostLimits(max_per_host)
+
+    def download(url: str) -> BytesIO:
+        return call_with_retries(
+            lambda: _download_to_buffer(session=session, url=url),
+            max_retries=max_retries,
+            backoff=backoff,
+            rate_limiter=rate_limiter,
+            host_limit=host_limits.for_url(url),
+        )
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            buffers = list(executor.map(download, urls.values()))
+    finally:
+        if owns_session:
+            session.close()
+
+    return dict(zip(urls, buffers))
+
+
+def read_manifest(path_to_manifest: Path) -> dict:
+    """Read the manifest of downloaded files.
+
+    Args:
+        path_to_manifest (Path): json file with the checksums of downloaded files.
+
+    Returns:
+        dict: for each file, relative to the manifest folder, its url, sha256, size
+        and mtime_ns. Empty if there is no manifest yet.
+
+    """
+    try:
+        with open(path_to_manifest) as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_manifest(manifest: dict, path_to_manifest: Path) -> None:
+    """Write the manifest of downloaded files, replacing the old one atomically.
+
+    Args:
+        manifest (dict): as returned by ``read_manifest``.
+        path_to_manifest (Path): json file with the checksums of downloaded files.
+
+    """
+    path_to_manifest.parent.mkdir(parents=True, exist_ok=True)
+    path_to_temp = path_to_manifest.with_suffix(".tmp")
+
+    with open(path_to_temp, "w") as file:
+        json.dump(dict(sorted(manifest.items())), file, indent=2)
+
+    os.replace(path_to_temp, path_to_manifest)
+
+
+def verify_file(path: Path, manifest_entry: dict | None, thorough=False) -> bool:
+    """Check that a downloaded file is the one recorded in the manifest.
+
+    By default only size and modification time are compared, which needs no read of
+    the file. With ``thorough`` the SHA-256 of the content is compared as well.
+
+    Args:
+        path (Path): the downloaded file.
+        manifest_entry (dict, optional): the manifest entry of the file.
+        thorough (bool): whether to compare the checksum of the content.
+
+    Returns:
+        bool: True if the file exists and matches the manifest entry.
+
+    """
+    if manifest_entry is None or not path.exists():
+        return False
+
+    stat = path.stat()
+    if stat.st_size != manifest_entry["size"]:
+        return False
+    if thorough:
+        return _hash_file(path) == manifest_entry["sha256"]
+
+    return stat.st_mtime_ns == manifest_entry["mtime_ns"]
+
+
+def format_download_statistics(statistics: dict) -> str:
+    """Format download statistics for printing.
+
+    Args:
+        statistics (dict): statistics as returned by ``download_files``.
+
+    Returns:
+        str: one line summary, e.g. "Downloaded 55 files (412.3 MB) in 30.1s (13.70
+        MB/s), 0 files up to date".
+
+    """
+    return (
+        f"Downloaded {statistics['files']} files "
+        f"({statistics['bytes'] / 1e6:.1f} MB) in {statistics['seconds']:.1f}s "
+        f"({statistics['throughput'] / 1e6:.2f} MB/s), "
+        f"{statistics['skipped']} files up to date"
+    )
+
+
+def _download_file(
+    session: requests.Session,
+    url: str,
+    path: Path,
+    manifest_entry: dict | None = None,
+) -> tuple[str, int, dict]:
+    """Download a file into its ``.part`` file, then move it to its destination.
+
+    If the manifest entry of the current file is given, the download is conditional on
+    the file having changed on the server, and the current file is kept if the new
+    content is identical.
+
+    Returns the decision ("downloaded" or "unchanged"), the number of bytes transferred
+    and the response headers.
+
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path_to_part = _get_part_path(path)
+
+    status_code, written, response_headers = _download_to_part_file(
+        session=session,
+        url=url,
+        path=path_to_part,
+        headers=_get_conditional_headers(manifest_entry),
+    )
+
+    if status_code == requests.codes.not_modified:
+        return "unchanged", written, response_headers
+
+    _get_validator_path(path_to_part).unlink(missing_ok=True)
+    if (
+        manifest_entry is not None
+        and _hash_file(path_to_part) == manifest_entry["sha256"]
+    ):
+        # Keep the current file, so that its modification time does not change.
+        path_to_part.unlink()
+        return "unchanged", written, response_headers
+
+    os.replace(path_to_part, path)
+    return "downloaded", written, response_headers
+
+
+def _download_to_part_file(
+    session: requests.Session,
+    url: str,
+    path: Path,
+    headers: dict,
+    resume: bool = True,
+) -> tuple[int, int, dict]:
+    """Stream a file to disk, resuming an existing partial file with a Range request.
+
+    A partial file is only resumed if the ETag or Last-Modified of its response was
+    stored next to it. It is sent as If-Range, so that the server answers with the
+    whole file instead of the missing bytes if the file has changed since. If the
+    server cannot satisfy the range, e.g. because the partial file is as large as the
+    file on the server, the partial file is dropped and downloaded once more without a
+    Range request.
+
+    Returns the status code, the number of bytes transferred and the response headers.
+
+    """
+    path_to_validator = _get_validator_path(path)
+    validator = _read_validator(path_to_validator) if resume and path.exists() else None
+    offset = path.stat().st_size if validator else 0
+    request_headers = (
+        {"Range": f"bytes={offset}-", "If-Range": validator} if offset else headers
+    )
+
+    with session.get(
+        url,
+        headers=request_headers,
+        stream=True,
+        timeout=EU_KLEMS_DOWNLOAD_TIMEOUT,
+    ) as response:
+        if (
+            offset
+            and response.status_code == requests.codes.requested_range_not_satisfiable
+        ):
+            # The partial file does not belong to the file on the server anymore.
+            path.unlink(missing_ok=True)
+            path_to_validator.unlink(missing_ok=True)
+            return _download_to_part_file(
+                session=session,
+                url=url,
+                path=path,
+                headers=headers,
+                resume=False,
+            )
+
+        response.raise_for_status()
+        if response.status_code == requests.codes.not_modified:
+            return response.status_code, 0, response.headers
+
+        resumed = offset > 0 and _get_range_start(response) == offset
+        if not resumed:
+            _write_validator(path_to_validator, response.headers)
+
+        written = 0
+        with open(path, "ab" if resumed else "wb") as file:
+            for chunk in response.iter_content(EU_KLEMS_DOWNLOAD_CHUNK_SIZE):
+                file.write(chunk)
+                written += len(chunk)
+
+    return response.status_code, written, response.headers
+
+
+def _download_to_buffer(session: requests.Session, url: str) -> BytesIO:
+    buffer = BytesIO()
+
+    with session.get(url, stream=True, timeout=EU_KLEMS_DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(EU_KLEMS_DOWNLOAD_CHUNK_SIZE):
+            buffer.write(chunk)
+
+    buffer.seek(0)
+    return buffer
+
+
+def _get_conditional_headers(manifest_entry: dict | None) -> dict:
+    """Ask the server to answer with 304 Not Modified if the file has not changed."""
+    if manifest_entry is None:
+        return {}
+
+    headers = {}
+    if manifest_entry.get("etag"):
+        headers["If-None-Match"] = manifest_entry["etag"]
+    if manifest_entry.get("last_modified"):
+        headers["If-Modified-Since"] = manifest_entry["last_modified"]
+    return headers
+
+
+def _get_validators(response_headers) -> dict:
+    validators = {
+        "etag": response_headers.get("ETag"),
+        "last_modified": response_headers.get("Last-Modified"),
+    }
+    return {key: value for key, value in validators.items() if value is not None}
+
+
+def _get_range_start(response: requests.Response) -> int | None:
+    """Return the first byte of a partial response, e.g. 100 for "bytes 100-199/200"."""
+    if response.status_code != requests.codes.partial_content:
+        return None
+
+    content_range = response.headers.get("Content-Range", "")
+    try:
+        return int(content_range.split(" ")[1].split("-")[0])
+    except (IndexError, ValueError):
+        return None
+
+
+def _get_part_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.part")
+
+
+def _get_validator_path(path_to_part: Path) -> Path:
+    return path_to_part.with_name(f"{path_to_part.name}.validator")
+
+
+def _read_validator(path_to_validator: Path) -> str | None:
+    """Return the ETag, or else the Last-Modified, of the response of a partial file."""
+    try:
+        return path_to_validator.read_text() or None
+    except FileNotFoundError:
+        return None
+
+
+def _write_validator(path_to_validator: Path, response_headers) -> None:
+    validators = _get_validators(response_headers)
+    validator = validators.get("etag") or validators.get("last_modified")
+    if validator is None:
+        path_to_validator.unlink(missing_ok=True)
+    else:
+        path_to_validator.write_text(validator)
+
+
+def _get_manifest_key(path: Path, path_to_manifest: Path | None) -> str:
+    if path_to_manifest is None:
+        return str(path)
+    try:
+        return path.relative_to(path_to_manifest.parent).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def _get_manifest_entry(url: str, path: Path, response_headers) -> dict:
+    stat = path.stat()
+    return {
+        "url": url,
+        "sha256": _hash_file(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        **_get_validators(response_headers),
+    }
+
+
+def _hash_file(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(EU_KLEMS_DOWNLOAD_CHUNK_SIZE):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _get_host(url: str) -> str:
+    return urlparse(url).netloc
+
+
+def _get_download_statistics(
+    decisions: dict[str, str],
+    total_bytes: int,
+    seconds: float,
+) -> dict:
+    return {
+        "files": sum(decision == "downloaded" for decision in decisions.values()),
+        "skipped": sum(decision == "unchanged" for decision in decisions.values()),
+        "decisions": decisions,
+        "bytes": total_bytes,
+        "seconds": seconds,
+        "throughput": total_bytes / seconds if seconds > 0 else 0.0,
+    }
+
+
+def _raise_limit_invalid(limit, name: str):
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+        msg = f"{name} must be a positive integer."
+        raise ValueError(msg)
@@ -1,13 +1,30 @@
 """Functions to download data from the EU KLEMS website."""
 
+import json
+import os
 import re
+import threading
+import time
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from urllib.parse import unquote, urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from measuring_intangible_capital.config import (
+    ALL_COUNTRY_CODES,
+    EU_KLEMS_DOWNLOAD_TIMEOUT,
+    EU_KLEMS_LINK_INDEX_PATH,
+    EU_KLEMS_LINK_INDEX_TTL,
     EU_KLEMS_WEBSITE,
     FILES_TO_DOWNLOAD_NAMES,
 )
+from measuring_intangible_capital.data_management.download.download_engine import (
+    download_to_memory,
+)
+from measuring_intangible_capital.data_management.download.retry import (
+    call_with_retries,
+)
 
 
 def _links_names():
@@ -21,62 +38,212 @@ def _links_names():
     return re.compile("|".join(FILES_TO_DOWNLOAD_NAMES))
 
 
-def _extract_file_name_from_href(href: str, country_code: str) -> str:
-    """Extract the file name from the URL and clean it.
+def _split_href(href: str) -> tuple[str, str]:
+    """Split the URL of a download link into the country code and the file name.
 
     Example:
-        https://www.dropbox.com/s/5usiqokdj2orzlv/SK_intangible%20analytical.xlsx?dl=1 -> intangible_analytical.xlsx
+        https://www.dropbox.com/s/5usiqokdj2orzlv/SK_intangible%20analytical.xlsx?dl=1 -> (SK, intangible_analytical)
     Args:
         href (str): the URL of the file
-        country_code (str): country_code contained in the URL.
 
     Returns:
-        str: the cleaned file name
+        tuple[str, str]: the country code and the cleaned file name without extension.
+
+    """
+    file_name = unquote(PurePosixPath(urlparse(href).path).name)
+    country_code, _, file_name = file_name.partition("_")
+    return country_code, os.path.splitext(file_name)[0].replace(" ", "_")
+
+
+def get_link_index(
+    html: str,
+    country_codes: list[str] = ALL_COUNTRY_CODES,
+) -> dict[str, dict[str, str]]:
+    """Return the URL of every download link on the EU KLEMS download page, by country.
+
+    In the EU KLEMS website, there are download links for every country data set. The
+    page is walked once and only ``<a>`` tags are parsed, the rest of the page is
+    skipped. Download links are for at most 5 files per country. Growth accounts,
+    intangible analytics data, labour and capital accounts and national accounts.
+
+    Args:
+        html (str): HTML of the EU KLEMS download page.
+        country_codes (list[str]): countries to keep in the index.
+
+    Returns:
+        dict[str, dict[str, str]]: the URL of each file for each country, e.g.
+        {"AT": {"national_accounts": "https://www.dropbox.com/..."}}.
 
     """
-    file_name = href.split(country_code)[1].strip("?dl=1")[1:]
-    return file_name.replace("%20", "_")
+    link_index = {country_code: {} for country_code in country_codes}
+    links_names = _links_names()
+    links = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("a", href=True))
+
+    for link in links.find_all("a", string=links_names):
+        href: str = link["href"]
+        if href.startswith("#"):
+            continue
 
+        country_code, file_name = _split_href(href)
+        if country_code in link_index:
+            link_index[country_code][file_name] = href
 
-def get_eu_klems_download_page() -> BeautifulSoup:
-    """Return a BeautifulSoup object of the EU KLEMS download page.
+    return link_index
 
-    Access HTML tags, attributes and content from the EU KLEMS download page.
-    Example: page.title # <title>EU KLEMS</title>
+
+def get_eu_klems_link_index(
+    path_to_cache: Path = EU_KLEMS_LINK_INDEX_PATH,
+    ttl: float = EU_KLEMS_LINK_INDEX_TTL,
+    url: str = EU_KLEMS_WEBSITE,
+) -> dict[str, dict[str, str]]:
+    """Return the download links of the EU KLEMS website for every country.
+
+    The parsed links are cached on disk. Within ``ttl`` seconds of the last check the
+    cache is used without any network access. After that, the page is requested with
+    the ETag and Last-Modified values of the cached response, and only downloaded and
+    parsed again if the website has changed.
+
+    Args:
+        path_to_cache (Path): json file to cache the link index in.
+        ttl (float): seconds for which the cache is used without asking the website.
+        url (str): address of the EU KLEMS download page.
+
+    Returns:
+        dict[str, dict[str, str]]: the URL of each file for each country, e.g.
+        {"AT": {"national_accounts": "https://www.dropbox.com/..."}}.
 
     """
-    return BeautifulSoup(requests.get(EU_KLEMS_WEBSITE).text, "html.parser")
+    cache = _read_link_index_cache(path_to_cache)
+
+    if cache is not None and time.time() - cache["checked_at"] < ttl:
+        return cache["link_index"]
+
+    headers = {}
+    if cache is not None and cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    if cache is not None and cache.get("last_modified"):
+        headers["If-Modified-Since"] = cache["last_modified"]
+
+    response = call_with_retries(
+        lambda: _get_download_page(url, headers),
+    )
+
+    if cache is not None and response.status_code == requests.codes.not_modified:
+        cache["checked_at"] = time.time()
+    else:
+        cache = {
+            "checked_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "link_index": get_link_index(response.text),
+        }
+
+    _write_link_index_cache(cache, path_to_cache)
+    return cache["link_index"]
+
 
+def get_downloads_for_countries(
+    link_index: dict[str, dict[str, str]],
+    paths_by_country: dict[str, dict[str, Path]],
+) -> list[tuple[str, Path]]:
+    """Match every file to download with its URL in the link index.
 
-def get_urls_file_names_by_country(
-    page: BeautifulSoup,
+    Args:
+        link_index (dict[str, dict[str, str]]): as returned by ``get_eu_klems_link_index``.
+        paths_by_country (dict[str, dict[str, Path]]): paths to save the files to for
+            each country, as returned by ``get_eu_klems_download_paths``.
+
+    Returns:
+        list[tuple[str, Path]]: pairs of (url, path to save the file to).
+
+    """
+    downloads = []
+
+    for country_code, paths in paths_by_country.items():
+        for file_name, path in paths.items():
+            _raise_link_missing(link_index, country_code, file_name)
+            downloads.append((link_index[country_code][file_name], path))
+
+    return downloads
+
+
+def download_eu_klems_country_to_memory(
     country_code: str,
-) -> tuple[list[str], list[str]]:
-    """Return a list of URLs that contain a country code and the extracted file name
-    from the url. In the EU KLEMS website, there are download links for every country
-    data set. This function deals with the extraction of the file names and urls of the
-    download links.
+    file_names: list[str],
+    link_index: dict[str, dict[str, str]],
+    paths_to_raw_data: dict[str, Path] | None = None,
+    **download_options,
+) -> dict[str, BytesIO]:
+    """Download the EU KLEMS files of a country into memory, to be read without a round
+    trip over the disk.
+
+    The link index is resolved once by the caller and shared by all countries, so that
+    countries downloaded at the same time neither request nor write it again.
 
     Args:
-        page (BeautifulSoup): the EU KLEMS download page
-        country_codes: (str): a country code to filter the download links
+        country_code (str): the country to download the files for.
+        file_names (list[str]): the files to download, e.g. ["national_accounts"].
+        link_index (dict[str, dict[str, str]]): as returned by
+            ``get_eu_klems_link_index``.
+        paths_to_raw_data (dict[str, Path], optional): if given, also save each file
+            to its path here, as returned by ``get_eu_klems_download_paths``.
+        **download_options: passed on to ``download_to_memory``, e.g. the session,
+            rate limiter and host limits shared by all countries.
+
     Returns:
-        tuple[list[str], list[str]]: tuple of lists containing the URLs and file names for the
-        selected country. Download links are for at most 5 files per country.
-        Growth accounts, intangible analytics data, labour and capital accounts and national accounts.
+        dict[str, BytesIO]: the content of each file, by file name.
 
     """
-    country_urls = []
-    file_names = []
+    for file_name in file_names:
+        _raise_link_missing(link_index, country_code, file_name)
+
+    buffers = download_to_memory(
+        {file_name: link_index[country_code][file_name] for file_name in file_names},
+        **download_options,
+    )
+
+    if paths_to_raw_data is not None:
+        for file_name, buffer in buffers.items():
+            paths_to_raw_data[file_name].parent.mkdir(parents=True, exist_ok=True)
+            paths_to_raw_data[file_name].write_bytes(buffer.getvalue())
+
+    return buffers
+
+
+def _get_download_page(url: str, headers: dict) -> requests.Response:
+    response = requests.get(url, headers=headers, timeout=EU_KLEMS_DOWNLOAD_TIMEOUT)
+    response.raise_for_status()
+    return response
+
+
+def _read_link_index_cache(path_to_cache: Path) -> dict | None:
+    try:
+        with open(path_to_cache) as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_link_index_cache(cache: dict, path_to_cache: Path) -> None:
+    """Write the cache atomically. Each writer uses its own temporary file, so that
+    concurrent writers do not replace each other's file before it is renamed.
+
+    """
+    path_to_cache.parent.mkdir(parents=True, exist_ok=True)
+    path_to_temp = path_to_cache.with_name(
+        f"{path_to_cache.name}.{os.getpid()}.{threading.get_ident()}.tmp",
+    )
+
+    with open(path_to_temp, "w") as file:
+        json.dump(cache, file, indent=2)
 
-    links_to_download = page.find_all("a", string=_links_names())
+    os.replace(path_to_temp, path_to_cache)
 
-    for link in links_to_download:
-        current_href: str = link.get("href")
-        if current_href is not None and not current_href.startswith("#"):
-            if country_code in current_href:
-                country_urls.append(current_href)
-                file_name = _extract_file_name_from_href(current_href, country_code)
-                file_names.append(file_name)
 
-    return country_urls, file_names
+def _raise_link_missing(link_index: dict, country_code: str, file_name: str):
+    if file_name not in link_index.get(country_code, {}):
+        msg = (
+            f"No download link for {file_name} of {country_code} on the EU KLEMS "
+            "website."
+        )
+        raise KeyError(msg)
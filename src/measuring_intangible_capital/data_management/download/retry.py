@@ -0,0 +1,202 @@
+"""Functions to retry throttled requests and to limit the request rate."""
+
+import random
+import threading
+import time
+from collections.abc import Callable
+from contextlib import nullcontext
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from measuring_intangible_capital.config import (
+    EU_KLEMS_DOWNLOAD_BACKOFF,
+    EU_KLEMS_DOWNLOAD_MAX_BACKOFF,
+    EU_KLEMS_DOWNLOAD_MAX_RETRIES,
+    EU_KLEMS_DOWNLOAD_MAX_RETRY_AFTER,
+)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class TokenBucket:
+    """Limit the rate of requests shared by all download workers.
+
+    The bucket holds at most ``burst`` tokens and is refilled with ``rate`` tokens per
+    second. Every request takes one token and waits until one is available.
+
+    Args:
+        rate (float): sustained number of requests per second.
+        burst (int): number of requests which can be made at once.
+
+    """
+
+    def __init__(self, rate: float, burst: int):
+        _raise_rate_invalid(rate, burst)
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, waiting until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                wait = self._paused_until - now
+                if wait <= 0 and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                if wait <= 0:
+                    wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for ``seconds``, e.g. as asked by Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+
+def call_with_retries(
+    function: Callable,
+    max_retries: int = EU_KLEMS_DOWNLOAD_MAX_RETRIES,
+    backoff: float = EU_KLEMS_DOWNLOAD_BACKOFF,
+    rate_limiter: TokenBucket | None = None,
+    max_retry_after: float = EU_KLEMS_DOWNLOAD_MAX_RETRY_AFTER,
+    host_limit: threading.Semaphore | None = None,
+):
+    """Call a function making a request, retrying if the request is throttled or fails.
+
+    Between attempts, wait for a jittered exponential backoff or as long as the server
+    asks for in its Retry-After header, whichever is longer. A Retry-After also pauses
+    the rate limiter, so that the other workers back off as well. Retry-After is capped
+    at ``max_retry_after``, so that a server cannot stall the workers indefinitely.
+    The host limit is only held during an attempt, so that waiting for the next one
+    does not block the other downloads from the same host.
+
+    Args:
+        function (Callable): function without arguments which makes the request and
+            raises ``requests.HTTPError`` for error responses.
+        max_retries (int): number of retries after the first attempt.
+        backoff (float): base of the exponential backoff in seconds.
+        rate_limiter (TokenBucket, optional): limiter to take a token from before each
+            attempt.
+        max_retry_after (float): longest wait in seconds honoured from a Retry-After
+            header.
+        host_limit (threading.Semaphore, optional): semaphore to hold during each
+            attempt, e.g. of the host of the request, see ``HostLimits``.
+
+    Returns:
+        Any: the return value of the function.
+
+    """
+    _raise_max_retries_invalid(max_retries)
+
+    for attempt in range(max_retries + 1):
+        try:
+            with host_limit or nullcontext():
+                if rate_limiter is not None:
+                    rate_limiter.acquire()
+                return function()
+        except (requests.HTTPError, *RETRY_EXCEPTIONS) as error:
+            if attempt == max_retries or not _is_retryable(error):
+                raise
+
+            retry_after = _get_retry_after(error)
+            if retry_after is not None:
+                retry_after = min(retry_after, max_retry_after)
+            if retry_after is not None and rate_limiter is not None:
+                rate_limiter.pause(retry_after)
+
+            time.sleep(
+                max(get_backoff_delay(attempt, backoff), retry_after or 0.0),
+            )
+
+
+def get_backoff_delay(
+    attempt: int,
+    backoff: float = EU_KLEMS_DOWNLOAD_BACKOFF,
+    max_backoff: float = EU_KLEMS_DOWNLOAD_MAX_BACKOFF,
+) -> float:
+    """Return a random delay between 0 and ``backoff * 2**attempt`` ("full jitter").
+
+    Args:
+        attempt (int): number of the failed attempt, starting at 0.
+        backoff (float): base of the exponential backoff in seconds.
+        max_backoff (float): upper bound of the delay in seconds.
+
+    Returns:
+        float: seconds to wait before the next attempt.
+
+    """
+    return random.uniform(0, min(max_backoff, backoff * 2**attempt))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header, either in seconds or as a HTTP date.
+
+    Args:
+        value (str, optional): the header value, e.g. "120" or "Wed, 21 Oct 2015
+            07:28:00 GMT".
+
+    Returns:
+        float: seconds to wait, None if the header is missing or invalid.
+
+    """
+    if value is None:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, requests.HTTPError):
+        return (
+            error.response is not None
+            and error.response.status_code in RETRY_STATUS_CODES
+        )
+    return True
+
+
+def _get_retry_after(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    return parse_retry_after(response.headers.get("Retry-After"))
+
+
+def _raise_rate_invalid(rate, burst):
+    if rate <= 0 or burst < 1:
+        msg = "The rate must be positive and the burst at least 1."
+        raise ValueError(msg)
+
+
+def _raise_max_retries_invalid(max_retries):
+    if (
+        not isinstance(max_retries, int)
+        or isinstance(max_retries, bool)
+        or max_retries < 0
+    ):
+        msg = "max_retries must be a non-negative integer."
+        raise ValueError(msg)
@@ -1,45 +1,76 @@
 """Task to download data from the EU KLEMS website."""
-import os
-import urllib
+import logging
 from pathlib import Path
 from typing import Annotated
 
-from bs4 import BeautifulSoup
-from measuring_intangible_capital.config import ALL_COUNTRY_CODES
+from measuring_intangible_capital.config import (
+    ALL_COUNTRY_CODES,
+    EU_KLEMS_IN_MEMORY,
+    EU_KLEMS_MANIFEST_PATH,
+    EU_KLEMS_PIPELINE,
+    SRC,
+)
+from measuring_intangible_capital.data_management.download.download_engine import (
+    download_files,
+    format_download_statistics,
+)
 from measuring_intangible_capital.data_management.download.eu_klems_download import (
-    get_eu_klems_download_page,
-    get_urls_file_names_by_country,
+    get_downloads_for_countries,
+    get_eu_klems_link_index,
+)
+from measuring_intangible_capital.utilities import (
+    get_eu_klems_download_paths,
+    get_eu_klems_file_names_to_download,
+    read_yaml,
 )
-from measuring_intangible_capital.utilities import get_eu_klems_download_paths
-from pytask import Product, task
+from pytask import Product
 
-eu_klems_download_deps = {"scripts": Path("eu_klems_download.py")}
-eu_klems_download_page: BeautifulSoup = get_eu_klems_download_page()
+logger = logging.getLogger(__name__)
+
+eu_klems_download_deps = {
+    "scripts": [
+        Path("eu_klems_download.py"),
+        Path("download_engine.py"),
+        Path("retry.py"),
+    ],
+    "data_info": SRC / "data_management" / "eu_klems_data_info.yaml",
+}
+# Only the files which are read when cleaning the data are downloaded.
+eu_klems_file_names_to_download = get_eu_klems_file_names_to_download(
+    read_yaml(eu_klems_download_deps["data_info"]),
+)
+eu_klems_download_products = {
+    country: get_eu_klems_download_paths(country, eu_klems_file_names_to_download)
+    for country in ALL_COUNTRY_CODES
+}
 
 
-for country in ALL_COUNTRY_CODES:
-    eu_klems_download_products = get_eu_klems_download_paths(country)
+# With EU_KLEMS_IN_MEMORY or EU_KLEMS_PIPELINE, the data is downloaded into memory by
+# the cleaning tasks, which also own the workbooks if they are kept on disk.
+if not (EU_KLEMS_IN_MEMORY or EU_KLEMS_PIPELINE):
 
-    @task(id=country)
     def task_eu_klems_download(
-        page=eu_klems_download_page,
-        country=country,
         depends_on=eu_klems_download_deps,
         path_to_downloaded_data: Annotated[
-            dict[str, Path],
+            dict[str, dict[str, Path]],
             Product,
         ] = eu_klems_download_products,
     ) -> None:
-        """Download the EU KLEMS data for selected countries.
+        """Download the EU KLEMS data for all countries.
 
-        Gather links with country specific data account and download the file.
+        The download links are only looked up when the task runs, so collecting the
+        tasks does not need network access. Download all files at once over a shared
+        connection pool. Files which are already downloaded are only fetched again if
+        they have changed on the website. Unchanged files are not touched, so the
+        cleaning tasks depending on them are not rerun.
 
         """
-        urls, file_names = get_urls_file_names_by_country(page, country)
-
-        for url, file_name in zip(urls, file_names):
-            file_name_no_extension = os.path.splitext(file_name)[0]
-            urllib.request.urlretrieve(
-                url,
-                path_to_downloaded_data[file_name_no_extension],
-            )
+        link_index = get_eu_klems_link_index()
+        downloads = get_downloads_for_countries(link_index, path_to_downloaded_data)
+
+        statistics = download_files(
+            downloads,
+            path_to_manifest=EU_KLEMS_MANIFEST_PATH,
+            revalidate=True,
+        )
+        logger.info(format_download_statistics(statistics))
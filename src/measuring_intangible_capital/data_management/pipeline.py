@@ -0,0 +1,240 @@
+"""Functions to overlap downloading and cleaning of the EU KLEMS data."""
+
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+
+from measuring_intangible_capital.config import (
+    EU_KLEMS_DOWNLOAD_MAX_WORKERS,
+    EU_KLEMS_PIPELINE_MAX_CLEAN_WORKERS,
+    EU_KLEMS_PIPELINE_QUEUE_SIZE,
+    EXCEL_ENGINE_TYPE,
+)
+from measuring_intangible_capital.data_management.accounts_dataset import (
+    write_accounts,
+)
+from measuring_intangible_capital.data_management.clean_eu_klems_data import (
+    clean_eu_klems_accounts,
+    compact_eu_klems_accounts,
+    get_shared_categories,
+)
+from measuring_intangible_capital.error_handling_utilities import (
+    raise_data_info_invalid,
+    raise_variable_wrong_type,
+)
+
+
+def run_download_and_clean_pipeline(
+    country_codes: list[str],
+    download_country: Callable[[str], dict[str, Path | BytesIO]],
+    data_info: dict,
+    years: range,
+    paths_to_clean_data: dict[str, dict[str, Path]],
+    max_download_workers: int = EU_KLEMS_DOWNLOAD_MAX_WORKERS,
+    max_clean_workers: int = EU_KLEMS_PIPELINE_MAX_CLEAN_WORKERS,
+    queue_size: int = EU_KLEMS_PIPELINE_QUEUE_SIZE,
+    path_to_cache: Path | None = None,
+    industries: list[str] | None = None,
+    paths_to_full_data: dict[str, dict[str, Path]] | None = None,
+    streaming: bool = False,
+    compact: bool = False,
+    float32: bool = False,
+) -> dict:
+    """Download and clean the accounts of all countries in a pipeline.
+
+    Downloading is I/O-bound and runs in a pool of threads, cleaning is CPU-bound and
+    runs in a pool of processes. A country is cleaned as soon as its workbooks have
+    arrived, so the total time approaches the longer of the two stages instead of
+    their sum. The bounded queue between the stages stops the downloads from running
+    too far ahead of the cleaning and holding too many workbooks in memory.
+
+    Args:
+        country_codes (list[str]): the countries to download and clean.
+        download_country (Callable): function downloading the workbooks of a country.
+            It takes the country code and returns the workbooks, as files or
+            in-memory buffers, by file name (intangible_analytical, etc). It is
+            called from several threads at once, so anything shared by all
+            countries, e.g. the download links, is resolved before and bound to it.
+        data_info (dict): Information on data set stored in eu_klems_data_info.yaml.
+        years (range): years to keep.
+        paths_to_clean_data (dict[str, dict[str, Path]]): for each country, the paths
+            to save the clean capital, national and growth accounts to.
+        max_download_workers (int): number of countries downloaded at the same time.
+        max_clean_workers (int): number of processes cleaning countries.
+        queue_size (int): number of downloaded countries which can wait for cleaning.
+        path_to_cache (Path, optional): folder of the Parquet cache of the sheets.
+        industries (list[str], optional): industry codes to keep. If None, all
+            industries are kept.
+        paths_to_full_data (dict[str, dict[str, Path]], optional): for each country,
+            the paths to save the accounts of all industries to.
+        streaming (bool): whether to stream the sheets straight into the clean layout.
+        compact (bool): whether to save the accounts with compact, shared dtypes, see
+            ``compact_eu_klems_accounts``.
+        float32 (bool): whether to save compact accounts with float32 values.
+
+    Returns:
+        dict: pipeline statistics. Keys are countries and seconds.
+
+    """
+    raise_variable_wrong_type(country_codes, list, "country_codes")
+    raise_data_info_invalid(data_info)
+    _raise_paths_missing(country_codes, paths_to_clean_data)
+
+    downloaded = queue.Queue(maxsize=queue_size)
+    stopped = threading.Event()
+
+    def produce(country_code: str) -> None:
+        try:
+            item = (country_code, download_country(country_code), None)
+        except Exception as error:  # noqa: BLE001
+            item = (country_code, None, error)
+
+        # Give up waiting for a free slot if the pipeline has stopped on an error.
+        while not stopped.is_set():
+            try:
+                downloaded.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_download_workers) as download_executor:
+        for country_code in country_codes:
+            download_executor.submit(produce, country_code)
+
+        try:
+            with ProcessPoolExecutor(max_workers=max_clean_workers) as clean_executor:
+                cleaned = []
+
+                for _ in country_codes:
+                    country_code, raw_files, error = downloaded.get()
+                    if error is not None:
+                        msg = f"Downloading the data of {country_code} failed."
+                        raise RuntimeError(msg) from error
+
+                    cleaned.append(
+                        clean_executor.submit(
+                            clean_and_save_eu_klems_accounts,
+                            data_info,
+                            raw_files,
+                            years,
+                            paths_to_clean_data[country_code],
+                            path_to_cache,
+                            industries,
+                            None
+                            if paths_to_full_data is None
+                            else paths_to_full_data[country_code],
+                            streaming,
+                            "auto",
+                            compact,
+                            float32,
+                        ),
+                    )
+
+                for future in cleaned:
+                    future.result()
+        finally:
+            stopped.set()
+            download_executor.shutdown(cancel_futures=True)
+
+    return {"countries": len(country_codes), "seconds": time.perf_counter() - start}
+
+
+def clean_and_save_eu_klems_accounts(
+    data_info: dict,
+    raw_files: dict[str, Path | BytesIO],
+    years: range,
+    paths_to_clean_data: dict[str, Path],
+    path_to_cache: Path | None = None,
+    industries: list[str] | None = None,
+    paths_to_full_data: dict[str, Path] | None = None,
+    streaming: bool = False,
+    engine: EXCEL_ENGINE_TYPE = "auto",
+    compact: bool = False,
+    float32: bool = False,
+) -> None:
+    """Clean the accounts of a country and save them to the clean accounts dataset.
+
+    Args:
+        data_info (dict): Information on data set stored in eu_klems_data_info.yaml.
+        raw_files (dict[str, Path | BytesIO]): the workbooks of the country.
+        years (range): years to keep.
+        paths_to_clean_data (dict[str, Path]): the paths to save the clean capital,
+            national and growth accounts to.
+        path_to_cache (Path, optional): folder of the Parquet cache of the sheets.
+        industries (list[str], optional): industry codes to keep. If None, all
+            industries are kept.
+        paths_to_full_data (dict[str, Path], optional): the paths to save the accounts
+            of all industries to. The workbooks are then read in full once and the
+            industries are selected from the full accounts.
+        streaming (bool): whether to stream the sheets straight into the clean layout.
+        engine (str): the engine to read the sheets with, see ``get_excel_engine``.
+        compact (bool): whether to save the accounts with compact, shared dtypes, see
+            ``compact_eu_klems_accounts``.
+        float32 (bool): whether to save compact accounts with float32 values.
+
+    """
+    accounts = clean_eu_klems_accounts(
+        data_info=data_info,
+        raw_files=raw_files,
+        years=years,
+        path_to_cache=path_to_cache,
+        industries=None if paths_to_full_data else industries,
+        streaming=streaming,
+        engine=engine,
+    )
+
+    if paths_to_full_data:
+        _save_accounts(
+            _compact_accounts(accounts, data_info, None, float32)
+            if compact
+            else accounts,
+            paths_to_full_data,
+        )
+        accounts = {
+            key: _select_industries(df, industries) for key, df in accounts.items()
+        }
+
+    if compact:
+        accounts = _compact_accounts(accounts, data_info, industries, float32)
+    _save_accounts(accounts, paths_to_clean_data)
+
+
+def _compact_accounts(
+    accounts: dict[str, pd.DataFrame],
+    data_info: dict,
+    industries: list[str] | None,
+    float32: bool,
+) -> dict[str, pd.DataFrame]:
+    categories = get_shared_categories(data_info, industries)
+    return {
+        key: compact_eu_klems_accounts(df, categories, float32)
+        for key, df in accounts.items()
+    }
+
+
+def _save_accounts(accounts: dict[str, pd.DataFrame], paths: dict[str, Path]) -> None:
+    for key, df in accounts.items():
+        write_accounts(df, paths[key])
+
+
+def _select_industries(
+    df: pd.DataFrame,
+    industries: list[str] | None,
+) -> pd.DataFrame:
+    if industries is None or df.empty:
+        return df
+    return df[df.index.get_level_values("industry_code").isin(industries)]
+
+
+def _raise_paths_missing(country_codes, paths_to_clean_data):
+    for country_code in country_codes:
+        if country_code not in paths_to_clean_data:
+            msg = f"There are no paths to save the clean data of {country_code} to."
+            raise KeyError(msg)
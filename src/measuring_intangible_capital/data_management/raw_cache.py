@@ -0,0 +1,150 @@
+"""Columnar cache of the sheets of the raw EU KLEMS workbooks."""
+
+import hashlib
+import os
+from collections.abc import Callable
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from measuring_intangible_capital.config import (
+    EU_KLEMS_DOWNLOAD_CHUNK_SIZE,
+    EXCEL_ENGINE_TYPE,
+)
+from measuring_intangible_capital.data_management.utilities import (
+    get_excel_engine,
+    read_excel_sheets,
+    select_rows_and_columns,
+)
+from measuring_intangible_capital.error_handling_utilities import (
+    raise_variable_wrong_type,
+)
+
+
+def read_excel_sheets_cached(
+    path: Path | BytesIO,
+    sheet_names: list[str],
+    path_to_cache: Path,
+    usecols: Callable[[str], bool] | None = None,
+    filters: dict[str, list] | None = None,
+    nrows: int | None = None,
+    engine: EXCEL_ENGINE_TYPE | None = None,
+) -> list[pd.DataFrame]:
+    """Read several sheets of an Excel workbook through a Parquet cache.
+
+    Each sheet is stored as ``<path_to_cache>/<sha256 of the workbook>/<sheet>.parquet``.
+    Sheets found in the cache are read from Parquet, the others are parsed from the
+    workbook with ``engine``, opening it at most once, and added to the cache. As the
+    cache is keyed by the content of the workbook, a new release of the data is parsed again
+    while changes to the cleaning code or to the data info only read Parquet.
+
+    The cache holds the full sheets, so that it serves any selection of columns and
+    rows. The selection is pushed down to Parquet, which only loads the selected
+    columns and skips the row groups without matching rows.
+
+    Args:
+        path (Path | BytesIO): the workbook, as a file or an in-memory buffer.
+        sheet_names (list[str]): the sheets to read.
+        path_to_cache (Path): the folder of the cache.
+        usecols (Callable, optional): function of the column name returning whether
+            to read the column. If None, all columns are read.
+        filters (dict[str, list], optional): the values to keep, by column name. If
+            None, all rows are read.
+        nrows (int, optional): number of rows to read. The first rows are cached
+            separately from the full sheet. If None, all rows are read.
+        engine (str, optional): the engine to parse the sheets missing from the cache
+            with, openpyxl or calamine. If None, auto or cache, the fastest installed
+            engine, see ``get_excel_engine``.
+
+    Returns:
+        list[pd.DataFrame]: the sheets, in the order of ``sheet_names``.
+
+    """
+    raise_variable_wrong_type(path_to_cache, Path, "path_to_cache")
+
+    path_to_workbook_cache = path_to_cache / get_content_hash(path)
+    suffix = ".parquet" if nrows is None else f".{nrows}_rows.parquet"
+    paths_to_sheets = {
+        sheet: path_to_workbook_cache / f"{sheet}{suffix}" for sheet in sheet_names
+    }
+
+    missing_sheets = [
+        sheet for sheet in sheet_names if not paths_to_sheets[sheet].exists()
+    ]
+    parsed = {}
+    if missing_sheets:
+        parsed_sheets = read_excel_sheets(
+            path,
+            missing_sheets,
+            engine=_get_parse_engine(engine),
+            nrows=nrows,
+        )
+        parsed = dict(zip(missing_sheets, parsed_sheets))
+        path_to_workbook_cache.mkdir(parents=True, exist_ok=True)
+        for sheet, df in parsed.items():
+            _write_sheet(df, paths_to_sheets[sheet])
+
+    return [
+        select_rows_and_columns(parsed[sheet], usecols, filters)
+        if sheet in parsed
+        else _read_sheet(paths_to_sheets[sheet], usecols, filters)
+        for sheet in sheet_names
+    ]
+
+
+def get_content_hash(path: Path | BytesIO) -> str:
+    """Compute the SHA-256 of a file or an in-memory buffer.
+
+    Args:
+        path (Path | BytesIO): the file or the buffer.
+
+    Returns:
+        str: the hex digest.
+
+    """
+    if isinstance(path, BytesIO):
+        return hashlib.sha256(path.getbuffer()).hexdigest()
+
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(EU_KLEMS_DOWNLOAD_CHUNK_SIZE):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _get_parse_engine(engine: EXCEL_ENGINE_TYPE | None) -> str:
+    if engine in (None, "auto", "cache"):
+        return get_excel_engine()
+    return get_excel_engine(engine)
+
+
+def _read_sheet(
+    path: Path,
+    usecols: Callable[[str], bool] | None,
+    filters: dict[str, list] | None,
+) -> pd.DataFrame:
+    columns = None
+    if usecols is not None:
+        columns = [column for column in pq.read_schema(path).names if usecols(column)]
+    if filters is not None:
+        filters = [(column, "in", values) for column, values in filters.items()]
+    return pd.read_parquet(path, columns=columns, filters=filters)
+
+
+def _write_sheet(df: pd.DataFrame, path: Path) -> None:
+    """Write a sheet to Parquet atomically, so that a reader never sees half a file.
+
+    Sheets which Arrow cannot store, e.g. columns mixing numbers and text, are left out
+    of the cache and parsed from the workbook every time.
+
+    """
+    path_to_tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        df.to_parquet(path_to_tmp)
+    except (pa.ArrowException, ValueError):
+        path_to_tmp.unlink(missing_ok=True)
+        return
+    os.replace(path_to_tmp, path)
@@ -0,0 +1,173 @@
+"""Function(s) for reading the EU KLEMS sheets straight into the clean layout."""
+
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from measuring_intangible_capital.error_handling_utilities import (
+    raise_data_info_invalid,
+    raise_variable_wrong_type,
+)
+
+
+def stream_and_reshape_eu_klems(
+    path: Path | BytesIO,
+    sheet_names: list[str],
+    data_info: dict,
+    years: range,
+    industries: list[str] | None = None,
+) -> pd.DataFrame:
+    """Read EU KLEMS sheets row by row into the clean and reshaped layout.
+
+    Produces the same data frame as ``clean_and_reshape_eu_klems`` on the sheets read
+    by ``read_data``, without building a data frame per sheet or the long table.
+    While streaming through the sheets, the industry, country and variable ids are
+    mapped to integer codes and the values of the years are stored as float64 arrays.
+    Peak memory is bounded by the size of the output, not of the workbook.
+
+    Args:
+        path (Path | BytesIO): the workbook, as a file or an in-memory buffer.
+        sheet_names (list[str]): the sheets to read.
+        data_info (dict): Information on data set stored in eu_klems_data_info.yaml.
+        years (range): years to keep.
+        industries (list[str], optional): industry codes to keep. If None, all
+            industries are kept.
+
+    Returns:
+        pd.DataFrame: the data with index (industry_code, year, country_code) and a
+        column per variable.
+
+    """
+    raise_variable_wrong_type(path, (Path, BytesIO), "path")
+    raise_data_info_invalid(data_info)
+
+    id_columns = {
+        new_name: column
+        for column, new_name in data_info["column_rename_mapping"].items()
+    }
+    industries = None if industries is None else set(industries)
+    codes = {"industry_code": {}, "country_code": {}, "variable_name": {}}
+    keys = []
+    values = []
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in sheet_names:
+            rows = workbook[sheet].iter_rows(values_only=True)
+            header = [str(column) for column in next(rows, ())]
+            id_positions = [
+                _get_position(header, id_columns[name], sheet) for name in codes
+            ]
+            year_positions = [_get_position(header, str(year), sheet) for year in years]
+
+            for row in rows:
+                ids = [row[position] for position in id_positions]
+                if ids[0] is None or (
+                    industries is not None and ids[0] not in industries
+                ):
+                    continue
+
+                keys.append(
+                    [
+                        codes_of_id.setdefault(id_, len(codes_of_id))
+                        for codes_of_id, id_ in zip(codes.values(), ids)
+                    ],
+                )
+                values.append([row[position] for position in year_positions])
+    finally:
+        workbook.close()
+
+    return build_eu_klems_cube(
+        keys=np.array(keys, dtype=np.intp).reshape(-1, len(codes)),
+        values=np.array(values, dtype=np.float64).reshape(-1, len(years)),
+        codes=codes,
+        years=years,
+        variable_name_mapping=data_info["variable_name_mapping"],
+    )
+
+
+def build_eu_klems_cube(
+    keys: np.ndarray,
+    values: np.ndarray,
+    codes: dict[str, dict[str, int]],
+    years: range,
+    variable_name_mapping: dict[str, str],
+) -> pd.DataFrame:
+    """Place the rows of the EU KLEMS sheets in a (industry, year, country, variable)
+    array and return it in the clean layout.
+
+    Codes are renumbered so that ids are in sorted order, which is the order of the
+    categories and of the rows after ``pivot_table``. Values of repeated ids are
+    averaged, like ``pivot_table`` does, and rows and columns without any value are
+    dropped.
+
+    Args:
+        keys (np.ndarray): the industry, country and variable code of each row, with
+            shape (rows, 3).
+        values (np.ndarray): the value of each year in each row, with shape
+            (rows, years).
+        codes (dict[str, dict[str, int]]): the code of each id, for industry_code,
+            country_code and variable_name, in this order.
+        years (range): the years of the columns of ``values``.
+        variable_name_mapping (dict[str, str]): new names of the variables.
+
+    Returns:
+        pd.DataFrame: the data with index (industry_code, year, country_code) and a
+        column per variable.
+
+    """
+    names = {}
+    for dimension, (key, codes_of_id) in enumerate(codes.items()):
+        names[key] = sorted(codes_of_id)
+        ranks = {id_: rank for rank, id_ in enumerate(names[key])}
+        renumbered = np.array([ranks[id_] for id_ in codes_of_id], dtype=np.intp)
+        keys[:, dimension] = renumbered[keys[:, dimension]]
+
+    shape = (
+        len(names["industry_code"]),
+        len(names["country_code"]),
+        len(names["variable_name"]),
+    )
+    flat_keys = np.ravel_multi_index(tuple(keys.T), shape)
+    means = np.full((np.prod(shape), len(years)), np.nan)
+
+    if len(np.unique(flat_keys)) == len(flat_keys):
+        # Each id appears once, as in the EU KLEMS workbooks: nothing to average.
+        means[flat_keys] = values
+    else:
+        sums = np.zeros_like(means)
+        counts = np.zeros_like(means)
+        np.add.at(sums, flat_keys, np.nan_to_num(values))
+        np.add.at(counts, flat_keys, ~np.isnan(values))
+        np.divide(sums, counts, out=means, where=counts > 0)
+
+    # (industry, country, variable, year) -> (industry, year, country, variable)
+    cube = means.reshape(*shape, len(years)).transpose(0, 3, 1, 2)
+
+    variable_names = [
+        variable_name_mapping.get(name, name) for name in names["variable_name"]
+    ]
+    df = pd.DataFrame(
+        cube.reshape(shape[0] * len(years) * shape[1], shape[2]),
+        index=pd.MultiIndex.from_product(
+            [
+                pd.CategoricalIndex(names["industry_code"]),
+                pd.array(list(years), dtype=pd.Int16Dtype()),
+                pd.CategoricalIndex(names["country_code"]),
+            ],
+            names=["industry_code", "year", "country_code"],
+        ),
+        columns=pd.CategoricalIndex(variable_names, categories=variable_names),
+    )
+
+    return df.dropna(how="all").dropna(how="all", axis=1)
+
+
+def _get_position(header: list[str], column: str, sheet: str) -> int:
+    if column not in header:
+        msg = f"The column {column} is not in the sheet {sheet}."
+        raise KeyError(msg)
+    return header.index(column)
@@ -1,93 +1,214 @@
 """Tasks for cleaning EU KLEMS data."""
 
+import logging
+from functools import partial
 from pathlib import Path
 from typing import Annotated
 
-import pandas as pd
 from pytask import Product, task
 
 from measuring_intangible_capital.config import (
     ALL_COUNTRY_CODES,
-    DATA_CLEAN_PATH,
+    DATA_CLEAN_FULL_PATH,
+    EU_KLEMS_COMPACT,
+    EU_KLEMS_COMPACT_FLOAT32,
+    EU_KLEMS_FULL_STORE,
+    EU_KLEMS_IN_MEMORY,
+    EU_KLEMS_IN_MEMORY_KEEP_RAW,
+    EU_KLEMS_INDUSTRIES,
+    EU_KLEMS_PIPELINE,
+    EU_KLEMS_RAW_CACHE_PATH,
+    EXCEL_ENGINE,
     SRC,
 )
-from measuring_intangible_capital.data_management.clean_eu_klems_data import (
-    clean_and_reshape_eu_klems,
-    read_data,
-    read_growth_accounts,
+from measuring_intangible_capital.data_management.download.download_engine import (
+    HostLimits,
+    create_download_session,
+    create_rate_limiter,
+)
+from measuring_intangible_capital.data_management.download.eu_klems_download import (
+    download_eu_klems_country_to_memory,
+    get_eu_klems_link_index,
+)
+from measuring_intangible_capital.data_management.pipeline import (
+    clean_and_save_eu_klems_accounts,
+    run_download_and_clean_pipeline,
 )
 from measuring_intangible_capital.utilities import (
+    get_account_data_paths,
     get_eu_klems_download_paths,
+    get_eu_klems_file_names_to_download,
     read_yaml,
 )
 
+logger = logging.getLogger(__name__)
+
 clean_data_deps = {
-    "scripts": Path("clean_eu_klems_data.py"),
+    "scripts": [
+        Path("accounts_dataset.py"),
+        Path("clean_eu_klems_data.py"),
+        Path("pipeline.py"),
+        Path("raw_cache.py"),
+        Path("stream_eu_klems_data.py"),
+    ],
     "data_info": SRC / "data_management" / "eu_klems_data_info.yaml",
 }
+eu_klems_file_names = get_eu_klems_file_names_to_download(
+    read_yaml(clean_data_deps["data_info"]),
+)
+years_for_analysis = range(1995, 2020)
+
+
+def _get_paths_to_full_data(country: str) -> dict[str, Path]:
+    if not EU_KLEMS_FULL_STORE:
+        return {}
+    return get_account_data_paths(country, DATA_CLEAN_FULL_PATH)
+
+
+def _get_paths_to_raw_data(country: str) -> dict[str, Path]:
+    """Get the workbooks of a country which the in-memory download also keeps on disk,
+    see EU_KLEMS_IN_MEMORY_KEEP_RAW. They are products of the cleaning tasks then, as
+    there is no download task."""
+    if not (EU_KLEMS_IN_MEMORY or EU_KLEMS_PIPELINE) or not EU_KLEMS_IN_MEMORY_KEEP_RAW:
+        return {}
+    return get_eu_klems_download_paths(country, eu_klems_file_names)
+
+
+def _get_clean_data_deps(country: str) -> dict:
+    """Get the dependencies of cleaning a country: the code, the YAML and, unless the
+    workbooks are downloaded into memory, the workbooks of the country only."""
+    if EU_KLEMS_IN_MEMORY:
+        return clean_data_deps
+    return {
+        **clean_data_deps,
+        "data": get_eu_klems_download_paths(country, eu_klems_file_names),
+    }
+
+
+def _download_country_to_memory(
+    country: str,
+    link_index: dict[str, dict[str, str]],
+    paths_to_raw_data: dict[str, dict[str, Path]],
+    **download_options,
+) -> dict:
+    return download_eu_klems_country_to_memory(
+        country_code=country,
+        file_names=list(get_eu_klems_download_paths(country, eu_klems_file_names)),
+        link_index=link_index,
+        paths_to_raw_data=paths_to_raw_data[country] or None,
+        **download_options,
+    )
 
-for country in ALL_COUNTRY_CODES:
-    clean_data_deps[f"data_{country}"] = get_eu_klems_download_paths(country)
 
-    @task(id=country)
-    def task_clean_and_reshape_eu_klems(
-        country: str = country,
+if EU_KLEMS_PIPELINE:
+
+    def task_download_and_clean_eu_klems(
         depends_on=clean_data_deps,
-        path_to_capital_accounts: Annotated[Path, Product] = DATA_CLEAN_PATH
-        / country
-        / "capital_accounts.pkl",
-        path_to_national_accounts: Annotated[Path, Product] = DATA_CLEAN_PATH
-        / country
-        / "national_accounts.pkl",
-        path_to_growth_accounts: Annotated[Path, Product] = DATA_CLEAN_PATH
-        / country
-        / "growth_accounts.pkl",
+        paths_to_clean_data: Annotated[dict[str, dict[str, Path]], Product] = {
+            country: get_account_data_paths(country) for country in ALL_COUNTRY_CODES
+        },
+        paths_to_full_data: Annotated[dict[str, dict[str, Path]], Product] = {
+            country: _get_paths_to_full_data(country) for country in ALL_COUNTRY_CODES
+        },
+        paths_to_raw_data: Annotated[dict[str, dict[str, Path]], Product] = {
+            country: _get_paths_to_raw_data(country) for country in ALL_COUNTRY_CODES
+        },
     ):
-        """Clean the data (Python version)."""
-        data_info = read_yaml(depends_on["data_info"])
-        path_to_raw_capital_accounts = Path(
-            depends_on[f"data_{country}"]["intangible_analytical"],
-        )
-        path_to_raw_national_accounts = Path(
-            depends_on[f"data_{country}"]["national_accounts"],
-        )
+        """Download and clean the data of all countries in a pipeline.
 
-        years_for_analysis = range(1995, 2020)
+        Each country is cleaned as soon as its workbooks have been downloaded, by
+        streaming the sheets straight into the clean layout.
+        Only the industries used in the analysis are kept, unless
+        EU_KLEMS_FULL_STORE is set, which also stores the accounts of all industries.
+        With EU_KLEMS_COMPACT, the accounts are stored with compact, shared dtypes.
+        With EU_KLEMS_IN_MEMORY_KEEP_RAW, the workbooks are kept on disk as well.
 
-        capital_accounts_raw, national_accounts_raw = read_data(
-            data_info=data_info,
-            path_to_capital_accounts=path_to_raw_capital_accounts,
-            path_to_national_accounts=path_to_raw_national_accounts,
+        """
+        # Resolve the links once, before the download threads of all countries start,
+        # and share one session and one set of rate limits between all countries.
+        link_index = get_eu_klems_link_index()
+        with create_download_session() as session:
+            statistics = run_download_and_clean_pipeline(
+                country_codes=ALL_COUNTRY_CODES,
+                download_country=partial(
+                    _download_country_to_memory,
+                    link_index=link_index,
+                    paths_to_raw_data=paths_to_raw_data,
+                    session=session,
+                    rate_limiter=create_rate_limiter(),
+                    host_limits=HostLimits(),
+                ),
+                data_info=read_yaml(depends_on["data_info"]),
+                years=years_for_analysis,
+                paths_to_clean_data=paths_to_clean_data,
+                industries=EU_KLEMS_INDUSTRIES,
+                paths_to_full_data=paths_to_full_data if EU_KLEMS_FULL_STORE else None,
+                streaming=True,
+                compact=EU_KLEMS_COMPACT,
+                float32=EU_KLEMS_COMPACT_FLOAT32,
+            )
+        logger.info(
+            "Downloaded and cleaned %d countries in %.1fs",
+            statistics["countries"],
+            statistics["seconds"],
         )
 
-        capital_accounts_clean = clean_and_reshape_eu_klems(
-            capital_accounts_raw,
-            data_info,
-            years=years_for_analysis,
-        )
-        national_accounts_clean = clean_and_reshape_eu_klems(
-            national_accounts_raw,
-            data_info,
-            years=years_for_analysis,
-        )
+else:
+    for country in ALL_COUNTRY_CODES:
 
-        capital_accounts_clean.to_pickle(path_to_capital_accounts)
-        national_accounts_clean.to_pickle(path_to_national_accounts)
+        @task(id=country)
+        def task_clean_and_reshape_eu_klems(
+            country: str = country,
+            depends_on=_get_clean_data_deps(country),
+            paths_to_clean_data: Annotated[
+                dict[str, Path],
+                Product,
+            ] = get_account_data_paths(country),
+            paths_to_full_data: Annotated[
+                dict[str, Path],
+                Product,
+            ] = _get_paths_to_full_data(country),
+            paths_to_raw_data: Annotated[
+                dict[str, Path],
+                Product,
+            ] = _get_paths_to_raw_data(country),
+        ):
+            """Clean the data (Python version).
 
-        if country != "SK":
-            path_to_raw_growth_accounts = Path(
-                depends_on[f"data_{country}"]["growth_accounts"],
-            )
-            growth_accounts = read_growth_accounts(
-                data_info=data_info,
-                path_to_growth_accounts=path_to_raw_growth_accounts,
-            )
-            growth_accounts_clean = clean_and_reshape_eu_klems(
-                growth_accounts,
-                data_info,
+            With EU_KLEMS_IN_MEMORY, the workbooks of the country are downloaded into
+            memory and streamed straight into the clean layout in the same step, and
+            with EU_KLEMS_IN_MEMORY_KEEP_RAW also kept on disk.
+            Otherwise, the parsed sheets are cached as Parquet, keyed by the content
+            of the workbooks, so cleaning again after a code change skips parsing the
+            xlsx.
+            Only the industries used in the analysis are kept, unless
+            EU_KLEMS_FULL_STORE is set, which also stores the accounts of all
+            industries in DATA_CLEAN_FULL_PATH.
+            With EU_KLEMS_COMPACT, the accounts are stored with compact, shared dtypes.
+
+            """
+            if EU_KLEMS_IN_MEMORY:
+                raw_files = _download_country_to_memory(
+                    country,
+                    link_index=get_eu_klems_link_index(),
+                    paths_to_raw_data={country: paths_to_raw_data},
+                )
+            else:
+                raw_files = {
+                    file_name: Path(path)
+                    for file_name, path in depends_on["data"].items()
+                }
+
+            clean_and_save_eu_klems_accounts(
+                data_info=read_yaml(depends_on["data_info"]),
+                raw_files=raw_files,
                 years=years_for_analysis,
+                paths_to_clean_data=paths_to_clean_data,
+                path_to_cache=EU_KLEMS_RAW_CACHE_PATH,
+                industries=EU_KLEMS_INDUSTRIES,
+                paths_to_full_data=paths_to_full_data or None,
+                streaming=EU_KLEMS_IN_MEMORY,
+                engine=EXCEL_ENGINE,
+                compact=EU_KLEMS_COMPACT,
+                float32=EU_KLEMS_COMPACT_FLOAT32,
             )
-            growth_accounts_clean.to_pickle(path_to_growth_accounts)
-        else:
-            growth_accounts_clean = pd.DataFrame()
-            growth_accounts_clean.to_pickle(path_to_growth_accounts)
@@ -4,12 +4,17 @@ from typing import Annotated
 
 from pytask import Product
 
-from measuring_intangible_capital.config import DATA_CLEAN_PATH, SRC
+from measuring_intangible_capital.config import (
+    DATA_CLEAN_PATH,
+    EXCEL_ENGINE,
+    GDP_RAW_CACHE_PATH,
+    SRC,
+)
 from measuring_intangible_capital.data_management.clean_gdp_data import (
     clean_gdp_per_capita,
     read_data,
 )
-from measuring_intangible_capital.utilities import read_yaml
+from measuring_intangible_capital.utilities import read_yaml, write_arrow
 
 clean_gdp_per_capita_deps = {
     "scripts": Path("clean_gdp_data.py"),
@@ -21,12 +26,22 @@ clean_gdp_per_capita_deps = {
 def task_clean_gdp_per_capita(
     depends_on: dict = clean_gdp_per_capita_deps,
     path_to_gdp_per_capita: Annotated[Path, Product] = Path(
-        DATA_CLEAN_PATH / "gdp" / "gdp_per_capita.pkl",
+        DATA_CLEAN_PATH / "gdp" / "gdp_per_capita.arrow",
     ),
 ):
-    """Clean the GDP per capita data from the World Bank."""
+    """Clean the GDP per capita data from the World Bank.
+
+    The parsed sheet is kept as Parquet in GDP_RAW_CACHE_PATH, keyed by the content of
+    the workbook, and only parsed with EXCEL_ENGINE if it is missing from the cache.
+
+    """
     data_info = read_yaml(depends_on["data_info"])
-    raw = read_data(depends_on["data"], data_info)
+    raw = read_data(
+        depends_on["data"],
+        data_info,
+        engine=EXCEL_ENGINE,
+        path_to_cache=GDP_RAW_CACHE_PATH,
+    )
     data_clean = clean_gdp_per_capita(raw, data_info)
 
-    data_clean.to_pickle(path_to_gdp_per_capita)
+    write_arrow(data_clean, path_to_gdp_per_capita)
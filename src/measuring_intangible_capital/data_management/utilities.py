@@ -1,5 +1,14 @@
 """Data management utilities."""
+import importlib.util
+from collections.abc import Callable
+from io import BytesIO
+from pathlib import Path
+from typing import get_args
+
 import pandas as pd
+from openpyxl import load_workbook
+
+from measuring_intangible_capital.config import EXCEL_ENGINE_TYPE
 
 
 def clean_data(raw: pd.DataFrame, data_info: dict) -> pd.DataFrame:
@@ -7,7 +16,7 @@ def clean_data(raw: pd.DataFrame, data_info: dict) -> pd.DataFrame:
 
     Information on data columns is stored in ``data_management/eu_klems_data_info.yaml`` and ``data_management/gdp_data_info.yaml``.
     Based on the ``data_info`` object:
-    - Drop columns
+    - Drop columns (if they were read)
     - Set categorical columns
     - Rename columns
     - Set index
@@ -19,9 +28,181 @@ def clean_data(raw: pd.DataFrame, data_info: dict) -> pd.DataFrame:
         pandas.DataFrame: The cleaned data set.
 
     """
-    df = raw.drop(columns=data_info["columns_to_drop"])
+    df = raw.drop(columns=data_info["columns_to_drop"], errors="ignore")
 
     for categorical_column in data_info["categorical_columns"]:
         df[categorical_column] = df[categorical_column].astype(pd.CategoricalDtype())
 
     return df.rename(columns=data_info["column_rename_mapping"])
+
+
+def get_excel_engine(
+    engine: EXCEL_ENGINE_TYPE = "auto",
+    path_to_cache: Path | None = None,
+) -> str:
+    """Resolve the engine to read Excel workbooks with.
+
+    Args:
+        engine (str): openpyxl, calamine, cache or auto. Auto picks the cache if
+            there is one, otherwise calamine if python-calamine is installed, which
+            parses xlsx several times faster, and openpyxl if not.
+        path_to_cache (Path, optional): folder of the Parquet cache of the sheets.
+
+    Returns:
+        str: openpyxl, calamine or cache.
+
+    """
+    _raise_excel_engine_invalid(engine, path_to_cache)
+
+    if engine != "auto":
+        return engine
+    if path_to_cache is not None:
+        return "cache"
+    return "calamine" if is_calamine_available() else "openpyxl"
+
+
+def is_calamine_available() -> bool:
+    """Whether the calamine engine of pandas can be used (python-calamine)."""
+    return importlib.util.find_spec("python_calamine") is not None
+
+
+def read_excel_sheets(
+    path: Path | BytesIO,
+    sheet_names: list[str],
+    usecols: Callable[[str], bool] | None = None,
+    filters: dict[str, list] | None = None,
+    engine: str = "openpyxl",
+    nrows: int | None = None,
+) -> list[pd.DataFrame]:
+    """Read several sheets of an Excel workbook, opening the workbook only once.
+
+    Calling ``pd.read_excel`` per sheet unzips the workbook and parses its shared
+    strings table again for every sheet. ``pd.ExcelFile`` does this once and then
+    parses only the requested sheets.
+
+    With ``filters`` and the openpyxl engine, the sheets are streamed row by row
+    instead and only the matching rows are kept, so the full sheet is never built in
+    memory. Otherwise, only the selected columns and the columns to filter on are
+    parsed, and the rows are filtered after parsing.
+
+    Args:
+        path (Path | BytesIO): the workbook, as a file or an in-memory buffer.
+        sheet_names (list[str]): the sheets to read.
+        usecols (Callable, optional): function of the column name returning whether
+            to read the column. If None, all columns are read.
+        filters (dict[str, list], optional): the values to keep, by column name. A row
+            is kept if the value of every column is in its list. The columns do not
+            need to be selected by ``usecols``. If None, all rows are read.
+        engine (str): the pandas engine, openpyxl or calamine.
+        nrows (int, optional): number of rows to read. If None, all rows are read.
+
+    Returns:
+        list[pd.DataFrame]: the sheets, in the order of ``sheet_names``.
+
+    """
+    if filters is not None and engine == "openpyxl" and nrows is None:
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            return [
+                _read_worksheet_filtered(workbook[sheet], usecols, filters)
+                for sheet in sheet_names
+            ]
+        finally:
+            workbook.close()
+
+    with pd.ExcelFile(path, engine=engine) as workbook:
+        return [
+            select_rows_and_columns(
+                workbook.parse(
+                    sheet_name=sheet,
+                    usecols=_get_usecols_with_filters(usecols, filters),
+                    nrows=nrows,
+                ),
+                usecols,
+                filters,
+            )
+            for sheet in sheet_names
+        ]
+
+
+def select_rows_and_columns(
+    df: pd.DataFrame,
+    usecols: Callable[[str], bool] | None = None,
+    filters: dict[str, list] | None = None,
+) -> pd.DataFrame:
+    """Select the rows and columns of a sheet which has been read in full.
+
+    Args:
+        df (pd.DataFrame): the sheet.
+        usecols (Callable, optional): function of the column name returning whether
+            to keep the column. If None, all columns are kept.
+        filters (dict[str, list], optional): the values to keep, by column name. If
+            None, all rows are kept.
+
+    Returns:
+        pd.DataFrame: the selected rows and columns.
+
+    """
+    if filters is not None:
+        for column, values in filters.items():
+            _raise_filter_columns_missing(df.columns, {column: values})
+            df = df[df[column].isin(values)]
+        df = df.reset_index(drop=True)
+    if usecols is not None:
+        df = df[[column for column in df.columns if usecols(column)]]
+    return df
+
+
+def _get_usecols_with_filters(
+    usecols: Callable[[str], bool] | None,
+    filters: dict[str, list] | None,
+) -> Callable[[str], bool] | None:
+    """Also parse the columns to filter on, which are dropped after filtering."""
+    if usecols is None or filters is None:
+        return usecols
+    return lambda column: usecols(column) or column in filters
+
+
+def _read_worksheet_filtered(
+    worksheet,
+    usecols: Callable[[str], bool] | None,
+    filters: dict[str, list],
+) -> pd.DataFrame:
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, ())
+
+    _raise_filter_columns_missing(header, filters)
+    column_indices = [
+        index
+        for index, column in enumerate(header)
+        if usecols is None or usecols(column)
+    ]
+    values_by_index = {
+        header.index(column): set(values) for column, values in filters.items()
+    }
+
+    data = [
+        [row[index] for index in column_indices]
+        for row in rows
+        if all(row[index] in values for index, values in values_by_index.items())
+    ]
+    return pd.DataFrame(data, columns=[header[index] for index in column_indices])
+
+
+def _raise_filter_columns_missing(header, filters):
+    for column in filters:
+        if column not in header:
+            msg = f"The column {column} to filter on is not in the sheet."
+            raise KeyError(msg)
+
+
+def _raise_excel_engine_invalid(engine, path_to_cache):
+    if engine not in get_args(EXCEL_ENGINE_TYPE):
+        msg = f"The engine must be one of {get_args(EXCEL_ENGINE_TYPE)}, got {engine}."
+        raise ValueError(msg)
+    if engine == "calamine" and not is_calamine_available():
+        msg = "The calamine engine needs python-calamine to be installed."
+        raise ValueError(msg)
+    if engine == "cache" and path_to_cache is None:
+        msg = "The cache engine needs a path_to_cache."
+        raise ValueError(msg)
@@ -0,0 +1,243 @@
+"""A dense, labelled array for the clean EU KLEMS accounts."""
+
+from collections.abc import Hashable, Iterable
+
+import numpy as np
+import pandas as pd
+
+from measuring_intangible_capital.error_handling_utilities import (
+    raise_variable_wrong_type,
+)
+
+KLEMS_CUBE_AXES = ("country_code", "industry_code", "year", "variable_name")
+
+
+class KlemsCube:
+    """The clean accounts as a float array of shape country x industry x year x
+    variable.
+
+    Each axis has a tuple of labels and a dictionary from label to position, so
+    selecting a country, an industry, a year or a variable is a dictionary lookup and
+    a slice of the array instead of a search through a MultiIndex. Computations across
+    countries, industries, years or variables are reductions along an axis of the
+    array. Values which are not in the accounts are NaN.
+
+    Args:
+        values (np.ndarray): the values, with shape (countries, industries, years,
+            variables).
+        country_codes (Iterable[str]): the labels of the country axis.
+        industry_codes (Iterable[str]): the labels of the industry axis.
+        years (Iterable[int]): the labels of the year axis.
+        variable_names (Iterable[str]): the labels of the variable axis.
+
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        country_codes: Iterable[str],
+        industry_codes: Iterable[str],
+        years: Iterable[int],
+        variable_names: Iterable[str],
+    ):
+        raise_variable_wrong_type(values, np.ndarray, "values")
+        self.labels = {
+            axis: tuple(labels)
+            for axis, labels in zip(
+                KLEMS_CUBE_AXES,
+                [country_codes, industry_codes, years, variable_names],
+            )
+        }
+        _raise_shape_invalid(values, self.labels)
+
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self._positions = {
+            axis: {label: position for position, label in enumerate(labels)}
+            for axis, labels in self.labels.items()
+        }
+
+    @classmethod
+    def from_accounts(cls, accounts: pd.DataFrame | list[pd.DataFrame]) -> "KlemsCube":
+        """Build the cube from clean accounts.
+
+        Args:
+            accounts (pd.DataFrame | list[pd.DataFrame]): clean accounts with index
+                (industry_code, year, country_code) and a column per variable, as
+                written by the cleaning tasks. A list, e.g. of the accounts of each
+                country, is put in one cube.
+
+        Returns:
+            KlemsCube: the cube. Countries, industries and years are sorted, variables
+            are in the order of the columns.
+
+        """
+        if isinstance(accounts, pd.DataFrame):
+            accounts = [accounts]
+        for df in accounts:
+            raise_variable_wrong_type(df, pd.DataFrame, "accounts")
+        accounts = [df for df in accounts if not df.empty]
+        for df in accounts:
+            _raise_index_invalid(df)
+
+        labels = {
+            axis: sorted(
+                {label for df in accounts for label in df.index.unique(level=axis)},
+            )
+            for axis in ["country_code", "industry_code"]
+        }
+        labels["year"] = sorted(
+            {int(year) for df in accounts for year in df.index.unique(level="year")},
+        )
+        labels["variable_name"] = list(
+            dict.fromkeys(str(column) for df in accounts for column in df.columns),
+        )
+        cube = cls(
+            np.full([len(axis_labels) for axis_labels in labels.values()], np.nan),
+            *labels.values(),
+        )
+
+        for df in accounts:
+            positions = [
+                cube.positions(axis, df.index.get_level_values(axis))
+                for axis in KLEMS_CUBE_AXES[:-1]
+            ]
+            variables = cube.positions("variable_name", df.columns.astype(str))
+            cube.values[
+                positions[0][:, None],
+                positions[1][:, None],
+                positions[2][:, None],
+                variables,
+            ] = df.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        return cube
+
+    def axis(self, axis: str) -> int:
+        """The number of an axis of ``values``, e.g. to reduce along it.
+
+        Args:
+            axis (str): one of country_code, industry_code, year and variable_name.
+
+        Returns:
+            int: the number of the axis.
+
+        """
+        _raise_axis_invalid(axis)
+        return KLEMS_CUBE_AXES.index(axis)
+
+    def position(self, axis: str, label: Hashable) -> int:
+        """The position of a label on an axis.
+
+        Args:
+            axis (str): one of country_code, industry_code, year and variable_name.
+            label (Hashable): the label.
+
+        Returns:
+            int: the position of the label.
+
+        """
+        _raise_axis_invalid(axis)
+        try:
+            return self._positions[axis][label]
+        except KeyError:
+            msg = f"{label} is not a label of the {axis} axis."
+            raise KeyError(msg) from None
+
+    def positions(self, axis: str, labels: Iterable[Hashable]) -> np.ndarray:
+        """The positions of labels on an axis.
+
+        Args:
+            axis (str): one of country_code, industry_code, year and variable_name.
+            labels (Iterable[Hashable]): the labels.
+
+        Returns:
+            np.ndarray: the positions of the labels, in the order of ``labels``.
+
+        """
+        return np.array([self.position(axis, label) for label in labels], dtype=np.intp)
+
+    def sel(self, **labels: Hashable | Iterable[Hashable]) -> "KlemsCube":
+        """Select labels on some axes.
+
+        Args:
+            **labels: the label or labels to select by axis, e.g.
+                ``cube.sel(industry_code="TOT", year=range(1995, 2007))``. A single
+                label keeps the axis with a length of one.
+
+        Returns:
+            KlemsCube: the cube with the selected labels, in the given order.
+
+        """
+        indexer = []
+        selected = {}
+        for axis in KLEMS_CUBE_AXES:
+            if axis not in labels:
+                indexer.append(np.arange(len(self.labels[axis])))
+                selected[axis] = self.labels[axis]
+                continue
+
+            axis_labels = labels.pop(axis)
+            if isinstance(axis_labels, str) or not isinstance(axis_labels, Iterable):
+                axis_labels = [axis_labels]
+            selected[axis] = list(axis_labels)
+            indexer.append(self.positions(axis, selected[axis]))
+
+        for axis in labels:
+            _raise_axis_invalid(axis)
+
+        return KlemsCube(self.values[np.ix_(*indexer)], *selected.values())
+
+    def to_frame(self) -> pd.DataFrame:
+        """Convert the cube to the layout of the clean accounts.
+
+        Returns:
+            pd.DataFrame: the values with index (industry_code, year, country_code)
+            and a column per variable. Rows without any value are dropped.
+
+        """
+        variable_names = list(self.labels["variable_name"])
+        df = pd.DataFrame(
+            self.values.transpose(1, 2, 0, 3).reshape(-1, len(variable_names)),
+            index=pd.MultiIndex.from_product(
+                [
+                    pd.CategoricalIndex(self.labels["industry_code"]),
+                    pd.array(self.labels["year"], dtype=pd.Int16Dtype()),
+                    pd.CategoricalIndex(self.labels["country_code"]),
+                ],
+                names=["industry_code", "year", "country_code"],
+            ),
+            columns=pd.CategoricalIndex(variable_names, categories=variable_names),
+        )
+        return df.dropna(how="all")
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """The shape of ``values``."""
+        return self.values.shape
+
+    def __repr__(self) -> str:
+        sizes = ", ".join(
+            f"{axis}: {len(labels)}" for axis, labels in self.labels.items()
+        )
+        return f"KlemsCube({sizes})"
+
+
+def _raise_shape_invalid(values: np.ndarray, labels: dict[str, tuple]) -> None:
+    shape = tuple(len(axis_labels) for axis_labels in labels.values())
+    if values.shape != shape:
+        msg = f"The values have shape {values.shape}, but the labels {shape}."
+        raise ValueError(msg)
+
+
+def _raise_axis_invalid(axis: str) -> None:
+    if axis not in KLEMS_CUBE_AXES:
+        msg = f"The axis {axis} is not one of {KLEMS_CUBE_AXES}."
+        raise ValueError(msg)
+
+
+def _raise_index_invalid(df: pd.DataFrame) -> None:
+    if list(df.index.names) != ["industry_code", "year", "country_code"]:
+        msg = (
+            "The accounts must have the index (industry_code, year, country_code), "
+            f"not {tuple(df.index.names)}."
+        )
+        raise ValueError(msg)
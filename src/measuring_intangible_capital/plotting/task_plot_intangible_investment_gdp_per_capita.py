@@ -4,20 +4,20 @@
 from pathlib import Path
 from typing import Annotated
 
-import pandas as pd
 from pytask import Product
 
 from measuring_intangible_capital.config import BLD, BLD_PYTHON, DATA_CLEAN_PATH, SRC
 from measuring_intangible_capital.plotting.plot import (
     plot_intangible_investment_gdp_per_capita,
 )
+from measuring_intangible_capital.utilities import read_arrow
 
 plot_intangible_investment_gdp_per_capita_deps = {
     "scripts": [Path("plot.py"), Path(SRC / "analysis" / "intangible_investment.py")],
     "intangible_investment": BLD_PYTHON
     / "share_intangible"
-    / "gdp_aggregate_2000_2004.pkl",
-    "gdp_per_capita": DATA_CLEAN_PATH / "gdp" / "gdp_per_capita.pkl",
+    / "gdp_aggregate_2000_2004.arrow",
+    "gdp_per_capita": DATA_CLEAN_PATH / "gdp" / "gdp_per_capita.arrow",
 }
 
 
@@ -27,8 +27,8 @@ def task_plot_intangible_investment_gdp_per_capita(
 ):
     """Figure 5a: Plot the share of intangible investment as percent of GDP for all
     years and countries."""
-    gdp_per_capita = pd.read_pickle(depends_on["gdp_per_capita"])
-    intangible_investment = pd.read_pickle(depends_on["intangible_investment"])
+    gdp_per_capita = read_arrow(depends_on["gdp_per_capita"])
+    intangible_investment = read_arrow(depends_on["intangible_investment"])
 
     fig = plot_intangible_investment_gdp_per_capita(
         intangible_investment_share=intangible_investment,
@@ -4,23 +4,23 @@
 from pathlib import Path
 from typing import Annotated
 
-import pandas as pd
 from pytask import Product
 
 from measuring_intangible_capital.config import BLD, BLD_PYTHON, DATA_CLEAN_PATH, SRC
 from measuring_intangible_capital.plotting.plot import (
     plot_investment_ratio_gdp_per_capita,
 )
+from measuring_intangible_capital.utilities import read_arrow
 
 plot_investment_ratio_gdp_per_capita_deps = {
     "scripts": [Path("plot.py"), Path(SRC / "analysis" / "intangible_investment.py")],
     "intangible_investment": BLD_PYTHON
     / "share_intangible"
-    / "gdp_aggregate_2000_2004.pkl",
+    / "gdp_aggregate_2000_2004.arrow",
     "tangible_investment": BLD_PYTHON
     / "share_tangible"
-    / "gdp_aggregate_2000_2004.pkl",
-    "gdp_per_capita": DATA_CLEAN_PATH / "gdp" / "gdp_per_capita.pkl",
+    / "gdp_aggregate_2000_2004.arrow",
+    "gdp_per_capita": DATA_CLEAN_PATH / "gdp" / "gdp_per_capita.arrow",
 }
 
 
@@ -30,9 +30,9 @@ def task_plot_investment_ratio_gdp_per_capita(
 ):
     """Figure 5b: Plot the ratio between intangible and tangible investment and GDP per
     capita for all years and countries."""
-    gdp_per_capita = pd.read_pickle(depends_on["gdp_per_capita"])
-    intangible_investment = pd.read_pickle(depends_on["intangible_investment"])
-    tangible_investment = pd.read_pickle(depends_on["tangible_investment"])
+    gdp_per_capita = read_arrow(depends_on["gdp_per_capita"])
+    intangible_investment = read_arrow(depends_on["intangible_investment"])
+    tangible_investment = read_arrow(depends_on["tangible_investment"])
 
     fig = plot_investment_ratio_gdp_per_capita(
         intangible_investment=intangible_investment,
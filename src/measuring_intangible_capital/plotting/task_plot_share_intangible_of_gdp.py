@@ -2,7 +2,6 @@
 from pathlib import Path
 from typing import Annotated
 
-import pandas as pd
 from pytask import Product
 
 from measuring_intangible_capital.config import (
@@ -14,10 +13,11 @@ from measuring_intangible_capital.plotting.plot import (
     plot_share_intangibles_for_extended_countries,
     plot_share_intangibles_for_main_countries,
 )
+from measuring_intangible_capital.utilities import read_arrow
 
 plot_share_intangible_of_gdp_deps = {
     "scripts": [Path("plot.py"), Path(SRC / "analysis" / "intangible_investment.py")],
-    "data": BLD_PYTHON / "share_intangible" / "gdp_aggregate_1995_2006.pkl",
+    "data": BLD_PYTHON / "share_intangible" / "gdp_aggregate_1995_2006.arrow",
 }
 
 
@@ -37,7 +37,7 @@ def task_plot_share_intangible_of_gdp(
 
     Save the plot as png file in the figures folder.
     """
-    df = pd.read_pickle(depends_on["data"])
+    df = read_arrow(depends_on["data"])
 
     fig_main_countries = plot_share_intangibles_for_main_countries(df)
     fig_extended_countries = plot_share_intangibles_for_extended_countries(df)
@@ -2,17 +2,17 @@
 from pathlib import Path
 from typing import Annotated
 
-import pandas as pd
 from pytask import Product
 
 from measuring_intangible_capital.config import BLD, BLD_PYTHON, SRC
 from measuring_intangible_capital.plotting.plot import (
     plot_share_intangible_of_gdp_by_type,
 )
+from measuring_intangible_capital.utilities import read_arrow
 
 plot_share_intangible_of_gdp_aggregate_2006_deps = {
     "scripts": [Path("plot.py"), Path(SRC / "analysis" / "intangible_investment.py")],
-    "data": BLD_PYTHON / "share_intangible" / "gdp_aggregate_2006.pkl",
+    "data": BLD_PYTHON / "share_intangible" / "gdp_aggregate_2006.arrow",
 }
 
 
@@ -24,6 +24,6 @@ def task_plot_share_intangible_of_gdp_aggregate_2006(
     Each category is: computerized_information, innovative_property, economic_competencies
     Save the plot to the given path.
     """
-    df = pd.read_pickle(depends_on["data"])
+    df = read_arrow(depends_on["data"])
     fig = plot_share_intangible_of_gdp_by_type(df)
     fig.write_image(plot_save_path)
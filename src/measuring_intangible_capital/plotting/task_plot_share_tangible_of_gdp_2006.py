@@ -2,16 +2,18 @@
 from pathlib import Path
 from typing import Annotated
 
-import pandas as pd
 from pytask import Product
 
 from measuring_intangible_capital.config import BLD, BLD_PYTHON, SRC
 from measuring_intangible_capital.plotting.plot import plot_share_tangible_to_intangible
+from measuring_intangible_capital.utilities import read_arrow
 
 plot_share_tangible_of_gdp_2006_deps = {
     "scripts": [Path("plot.py"), Path(SRC / "analysis" / "intangible_investment.py")],
-    "tangible_investment": BLD_PYTHON / "share_tangible" / "gdp_aggregate_2006.pkl",
-    "intangible_investment": BLD_PYTHON / "share_intangible" / "gdp_aggregate_2006.pkl",
+    "tangible_investment": BLD_PYTHON / "share_tangible" / "gdp_aggregate_2006.arrow",
+    "intangible_investment": BLD_PYTHON
+    / "share_intangible"
+    / "gdp_aggregate_2006.arrow",
 }
 
 
@@ -23,8 +25,8 @@ def task_plot_share_tangible_of_gdp_2006(
     Each category is: computerized_information, innovative_property, economic_competencies
     Save the plot to the given path.
     """
-    df_intangible = pd.read_pickle(depends_on["intangible_investment"])
-    df_tangible = pd.read_pickle(depends_on["tangible_investment"])
+    df_intangible = read_arrow(depends_on["intangible_investment"])
+    df_tangible = read_arrow(depends_on["tangible_investment"])
 
     fig = plot_share_tangible_to_intangible(
         intangible_df=df_intangible,
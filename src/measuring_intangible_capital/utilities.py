@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Literal
 
 import pandas as pd
+import pyarrow.feather as feather
 import yaml
 
 from measuring_intangible_capital.config import (
@@ -19,6 +20,7 @@ from measuring_intangible_capital.config import (
 )
 from measuring_intangible_capital.error_handling_utilities import (
     raise_country_code_invalid,
+    raise_data_info_invalid,
     raise_variable_wrong_type,
 )
 
@@ -47,6 +49,59 @@ def read_yaml(path):
     return out
 
 
+def write_arrow(df: pd.DataFrame, path: Path) -> None:
+    """Write a data frame to an uncompressed Arrow IPC (Feather v2) file.
+
+    Uncompressed files can be memory-mapped by ``read_arrow``, so readers do not
+    deserialize or copy the values. The index is stored with the columns and restored
+    by ``read_arrow``.
+
+    Args:
+        df (pd.DataFrame): the data frame.
+        path (Path): the file to write, e.g. ``bld/python/share_intangible/
+            gdp_aggregate_2006.arrow``. Missing folders are created.
+
+    """
+    raise_variable_wrong_type(df, pd.DataFrame, "df")
+    raise_variable_wrong_type(path, Path, "path")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    feather.write_feather(df, path, compression="uncompressed")
+
+
+def read_arrow(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    """Read a data frame written by ``write_arrow``.
+
+    The file is memory-mapped: the values of numeric columns without missing values
+    are not copied but point into the file, and only the pages of the columns which
+    are used are read from the disk. These values are read-only, so copy the data
+    frame before changing them in place. Adding columns is fine.
+
+    Args:
+        path (Path): the file to read.
+        columns (list[str], optional): columns to read. The index is always read. If
+            None, all columns are read.
+
+    Returns:
+        pd.DataFrame: the data frame, with the index and dtypes it was written with.
+
+    """
+    raise_variable_wrong_type(path, Path, "path")
+
+    table = feather.read_table(path, memory_map=True)
+    pandas_metadata = table.schema.pandas_metadata
+    if columns is not None:
+        index_columns = [
+            column
+            for column in pandas_metadata["index_columns"]
+            if isinstance(column, str)
+        ]
+        table = table.select([*columns, *index_columns])
+
+    df = table.to_pandas(split_blocks=True)
+    return _restore_index_dtypes(df, pandas_metadata)
+
+
 def add_country_name_main_countries(df: pd.DataFrame) -> pd.Series:
     """Add country name to a data frame for the main countries. Austria, Czech Republic,
     Denmark, Greece, and Slovakia.
@@ -88,13 +143,39 @@ def add_country_name_all_countries(df: pd.DataFrame) -> pd.Series:
     return _add_country_name(df, "all")
 
 
-def get_eu_klems_download_paths(country_code: str) -> dict:
+def get_eu_klems_file_names_to_download(data_info: dict) -> list[str]:
+    """Get the names of the EU KLEMS files which are read by the project. These are
+    declared under ``data_names`` in ``eu_klems_data_info.yaml``. Other files, like the
+    labour accounts, are never downloaded.
+
+    Args:
+        data_info (dict): information on the EU KLEMS data set.
+
+    Returns:
+        list[str]: the file names, in the order of EU_KLEMS_FILE_NAMES.
+
+    """
+    raise_data_info_invalid(data_info)
+    _raise_data_names_invalid(data_info)
+
+    return [
+        file_name
+        for file_name in EU_KLEMS_FILE_NAMES
+        if file_name in data_info["data_names"]
+    ]
+
+
+def get_eu_klems_download_paths(
+    country_code: str,
+    file_names: list[str] = EU_KLEMS_FILE_NAMES,
+) -> dict:
     """Get a dictionary of paths to the EU KLEMS data files for a specific country.
     Structure:
      {filename: path_to_file}, filename is one of the EU_KLEMS_FILE_NAMES.(national_accounts, etc).
 
     Args:
         country_code (str): the country code for the EU KLEMS data.
+        file_names (list[str]): the files to get paths for. Defaults to all files.
 
     Returns:
         dict: The dictionary of paths to the EU KLEMS data files for each file name(national_accounts, etc).
@@ -103,8 +184,6 @@ def get_eu_klems_download_paths(country_code: str) -> dict:
 
     raise_country_code_invalid(country_code, ALL_COUNTRY_CODES)
 
-    file_names = EU_KLEMS_FILE_NAMES
-
     if country_code == "SK":
         file_names = [
             file_name for file_name in file_names if file_name != "growth_accounts"
@@ -116,16 +195,84 @@ def get_eu_klems_download_paths(country_code: str) -> dict:
     }
 
 
+def get_account_data_paths(
+    country_code: str,
+    path_to_data: Path = DATA_CLEAN_PATH,
+) -> dict[str, Path]:
+    """Get the paths to the clean capital, national and growth accounts of a country.
+
+    The clean accounts of all countries form a Parquet dataset, partitioned by account
+    type and country, see ``data_management/accounts_dataset.py``.
+
+    Args:
+        country_code (str): the country code for the EU KLEMS data.
+        path_to_data (Path): the folder of the clean data. Defaults to DATA_CLEAN_PATH.
+
+    Returns:
+        dict[str, Path]: the path to each account, by key (capital, national, growth).
+
+    """
+    return {
+        key: _get_account_data_path(key, country_code, path_to_data)
+        for key in ["capital", "national", "growth"]
+    }
+
+
 def get_account_data_path_for_countries(
     key: Literal["capital", "national", "growth"],
     country_codes: list[str] = ALL_COUNTRY_CODES,
 ) -> list[Path]:
+    """Get the paths to the clean accounts of one account type for some countries.
+
+    Args:
+        key (str): the account type: capital, national or growth.
+        country_codes (list[str]): the country codes. Defaults to ALL_COUNTRY_CODES.
+
+    Returns:
+        list[Path]: the path to the account of each country, see
+        ``get_account_data_paths``.
+
+    """
     return [
-        Path(DATA_CLEAN_PATH / country_code / f"{key}_accounts.pkl")
+        _get_account_data_path(key, country_code, DATA_CLEAN_PATH)
         for country_code in country_codes
     ]
 
 
+def _get_account_data_path(key: str, country_code: str, path_to_data: Path) -> Path:
+    return Path(
+        path_to_data
+        / f"account={key}"
+        / f"country_code={country_code}"
+        / "accounts.parquet",
+    )
+
+
+def _restore_index_dtypes(df: pd.DataFrame, pandas_metadata: dict) -> pd.DataFrame:
+    """Arrow restores extension dtypes of columns, but not of index levels, e.g. the
+    years are int16 instead of Int16."""
+    dtypes = {
+        column["field_name"]: pd.api.types.pandas_dtype(column["numpy_type"])
+        for column in pandas_metadata["columns"]
+        if column["pandas_type"] != "categorical"
+    }
+    field_names = [
+        column if isinstance(column, str) else None
+        for column in pandas_metadata["index_columns"]
+    ]
+    levels = [
+        df.index.get_level_values(position).astype(dtypes[field_name])
+        if isinstance(dtypes.get(field_name), pd.api.extensions.ExtensionDtype)
+        else df.index.get_level_values(position)
+        for position, field_name in enumerate(field_names)
+    ]
+    if len(levels) > 1:
+        df.index = pd.MultiIndex.from_arrays(levels, names=df.index.names)
+    elif levels:
+        df.index = levels[0]
+    return df
+
+
 def _add_country_name(
     df: pd.DataFrame,
     mode: ADD_COUNTRY_NAME_MODE = "main",
@@ -156,6 +303,17 @@ def _add_country_name(
     return df["country_code"].map(map_dict)
 
 
+def _raise_data_names_invalid(data_info):
+    if "data_names" not in data_info:
+        msg = "The data_info dictionary must contain the key 'data_names'."
+        raise KeyError(msg)
+
+    for data_name in data_info["data_names"]:
+        if data_name not in EU_KLEMS_FILE_NAMES:
+            msg = f"Unknown data name {data_name}. Please use one of {EU_KLEMS_FILE_NAMES}."
+            raise ValueError(msg)
+
+
 def _raise_country_code_missing(df):
     if "country_code" not in df.columns:
         msg = "The data frame does not contain a column 'country_code'."
@@ -35,3 +35,24 @@ def mock_growth_accounts() -> pd.DataFrame:
     ).tolist()
 
     return growth_accounts
+
+
+def mock_clean_accounts(
+    country_code: str,
+    industry_codes: list[str],
+    years: range,
+    variable_names: list[str],
+) -> pd.DataFrame:
+    index = pd.MultiIndex.from_product(
+        [
+            pd.CategoricalIndex(industry_codes),
+            pd.array(list(years), dtype=pd.Int16Dtype()),
+            pd.CategoricalIndex([country_code]),
+        ],
+        names=["industry_code", "year", "country_code"],
+    )
+    return pd.DataFrame(
+        RNG_FOR_TESTING.uniform(100, 2000, (len(index), len(variable_names))),
+        index=index,
+        columns=pd.CategoricalIndex(variable_names, categories=variable_names),
+    )
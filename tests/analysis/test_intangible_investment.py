@@ -3,6 +3,8 @@ import numpy as np
 import pandas as pd
 import pytest
 from measuring_intangible_capital.analysis.intangible_investment import (
+    aggregate_intangible_investment,
+    get_aggregation_matrix,
     get_composition_of_value_added,
     get_intangible_investment_aggregate_types,
     get_share_of_intangible_investment_per_gdp,
@@ -11,6 +13,7 @@ from measuring_intangible_capital.analysis.intangible_investment import (
 from measuring_intangible_capital.config import (
     ALL_COUNTRY_CODES,
     INTANGIBLE_AGGREGATE_CATEGORIES,
+    INTANGIBLE_AGGREGATE_CATEGORY_MAPPING,
     INTANGIBLE_DETAIL_CATEGORIES,
 )
 
@@ -231,6 +234,26 @@ def test_get_intangible_investment_aggregate_types_result(
     assert actual.columns.tolist() == INTANGIBLE_AGGREGATE_CATEGORIES
 
 
+@pytest.mark.parametrize(
+    "get_share",
+    [
+        get_intangible_investment_aggregate_types,
+        get_share_of_tangible_investment_per_gdp,
+    ],
+)
+def test_get_share_per_country_raise_country_code_invalid(
+    capital_accounts_indexed,
+    national_accounts_indexed,
+    get_share,
+):
+    with pytest.raises(ValueError):
+        get_share(
+            capital_accounts=capital_accounts_indexed,
+            national_accounts=national_accounts_indexed,
+            country_code="XX",
+        )
+
+
 def test_get_share_of_tangible_investment_per_gdp_index_not_equal(
     capital_accounts_indexed,
     national_accounts,
@@ -270,3 +293,69 @@ def test_get_share_of_tangible_investment_per_gdp_result_index_match(
     )
 
     assert actual.index.equals(capital_accounts_indexed.index)
+
+
+def test_get_aggregation_matrix():
+    matrix = get_aggregation_matrix()
+
+    assert matrix.index.tolist() == INTANGIBLE_DETAIL_CATEGORIES
+    assert matrix.columns.tolist() == [*INTANGIBLE_AGGREGATE_CATEGORIES, "total"]
+    assert (matrix[INTANGIBLE_AGGREGATE_CATEGORIES].sum(axis=1) == 1).all()
+    assert (matrix["total"] == 1).all()
+
+
+def test_get_aggregation_matrix_without_total():
+    matrix = get_aggregation_matrix(total=None)
+
+    assert matrix.columns.tolist() == INTANGIBLE_AGGREGATE_CATEGORIES
+
+
+def test_get_aggregation_matrix_mapping_invalid():
+    with pytest.raises(ValueError, match="The detail category banana of"):
+        get_aggregation_matrix({"innovative_property": ["banana"]})
+
+
+def test_aggregate_intangible_investment_same_as_sum(capital_accounts):
+    capital_accounts.iloc[0, 0] = np.nan
+
+    actual = aggregate_intangible_investment(capital_accounts)
+
+    for category, detail_categories in INTANGIBLE_AGGREGATE_CATEGORY_MAPPING.items():
+        pd.testing.assert_series_equal(
+            actual[category],
+            capital_accounts[detail_categories].sum(axis=1),
+            check_names=False,
+        )
+    pd.testing.assert_series_equal(
+        actual["total"],
+        capital_accounts[INTANGIBLE_DETAIL_CATEGORIES].sum(axis=1),
+        check_names=False,
+    )
+
+
+def test_aggregate_intangible_investment_custom_matrix(capital_accounts):
+    mapping = {
+        "innovative_property_incl_rd": [
+            "entertainment_and_artistic",
+            "new_financial_product",
+            "design",
+            "research_and_development",
+        ],
+    }
+
+    actual = aggregate_intangible_investment(
+        capital_accounts,
+        get_aggregation_matrix(mapping, total=None),
+    )
+
+    assert actual.columns.tolist() == ["innovative_property_incl_rd"]
+    pd.testing.assert_series_equal(
+        actual["innovative_property_incl_rd"],
+        capital_accounts[mapping["innovative_property_incl_rd"]].sum(axis=1),
+        check_names=False,
+    )
+
+
+def test_aggregate_intangible_investment_wrong_columns(national_accounts):
+    with pytest.raises(ValueError, match="investment has the wrong columns"):
+        aggregate_intangible_investment(national_accounts)
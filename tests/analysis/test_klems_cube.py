@@ -0,0 +1,151 @@
+"""Tests for the KlemsCube."""
+import numpy as np
+import pandas as pd
+import pytest
+from measuring_intangible_capital.analysis.utilities import (
+    load_accounts,
+    prepare_accounts,
+)
+from measuring_intangible_capital.data_management.accounts_dataset import (
+    write_accounts,
+)
+from measuring_intangible_capital.klems_cube import KlemsCube
+from measuring_intangible_capital.utilities import get_account_data_paths
+
+from tests.analysis.mocks.mock import mock_clean_accounts
+
+YEARS = range(1995, 1999)
+
+
+@pytest.fixture()
+def accounts():
+    return [
+        mock_clean_accounts("DK", ["MARKT", "TOT"], YEARS, ["brand", "design"]),
+        mock_clean_accounts("AT", ["TOT"], YEARS, ["brand", "design"]),
+    ]
+
+
+@pytest.fixture()
+def cube(accounts):
+    return KlemsCube.from_accounts(accounts)
+
+
+def test_from_accounts_labels(cube):
+    assert cube.labels == {
+        "country_code": ("AT", "DK"),
+        "industry_code": ("MARKT", "TOT"),
+        "year": tuple(YEARS),
+        "variable_name": ("brand", "design"),
+    }
+    assert cube.shape == (2, 2, 4, 2)
+
+
+def test_from_accounts_values(cube, accounts):
+    expected = accounts[0].loc[("TOT", 1996, "DK")].to_numpy()
+
+    actual = cube.values[
+        cube.position("country_code", "DK"),
+        cube.position("industry_code", "TOT"),
+        cube.position("year", 1996),
+    ]
+
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_from_accounts_missing_values_nan(cube):
+    at_markt = cube.sel(country_code="AT", industry_code="MARKT")
+
+    assert np.isnan(at_markt.values).all()
+
+
+def test_from_accounts_skips_empty_accounts(accounts):
+    cube = KlemsCube.from_accounts([*accounts, pd.DataFrame()])
+
+    assert cube.labels["country_code"] == ("AT", "DK")
+
+
+def test_from_accounts_index_invalid(accounts):
+    with pytest.raises(ValueError, match="must have the index"):
+        KlemsCube.from_accounts(accounts[0].reset_index(level="year"))
+
+
+def test_to_frame_same_as_accounts(accounts):
+    df = KlemsCube.from_accounts(accounts[0]).to_frame()
+
+    pd.testing.assert_frame_equal(df, accounts[0])
+
+
+def test_to_frame_drops_rows_without_values(cube, accounts):
+    df = cube.to_frame()
+
+    assert len(df) == len(accounts[0]) + len(accounts[1])
+
+
+def test_sel_order_of_labels(cube):
+    selected = cube.sel(year=[1997, 1995], variable_name="design")
+
+    assert selected.labels["year"] == (1997, 1995)
+    assert selected.shape == (2, 2, 2, 1)
+    np.testing.assert_array_equal(
+        selected.values[..., 0, 0],
+        cube.values[
+            ..., cube.position("year", 1997), cube.position("variable_name", "design")
+        ],
+    )
+
+
+def test_sel_reduce_along_axis(cube):
+    total = cube.sel(industry_code="TOT").values.sum(axis=cube.axis("variable_name"))
+
+    assert total.shape == (2, 1, 4)
+
+
+def test_position_label_missing(cube):
+    with pytest.raises(KeyError, match="banana is not a label of the country_code"):
+        cube.position("country_code", "banana")
+
+
+def test_sel_axis_invalid(cube):
+    with pytest.raises(ValueError, match="The axis banana is not one of"):
+        cube.sel(banana="AT")
+
+
+def test_init_shape_invalid():
+    with pytest.raises(ValueError, match="The values have shape"):
+        KlemsCube(np.zeros((1, 1, 1, 2)), ["AT"], ["TOT"], [1995], ["gdp"])
+
+
+@pytest.mark.parametrize("country_code", ["AT", "DK"])
+def test_prepare_accounts_same_as_loc(cube, accounts, country_code):
+    df = accounts[0] if country_code == "DK" else accounts[1]
+    expected = df.loc[("TOT", list(YEARS[1:]), slice(None))].reset_index(
+        level="industry_code",
+        drop=True,
+    )
+
+    actual = prepare_accounts(
+        accounts=cube,
+        years=YEARS[1:],
+        industry_code="TOT",
+        country_code=country_code,
+    )
+
+    pd.testing.assert_frame_equal(actual, expected, check_categorical=False)
+
+
+@pytest.mark.parametrize("accounts", [None, pd.DataFrame()])
+def test_prepare_accounts_not_cube(accounts):
+    with pytest.raises(ValueError, match="KlemsCube"):
+        prepare_accounts(accounts=accounts, years=YEARS, industry_code="TOT")
+
+
+def test_load_accounts_same_as_from_accounts(tmp_path, accounts):
+    for df in accounts:
+        country_code = df.index.get_level_values("country_code")[0]
+        write_accounts(df, get_account_data_paths(country_code, tmp_path)["capital"])
+
+    cube = load_accounts("capital", years=YEARS[1:], path_to_dataset=tmp_path)
+
+    expected = KlemsCube.from_accounts(accounts).sel(year=YEARS[1:])
+    assert cube.labels == expected.labels
+    np.testing.assert_array_equal(cube.values, expected.values)
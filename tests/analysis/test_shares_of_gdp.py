@@ -0,0 +1,314 @@
+"""Tests for the shares_of_gdp module."""
+import numpy as np
+import pandas as pd
+import pytest
+from measuring_intangible_capital.analysis.intangible_investment import (
+    get_aggregation_matrix,
+    get_intangible_investment_aggregate_types,
+    get_share_of_intangible_investment_per_gdp,
+    get_share_of_tangible_investment_per_gdp,
+)
+from measuring_intangible_capital.analysis.shares_of_gdp import (
+    get_all_years,
+    get_capital_account_industry_codes,
+    get_intangible_investment_aggregate_shares,
+    get_shares_of_gdp,
+    get_shares_of_tangible_investment_per_gdp,
+    get_years_name,
+)
+from measuring_intangible_capital.analysis.utilities import prepare_accounts
+from measuring_intangible_capital.config import INTANGIBLE_DETAIL_CATEGORIES
+from measuring_intangible_capital.klems_cube import KlemsCube
+
+from tests.analysis.mocks.mock import mock_clean_accounts
+
+COUNTRY_CODES = ["AT", "EL", "DK"]
+YEARS = range(1995, 2007)
+YEARS_BY_SHARE = {
+    "share_intangible": [range(1995, 2007), range(2000, 2005)],
+    "share_intangible_aggregate": [[2006]],
+    "share_tangible": [[2006], range(2000, 2005)],
+}
+
+
+@pytest.fixture()
+def capital_accounts_stacked():
+    return pd.concat(
+        [
+            mock_clean_accounts(
+                country_code,
+                ["MARKT", "TOT"],
+                YEARS,
+                [*INTANGIBLE_DETAIL_CATEGORIES, "tangible_assets"],
+            )
+            for country_code in COUNTRY_CODES
+        ],
+    )
+
+
+@pytest.fixture()
+def national_accounts_stacked():
+    return pd.concat(
+        [
+            mock_clean_accounts(country_code, ["TOT"], YEARS, ["gdp"]) * 1_000
+            for country_code in COUNTRY_CODES
+        ],
+    )
+
+
+@pytest.fixture()
+def capital_accounts(capital_accounts_stacked):
+    return KlemsCube.from_accounts(capital_accounts_stacked)
+
+
+@pytest.fixture()
+def national_accounts(national_accounts_stacked):
+    return KlemsCube.from_accounts(national_accounts_stacked)
+
+
+@pytest.fixture()
+def shares(capital_accounts, national_accounts):
+    return get_shares_of_gdp(
+        capital_accounts,
+        national_accounts,
+        YEARS_BY_SHARE,
+        COUNTRY_CODES,
+    )
+
+
+@pytest.mark.parametrize(
+    ("years", "expected"),
+    [
+        (range(1995, 2007), "1995_2006"),
+        ([2006], "2006"),
+        (range(2000, 2005), "2000_2004"),
+    ],
+)
+def test_get_years_name(years, expected):
+    assert get_years_name(years) == expected
+
+
+def test_get_all_years():
+    assert get_all_years(YEARS_BY_SHARE) == list(range(1995, 2007))
+
+
+def test_get_capital_account_industry_codes():
+    assert get_capital_account_industry_codes(COUNTRY_CODES) == {
+        "AT": "MARKT",
+        "EL": "TOT",
+        "DK": "MARKT",
+    }
+
+
+def test_shares_of_gdp_names(shares):
+    assert {share: list(by_years) for share, by_years in shares.items()} == {
+        "share_intangible": ["1995_2006", "2000_2004"],
+        "share_intangible_aggregate": ["2006"],
+        "share_tangible": ["2006", "2000_2004"],
+    }
+
+
+@pytest.mark.parametrize("years", [range(1995, 2007), range(2000, 2005)])
+def test_share_intangible_same_as_per_window(
+    shares,
+    capital_accounts,
+    national_accounts,
+    years,
+):
+    expected = pd.concat(
+        [
+            get_share_of_intangible_investment_per_gdp(
+                capital_accounts=prepare_accounts(
+                    capital_accounts,
+                    years,
+                    "MARKT",
+                    country_code,
+                ),
+                national_accounts=prepare_accounts(
+                    national_accounts,
+                    years,
+                    "TOT",
+                    country_code,
+                ),
+            )
+            for country_code in COUNTRY_CODES
+        ],
+    )
+
+    pd.testing.assert_frame_equal(
+        shares["share_intangible"][get_years_name(years)],
+        expected,
+    )
+
+
+def test_share_intangible_aggregate_same_as_per_window(
+    shares,
+    capital_accounts,
+    national_accounts,
+):
+    dfs = []
+    for country_code in COUNTRY_CODES:
+        capital = prepare_accounts(
+            capital_accounts,
+            [2006],
+            "TOT" if country_code == "EL" else "MARKT",
+            country_code,
+        )
+        national = prepare_accounts(national_accounts, [2006], "TOT", country_code)
+        df = get_intangible_investment_aggregate_types(
+            capital_accounts=capital,
+            national_accounts=national,
+            country_code=country_code,
+        )
+        # The total is the share of the sum of all detail categories.
+        df["share_intangible"] = get_share_of_intangible_investment_per_gdp(
+            capital,
+            national,
+        )["share_intangible"]
+        dfs.append(df)
+
+    pd.testing.assert_frame_equal(
+        shares["share_intangible_aggregate"]["2006"],
+        pd.concat(dfs),
+    )
+
+
+@pytest.mark.parametrize("years", [[2006], range(2000, 2005)])
+def test_share_tangible_same_as_per_window(
+    shares,
+    capital_accounts,
+    national_accounts,
+    years,
+):
+    expected = pd.concat(
+        [
+            get_share_of_tangible_investment_per_gdp(
+                capital_accounts=prepare_accounts(
+                    capital_accounts,
+                    years,
+                    "TOT" if country_code == "EL" else "MARKT",
+                    country_code,
+                ),
+                national_accounts=prepare_accounts(
+                    national_accounts,
+                    years,
+                    "TOT",
+                    country_code,
+                ),
+                country_code=country_code,
+            )
+            for country_code in COUNTRY_CODES
+        ],
+    )
+
+    pd.testing.assert_frame_equal(
+        shares["share_tangible"][get_years_name(years)],
+        expected,
+    )
+
+
+def test_shares_of_gdp_share_invalid(capital_accounts, national_accounts):
+    with pytest.raises(ValueError, match="The share banana is not one of"):
+        get_shares_of_gdp(capital_accounts, national_accounts, {"banana": [[2006]]})
+
+
+def test_shares_of_gdp_not_cube(national_accounts):
+    with pytest.raises(ValueError, match="capital_accounts"):
+        get_shares_of_gdp(pd.DataFrame(), national_accounts, YEARS_BY_SHARE)
+
+
+@pytest.mark.parametrize(
+    "get_shares",
+    [
+        get_intangible_investment_aggregate_shares,
+        get_shares_of_tangible_investment_per_gdp,
+    ],
+)
+def test_stacked_frames_same_as_cube(
+    capital_accounts,
+    national_accounts,
+    capital_accounts_stacked,
+    national_accounts_stacked,
+    get_shares,
+):
+    pd.testing.assert_frame_equal(
+        get_shares(
+            capital_accounts_stacked,
+            national_accounts_stacked,
+            YEARS,
+            country_codes=COUNTRY_CODES,
+        ),
+        get_shares(
+            capital_accounts,
+            national_accounts,
+            YEARS,
+            country_codes=COUNTRY_CODES,
+        ),
+    )
+
+
+def test_industry_selector_per_country(capital_accounts, national_accounts):
+    industry_codes = {"AT": "TOT", "EL": "MARKT", "DK": "TOT"}
+    df = get_shares_of_tangible_investment_per_gdp(
+        capital_accounts,
+        national_accounts,
+        [2006],
+        industry_codes=industry_codes,
+        country_codes=COUNTRY_CODES,
+    )
+
+    for country_code, industry_code in industry_codes.items():
+        tangible = capital_accounts.sel(
+            country_code=country_code,
+            industry_code=industry_code,
+            year=2006,
+            variable_name="tangible_assets",
+        ).values.item()
+        gdp = national_accounts.sel(
+            country_code=country_code,
+            year=2006,
+        ).values.item()
+        assert df.loc[(2006, country_code), "share_tangible"] == round(
+            tangible / gdp * 100,
+            3,
+        )
+
+
+def test_shares_gdp_missing_nan(capital_accounts, national_accounts_stacked):
+    national_accounts = KlemsCube.from_accounts(
+        national_accounts_stacked.drop(index=("TOT", 2006, "AT")),
+    )
+    df = get_shares_of_tangible_investment_per_gdp(
+        capital_accounts,
+        national_accounts,
+        [2005, 2006],
+        country_codes=COUNTRY_CODES,
+    )
+
+    assert np.isnan(df.loc[(2006, "AT"), "share_tangible"])
+    assert df.drop(index=(2006, "AT"))["share_tangible"].notna().all()
+
+
+def test_shares_accounts_wrong_type(national_accounts):
+    with pytest.raises(ValueError, match="capital_accounts"):
+        get_shares_of_tangible_investment_per_gdp(
+            capital_accounts=[],
+            national_accounts=national_accounts,
+            years=YEARS,
+        )
+
+
+def test_aggregate_shares_custom_matrix(capital_accounts, national_accounts):
+    matrix = get_aggregation_matrix(
+        {"research_and_development": ["research_and_development"]},
+        total=None,
+    )
+    df = get_intangible_investment_aggregate_shares(
+        capital_accounts,
+        national_accounts,
+        [2006],
+        country_codes=COUNTRY_CODES,
+        aggregation_matrix=matrix,
+    )
+
+    assert df.columns.tolist() == ["research_and_development"]
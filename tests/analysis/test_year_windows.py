@@ -0,0 +1,206 @@
+"""Tests for the year_windows module."""
+import numpy as np
+import pandas as pd
+import pytest
+from measuring_intangible_capital.analysis.intangible_investment import (
+    get_composition_of_value_added,
+)
+from measuring_intangible_capital.analysis.shares_of_gdp import (
+    get_yearly_shares_of_gdp,
+    select_years,
+)
+from measuring_intangible_capital.analysis.utilities import prepare_accounts
+from measuring_intangible_capital.analysis.year_windows import (
+    YearWindows,
+    get_composition_of_value_added_for_window,
+    get_growth_year_windows,
+    get_share_year_windows,
+)
+from measuring_intangible_capital.config import (
+    INTANGIBLE_AGGREGATE_CATEGORIES,
+    INTANGIBLE_DETAIL_CATEGORIES,
+    LABOUR_COMPOSITION_COLUMNS,
+)
+from measuring_intangible_capital.klems_cube import KlemsCube
+
+from tests.analysis.mocks.mock import mock_clean_accounts
+
+COUNTRY_CODES = ["AT", "DK", "EL"]
+YEARS = range(1995, 2007)
+WINDOWS = [(1995, 2006), (2000, 2004), (2006, 2006), (1990, 1996), (2007, 2010)]
+
+
+@pytest.fixture()
+def series():
+    index = pd.MultiIndex.from_product(
+        [pd.array(list(YEARS), dtype=pd.Int16Dtype()), COUNTRY_CODES],
+        names=["year", "country_code"],
+    )
+    df = pd.DataFrame(
+        np.random.default_rng(0).normal(size=(len(index), 2)),
+        index=index,
+        columns=["share_intangible", "share_tangible"],
+    )
+    df.iloc[::5, 0] = np.nan
+    return df
+
+
+@pytest.fixture()
+def windows(series):
+    return YearWindows.from_frame(series)
+
+
+@pytest.fixture()
+def growth_accounts():
+    return KlemsCube.from_accounts(
+        [
+            mock_clean_accounts(
+                country_code,
+                ["MARKT", "TOT"],
+                YEARS,
+                [*LABOUR_COMPOSITION_COLUMNS, "labour_productivity"],
+            )
+            for country_code in COUNTRY_CODES
+        ],
+    )
+
+
+def _select_window(series, start, end):
+    years = series.index.get_level_values("year")
+    return series[(years >= start) & (years <= end)].groupby("country_code")
+
+
+@pytest.mark.parametrize(("start", "end"), WINDOWS)
+def test_mean_same_as_pandas(windows, series, start, end):
+    expected = _select_window(series, start, end).mean()
+
+    pd.testing.assert_frame_equal(
+        windows.mean(start, end),
+        expected.reindex(COUNTRY_CODES),
+        check_index_type=False,
+    )
+
+
+@pytest.mark.parametrize(("start", "end"), WINDOWS)
+def test_sum_same_as_pandas(windows, series, start, end):
+    expected = _select_window(series, start, end).sum()
+
+    pd.testing.assert_frame_equal(
+        windows.sum(start, end),
+        expected.reindex(COUNTRY_CODES, fill_value=0.0),
+        check_index_type=False,
+    )
+
+
+def test_mean_of_countries(windows):
+    df = windows.mean(2000, 2004, ["EL", "AT"])
+
+    assert list(df.index) == ["EL", "AT"]
+    pd.testing.assert_frame_equal(df, windows.mean(2000, 2004).loc[["EL", "AT"]])
+
+
+def test_all_means_same_as_mean(windows):
+    all_means = windows.all_means()
+
+    assert len(all_means) == len(COUNTRY_CODES) * len(YEARS) * (len(YEARS) + 1) / 2
+    for start, end in [(1995, 2006), (2000, 2004), (2006, 2006)]:
+        pd.testing.assert_frame_equal(
+            all_means.xs((start, end), level=["start", "end"]),
+            windows.mean(start, end),
+        )
+
+
+def test_composition_same_as_per_country(growth_accounts):
+    years = range(1995, 2007)
+    expected = pd.concat(
+        [
+            get_composition_of_value_added(
+                prepare_accounts(growth_accounts, years, "MARKT", country_code),
+                country_code,
+            )
+            for country_code in COUNTRY_CODES
+        ],
+    )
+
+    df = get_composition_of_value_added_for_window(
+        get_growth_year_windows(growth_accounts, COUNTRY_CODES),
+        start=1995,
+        end=2006,
+    )
+
+    pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.fixture()
+def yearly_shares():
+    capital_accounts = KlemsCube.from_accounts(
+        [
+            mock_clean_accounts(
+                country_code,
+                ["MARKT", "TOT"],
+                YEARS,
+                [*INTANGIBLE_DETAIL_CATEGORIES, "tangible_assets"],
+            )
+            for country_code in COUNTRY_CODES
+        ],
+    )
+    national_accounts = KlemsCube.from_accounts(
+        [
+            mock_clean_accounts(country_code, ["TOT"], YEARS, ["gdp"]) * 1_000
+            for country_code in COUNTRY_CODES
+        ],
+    )
+    return get_yearly_shares_of_gdp(
+        capital_accounts,
+        national_accounts,
+        YEARS,
+        country_codes=COUNTRY_CODES,
+    )
+
+
+def test_share_windows_series(yearly_shares):
+    windows = get_share_year_windows(yearly_shares)
+
+    assert windows.series_names == (
+        "investment_level",
+        "share_intangible",
+        *INTANGIBLE_AGGREGATE_CATEGORIES,
+        "share_tangible",
+    )
+
+
+@pytest.mark.parametrize(("start", "end"), [(1995, 2006), (2000, 2004), (2006, 2006)])
+def test_share_windows_same_as_mean_of_shares(yearly_shares, start, end):
+    windows = get_share_year_windows(yearly_shares)
+    means = windows.mean(start, end)
+
+    seen = []
+    for df in yearly_shares.values():
+        columns = [column for column in df.columns if column not in seen]
+        expected = (
+            select_years(df[columns], range(start, end + 1))
+            .groupby("country_code")
+            .mean()
+        )
+        pd.testing.assert_frame_equal(means[columns], expected, check_index_type=False)
+        seen.extend(columns)
+
+
+def test_window_invalid(windows):
+    with pytest.raises(ValueError, match="must start before it ends"):
+        windows.mean(2006, 1995)
+
+
+def test_country_missing(windows):
+    with pytest.raises(KeyError, match="There are no series of banana"):
+        windows.sum(1995, 2006, ["banana"])
+
+
+def test_from_frame_index_invalid(series):
+    with pytest.raises(ValueError, match="must have the index"):
+        YearWindows.from_frame(series.reset_index(level="year"))
+
+
+def test_init_years_not_sorted():
+    with pytest.raises(ValueError, match="sorted and unique"):
+        YearWindows(np.zeros((1, 2, 1)), ["AT"], [1996, 1995], ["gdp"])
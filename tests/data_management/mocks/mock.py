@@ -1,5 +1,11 @@
 """Functions to mock data sets for testing purposes."""
 
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
 import pandas as pd
 from measuring_intangible_capital.config import (
     ALL_COUNTRIES,
@@ -7,6 +13,7 @@ from measuring_intangible_capital.config import (
     RNG_FOR_TESTING,
     TEST_DIR,
 )
+from measuring_intangible_capital.data_management.utilities import clean_data
 
 MOCK_YEARS_RANGE = range(1995, 1998)
 EU_KLEMS_FIXTURE_PATH = TEST_DIR / "data_management" / "eu_klems_data_fixture.xlsx"
@@ -44,6 +51,43 @@ def mock_eu_klems_data():
     return capital_accounts, national_accounts, growth_accounts
 
 
+def reshape_eu_klems_with_pivot_table(
+    raw: list[pd.DataFrame],
+    data_info: dict,
+    years: range,
+) -> pd.DataFrame:
+    """Clean and reshape EU KLEMS sheets by melting the years and pivoting back.
+
+    This is the original implementation of ``clean_and_reshape_eu_klems``, kept as the
+    reference for its vectorized reshape.
+
+    """
+    data = [clean_data(df, data_info).set_index(["industry_code"]) for df in raw]
+    df = pd.concat(data)
+    df["variable_name"] = df["variable_name"].astype(pd.CategoricalDtype())
+
+    df = df.melt(
+        value_vars=list(map(str, years)),
+        value_name="investment_level",
+        var_name="year",
+        id_vars=["variable_name", "country_code"],
+        ignore_index=False,
+    )
+    df["year"] = df["year"].astype(pd.Int16Dtype())
+    df["variable_name"] = df["variable_name"].cat.rename_categories(
+        data_info["variable_name_mapping"],
+    )
+
+    df = df.pivot_table(
+        values="investment_level",
+        index=["industry_code", "year", "country_code"],
+        columns="variable_name",
+        observed=True,
+    )
+    df.columns.name = None
+    return df
+
+
 def mock_gdp_data():
     """Mock the GDP data set.
 
@@ -63,20 +107,179 @@ def mock_gdp_data():
     )
 
 
-def save_mock_eu_klems_data(capital_accounts, national_accounts, growth_accounts):
+def save_mock_eu_klems_data(
+    capital_accounts,
+    national_accounts,
+    growth_accounts,
+    path=EU_KLEMS_FIXTURE_PATH,
+):
     """Save the mock EU KLEMS data set."""
-    with pd.ExcelWriter(EU_KLEMS_FIXTURE_PATH, engine="xlsxwriter") as writer:
+    with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
         capital_accounts.to_excel(writer, sheet_name="Capital_Variable", index=False)
         national_accounts.to_excel(writer, sheet_name="National_Variable", index=False)
         growth_accounts.to_excel(writer, sheet_name="Growth_Variable", index=False)
 
 
+def mock_eu_klems_workbook(country_code: str = "AT") -> bytes:
+    """Mock an EU KLEMS workbook of a country as the bytes of an Excel file."""
+    sheets = mock_eu_klems_data()
+    for sheet in sheets:
+        sheet["geo_code"] = country_code
+
+    buffer = BytesIO()
+    save_mock_eu_klems_data(*sheets, path=buffer)
+    return buffer.getvalue()
+
+
 def save_mock_gdp_data(gdp):
     """Save the mock GDP data set."""
     with pd.ExcelWriter(GDP_FIXTURE_PATH, engine="xlsxwriter") as writer:
         gdp.to_excel(writer, sheet_name="Data", index=False)
 
 
+def mock_eu_klems_download_page(base_url: str, country_codes: list[str]) -> bytes:
+    """Mock the EU KLEMS download page with links to the files of each country.
+
+    Args:
+        base_url (str): address the links point to.
+        country_codes (list[str]): countries to add download links for.
+
+    Returns:
+        bytes: the HTML of the page.
+
+    """
+    link_texts = {
+        "national%20accounts": "National Accounts",
+        "capital%20accounts": "Capital",
+        "labour%20accounts": "Labour",
+        "intangible%20analytical": "Intangibles",
+        "growth%20accounts": "Growth Accounts Basic",
+    }
+    links = [
+        f'<a href="{base_url}/s/{country_code.lower()}{index}/{country_code}_{file_name}'
+        f'.xlsx?dl=1">{link_text}</a>'
+        for country_code in country_codes
+        for index, (file_name, link_text) in enumerate(link_texts.items())
+    ]
+    body = "\n".join(['<a href="#top">Top</a>', *links])
+
+    return (
+        f"<html><head><title>EU KLEMS</title></head><body>{body}</body></html>".encode()
+    )
+
+
+def start_mock_http_server(
+    files: dict[str, bytes],
+    latency: float = 0.0,
+    errors: list[int] | None = None,
+) -> tuple[ThreadingHTTPServer, str]:
+    """Start a local HTTP server which stands in for the EU KLEMS file host.
+
+    Args:
+        files (dict[str, bytes]): the content to serve for each url path, e.g.
+            {"/AT_national%20accounts.xlsx": b"..."}.
+        latency (float): seconds to wait before answering each request.
+        errors (list[int], optional): status codes to answer the first requests with,
+            e.g. [429, 503]. Error responses ask to retry after 0 seconds.
+
+    Returns:
+        tuple[ThreadingHTTPServer, str]: the running server and its base url. Call
+        ``server.shutdown()`` when done. The paths and headers of all requests are
+        recorded in ``server.RequestHandlerClass.requests``.
+
+    """
+    handler = type(
+        "MockFileRequestHandler",
+        (_MockFileRequestHandler,),
+        {
+            "files": files,
+            "latency": latency,
+            "errors": list(errors or []),
+            "requests": [],
+        },
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class _MockFileRequestHandler(BaseHTTPRequestHandler):
+    """Serve in-memory files over keep-alive HTTP/1.1 connections.
+
+    Supports ETag revalidation and open ended Range requests ("bytes=N-"), which are
+    ignored if their If-Range does not match the current ETag.
+
+    """
+
+    protocol_version = "HTTP/1.1"
+    files: dict[str, bytes] = {}
+    latency = 0.0
+    requests: list[tuple[str, dict]] = []
+    errors: list[int] = []
+
+    def do_GET(self):
+        self.requests.append((self.path, dict(self.headers)))
+        time.sleep(self.latency)
+
+        if self.errors:
+            self.send_response(self.errors.pop(0))
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        content = self.files.get(self.path.split("?")[0])
+
+        if content is None:
+            self._send_empty(404)
+            return
+
+        etag = f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send_empty(304, etag)
+            return
+
+        start = self._get_range_start()
+        if self.headers.get("If-Range", etag) != etag:
+            start = None
+        if start is not None and start >= len(content):
+            self._send_empty(416, etag)
+            return
+
+        if start is None:
+            self.send_response(200)
+        else:
+            self.send_response(206)
+            self.send_header(
+                "Content-Range",
+                f"bytes {start}-{len(content) - 1}/{len(content)}",
+            )
+            content = content[start:]
+
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _get_range_start(self) -> int | None:
+        """Return N for a "Range: bytes=N-" header, None otherwise."""
+        range_header = self.headers.get("Range", "")
+        if not range_header.startswith("bytes=") or not range_header.endswith("-"):
+            return None
+        return int(range_header[len("bytes=") : -1])
+
+    def _send_empty(self, status: int, etag: str | None = None):
+        self.send_response(status)
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        """Keep the test output clean."""
+
+
 def _get_base_eu_klems_data():
     """Get the base data for the mock."""
 
@@ -0,0 +1,145 @@
+"""Tests for accounts_dataset."""
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from measuring_intangible_capital.data_management.accounts_dataset import (
+    read_accounts,
+    write_accounts,
+)
+from measuring_intangible_capital.data_management.clean_eu_klems_data import (
+    compact_eu_klems_accounts,
+)
+from measuring_intangible_capital.utilities import get_account_data_paths
+
+from tests.analysis.mocks.mock import mock_clean_accounts
+
+COUNTRY_CODES = ["AT", "DK"]
+YEARS = range(1995, 2000)
+
+
+@pytest.fixture()
+def accounts():
+    return {
+        country_code: mock_clean_accounts(
+            country_code,
+            ["MARKT", "TOT"],
+            YEARS,
+            ["brand", "design"],
+        )
+        for country_code in COUNTRY_CODES
+    }
+
+
+@pytest.fixture()
+def path_to_dataset(tmp_path, accounts):
+    for country_code, df in accounts.items():
+        write_accounts(df, get_account_data_paths(country_code, tmp_path)["capital"])
+    return tmp_path
+
+
+def test_read_accounts_same_as_written(path_to_dataset, accounts):
+    df = read_accounts(path_to_dataset, "capital")
+
+    pd.testing.assert_frame_equal(
+        df,
+        pd.concat(accounts.values()),
+        check_index_type=False,
+        check_categorical=False,
+    )
+    assert df.index.get_level_values("year").dtype == pd.Int16Dtype()
+    assert isinstance(df.columns, pd.CategoricalIndex)
+
+
+def test_read_accounts_filters(path_to_dataset, accounts):
+    df = read_accounts(
+        path_to_dataset,
+        "capital",
+        country_codes=["DK"],
+        industries=["TOT"],
+        years=range(1996, 1998),
+    )
+
+    pd.testing.assert_frame_equal(
+        df,
+        accounts["DK"].loc[("TOT", [1996, 1997], "DK"), :],
+        check_categorical=False,
+    )
+
+
+def test_write_accounts_country_code_only_in_path(path_to_dataset):
+    path = get_account_data_paths("AT", path_to_dataset)["capital"]
+
+    assert path.parts[-3:] == ("account=capital", "country_code=AT", "accounts.parquet")
+    assert "country_code" not in pq.read_schema(path).names
+
+
+def test_write_accounts_row_groups_by_industry(tmp_path, accounts, monkeypatch):
+    monkeypatch.setattr(
+        "measuring_intangible_capital.data_management.accounts_dataset."
+        "ACCOUNTS_DATASET_ROW_GROUP_SIZE",
+        len(YEARS),
+    )
+    path = get_account_data_paths("AT", tmp_path)["capital"]
+
+    write_accounts(accounts["AT"], path)
+
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_row_groups == 2
+    statistics = metadata.row_group(1).column(0).statistics
+    assert (statistics.min, statistics.max) == ("TOT", "TOT")
+
+
+def test_read_accounts_empty_accounts_skipped(path_to_dataset, accounts):
+    write_accounts(
+        pd.DataFrame(), get_account_data_paths("SK", path_to_dataset)["capital"]
+    )
+
+    df = read_accounts(path_to_dataset, "capital")
+
+    assert len(df) == sum(len(df) for df in accounts.values())
+
+
+def test_read_accounts_all_empty(tmp_path):
+    write_accounts(pd.DataFrame(), get_account_data_paths("SK", tmp_path)["growth"])
+
+    assert read_accounts(tmp_path, "growth").empty
+
+
+def test_write_accounts_wrong_partition(tmp_path, accounts):
+    with pytest.raises(ValueError, match=r"accounts of \['AT'\] must be written"):
+        write_accounts(
+            accounts["AT"], get_account_data_paths("DK", tmp_path)["capital"]
+        )
+
+
+def test_read_accounts_account_missing(path_to_dataset):
+    with pytest.raises(FileNotFoundError, match="no growth accounts"):
+        read_accounts(path_to_dataset, "growth")
+
+
+def test_read_accounts_compact_categories_survive_concat(tmp_path, accounts):
+    categories = {
+        "industry_code": ["MARKT", "NACE", "TOT"],
+        "country_code": ["AT", "DK", "SK"],
+        "variable_name": ["brand", "design", "gdp"],
+    }
+    for country_code, df in accounts.items():
+        write_accounts(
+            compact_eu_klems_accounts(df, categories, float32=True),
+            get_account_data_paths(country_code, tmp_path)["capital"],
+        )
+
+    at = read_accounts(tmp_path, "capital", country_codes=["AT"])
+    dk = read_accounts(tmp_path, "capital", country_codes=["DK"], industries=["TOT"])
+    df = pd.concat([at, dk])
+
+    pd.testing.assert_series_equal(at.dtypes, dk.dtypes)
+    for name in ["industry_code", "country_code"]:
+        assert at.index.get_level_values(name).dtype == pd.CategoricalDtype(
+            categories[name],
+        )
+        assert df.index.get_level_values(name).dtype == pd.CategoricalDtype(
+            categories[name],
+        )
+    assert list(df.columns.categories) == categories["variable_name"]
+    assert (df.dtypes == "float32").all()
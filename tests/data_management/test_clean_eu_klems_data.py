@@ -1,5 +1,6 @@
 """Tests for clean_eu_klems_data."""
 import os
+from io import BytesIO
 
 import numpy as np
 import pandas as pd
@@ -12,6 +13,7 @@ from tests.data_management.mocks.mock import (
     EU_KLEMS_FIXTURE_PATH,
     MOCK_YEARS_RANGE,
     mock_eu_klems_data,
+    reshape_eu_klems_with_pivot_table,
     save_mock_eu_klems_data,
 )
 
@@ -245,3 +247,313 @@ def test_clean_and_reshape_eu_klems_variable_type(
     assert capital_accounts_clean[capital_accounts_variables].dtypes == np.float64
     assert national_accounts_clean[national_accounts_variables].dtypes == np.float64
     assert growth_accounts_clean[growth_accounts_variables].dtypes == np.float64
+
+
+def test_read_data_from_buffer(data_info):
+    buffer = BytesIO(EU_KLEMS_FIXTURE_PATH.read_bytes())
+
+    capital_accounts, national_accounts = clean_eu_klems_data.read_data(
+        data_info=data_info,
+        path_to_capital_accounts=buffer,
+        path_to_national_accounts=buffer,
+    )
+
+    expected, _ = clean_eu_klems_data.read_data(
+        data_info=data_info,
+        path_to_capital_accounts=EU_KLEMS_FIXTURE_PATH,
+        path_to_national_accounts=EU_KLEMS_FIXTURE_PATH,
+    )
+    assert capital_accounts[0].equals(expected[0])
+    assert type(national_accounts[0]) == pd.DataFrame
+
+
+def test_clean_eu_klems_accounts_raw_files_missing(data_info, years_range):
+    with pytest.raises(KeyError, match="national_accounts"):
+        clean_eu_klems_data.clean_eu_klems_accounts(
+            data_info=data_info,
+            raw_files={"intangible_analytical": EU_KLEMS_FIXTURE_PATH},
+            years=years_range,
+        )
+
+
+def test_clean_eu_klems_accounts_without_growth_accounts(data_info, years_range):
+    accounts = clean_eu_klems_data.clean_eu_klems_accounts(
+        data_info=data_info,
+        raw_files={
+            "intangible_analytical": EU_KLEMS_FIXTURE_PATH,
+            "national_accounts": EU_KLEMS_FIXTURE_PATH,
+        },
+        years=years_range,
+    )
+
+    assert not accounts["capital"].empty
+    assert not accounts["national"].empty
+    assert accounts["growth"].empty
+
+
+def test_clean_eu_klems_accounts_with_growth_accounts(data_info, years_range):
+    accounts = clean_eu_klems_data.clean_eu_klems_accounts(
+        data_info=data_info,
+        raw_files={
+            "intangible_analytical": EU_KLEMS_FIXTURE_PATH,
+            "national_accounts": EU_KLEMS_FIXTURE_PATH,
+            "growth_accounts": BytesIO(EU_KLEMS_FIXTURE_PATH.read_bytes()),
+        },
+        years=years_range,
+    )
+
+    assert list(accounts["growth"].columns) == ["Growth_Variable"]
+
+
+def test_read_data_opens_each_workbook_once(data_info, monkeypatch):
+    opened = []
+    excel_file = pd.ExcelFile
+
+    def mock_excel_file(path, *args, **kwargs):
+        opened.append(path)
+        return excel_file(path, *args, **kwargs)
+
+    monkeypatch.setattr(pd, "ExcelFile", mock_excel_file)
+
+    clean_eu_klems_data.read_data(
+        data_info=data_info,
+        path_to_capital_accounts=EU_KLEMS_FIXTURE_PATH,
+        path_to_national_accounts=EU_KLEMS_FIXTURE_PATH,
+    )
+    clean_eu_klems_data.read_growth_accounts(
+        data_info=data_info,
+        path_to_growth_accounts=EU_KLEMS_FIXTURE_PATH,
+    )
+
+    assert len(opened) == 3
+
+
+def test_read_data_reads_only_years_and_id_columns(data_info):
+    years = range(MOCK_YEARS_RANGE.start, MOCK_YEARS_RANGE.stop - 1)
+
+    capital_accounts, national_accounts = clean_eu_klems_data.read_data(
+        data_info=data_info,
+        path_to_capital_accounts=EU_KLEMS_FIXTURE_PATH,
+        path_to_national_accounts=EU_KLEMS_FIXTURE_PATH,
+        years=years,
+    )
+
+    expected_columns = {*map(str, years), "nace_r2_code", "geo_code", "var"}
+    assert set(capital_accounts[0].columns) == expected_columns
+    assert set(national_accounts[0].columns) == expected_columns
+
+
+def test_clean_eu_klems_accounts_same_as_without_projection(data_info, years_range):
+    capital_accounts_raw, _ = clean_eu_klems_data.read_data(
+        data_info=data_info,
+        path_to_capital_accounts=EU_KLEMS_FIXTURE_PATH,
+        path_to_national_accounts=EU_KLEMS_FIXTURE_PATH,
+    )
+    expected = clean_eu_klems_data.clean_and_reshape_eu_klems(
+        capital_accounts_raw,
+        data_info,
+        years=years_range,
+    )
+
+    accounts = clean_eu_klems_data.clean_eu_klems_accounts(
+        data_info=data_info,
+        raw_files={
+            "intangible_analytical": EU_KLEMS_FIXTURE_PATH,
+            "national_accounts": EU_KLEMS_FIXTURE_PATH,
+        },
+        years=years_range,
+    )
+
+    pd.testing.assert_frame_equal(accounts["capital"], expected)
+
+
+# The second cached run reads the sheets written to the cache by the first one.
+@pytest.mark.parametrize("cached", [False, True, True])
+def test_read_data_reads_only_industries(data_info, cached, tmp_path_factory):
+    path_to_cache = tmp_path_factory.getbasetemp() / "raw_cache" if cached else None
+
+    capital_accounts, national_accounts = clean_eu_klems_data.read_data(
+        data_info=data_info,
+        path_to_capital_accounts=EU_KLEMS_FIXTURE_PATH,
+        path_to_national_accounts=EU_KLEMS_FIXTURE_PATH,
+        path_to_cache=path_to_cache,
+        years=MOCK_YEARS_RANGE,
+        industries=["A", "C"],
+    )
+    expected, _ = clean_eu_klems_data.read_data(
+        data_info=data_info,
+        path_to_capital_accounts=EU_KLEMS_FIXTURE_PATH,
+        path_to_national_accounts=EU_KLEMS_FIXTURE_PATH,
+        years=MOCK_YEARS_RANGE,
+    )
+
+    assert list(capital_accounts[0]["nace_r2_code"]) == ["A", "C"]
+    assert list(national_accounts[0]["nace_r2_code"]) == ["A", "C"]
+    pd.testing.assert_frame_equal(
+        capital_accounts[0],
+        expected[0].iloc[[0, 2]].reset_index(drop=True),
+    )
+
+
+def test_read_data_filter_column_missing(data_info):
+    data_info["column_rename_mapping"] = {"banana": "industry_code"}
+
+    with pytest.raises(KeyError, match="banana"):
+        clean_eu_klems_data.read_data(
+            data_info=data_info,
+            path_to_capital_accounts=EU_KLEMS_FIXTURE_PATH,
+            path_to_national_accounts=EU_KLEMS_FIXTURE_PATH,
+            industries=["A"],
+        )
+
+
+def test_clean_eu_klems_accounts_industries(data_info, years_range):
+    raw_files = {
+        "intangible_analytical": EU_KLEMS_FIXTURE_PATH,
+        "national_accounts": EU_KLEMS_FIXTURE_PATH,
+    }
+    accounts = clean_eu_klems_data.clean_eu_klems_accounts(
+        data_info=data_info,
+        raw_files=raw_files,
+        years=years_range,
+        industries=["B"],
+    )
+    expected = clean_eu_klems_data.clean_eu_klems_accounts(
+        data_info=data_info,
+        raw_files=raw_files,
+        years=years_range,
+    )
+
+    pd.testing.assert_frame_equal(
+        accounts["national"],
+        expected["national"].loc[["B"]],
+        check_categorical=False,
+    )
+
+
+def test_read_data_cache_engine_without_path_to_cache(data_info):
+    with pytest.raises(ValueError, match="needs a path_to_cache"):
+        clean_eu_klems_data.read_data(
+            data_info=data_info,
+            path_to_capital_accounts=EU_KLEMS_FIXTURE_PATH,
+            path_to_national_accounts=EU_KLEMS_FIXTURE_PATH,
+            engine="cache",
+        )
+
+
+@pytest.mark.parametrize("with_missing_values", [False, True])
+@pytest.mark.parametrize("with_repeated_ids", [False, True])
+def test_clean_and_reshape_eu_klems_same_as_pivot_table(
+    data_info,
+    years_range,
+    with_missing_values,
+    with_repeated_ids,
+):
+    raw = list(mock_eu_klems_data())
+    if with_repeated_ids:
+        raw.append(mock_eu_klems_data()[0])
+    if with_missing_values:
+        raw[0].loc[0, "1996"] = np.nan
+        raw[1].loc[1, list(map(str, years_range))] = np.nan
+        raw[2]["1995"] = np.nan
+
+    df = clean_eu_klems_data.clean_and_reshape_eu_klems(
+        raw,
+        data_info,
+        years=years_range,
+    )
+
+    pd.testing.assert_frame_equal(
+        df,
+        reshape_eu_klems_with_pivot_table(raw, data_info, years=years_range),
+    )
+
+
+def test_get_shared_categories(data_info):
+    categories = clean_eu_klems_data.get_shared_categories(
+        data_info,
+        industries=["C", "A"],
+        country_codes=["DK", "AT"],
+    )
+
+    assert categories == {
+        "country_code": ["AT", "DK"],
+        "variable_name": [
+            "Capital_Variable",
+            "Growth_Variable",
+            "National_Variable",
+            "sheet1",
+            "sheet2",
+        ],
+        "industry_code": ["A", "C"],
+    }
+
+
+@pytest.mark.parametrize("float32", [False, True])
+def test_compact_eu_klems_accounts_categories_survive_concat(
+    data_info,
+    years_range,
+    float32,
+):
+    categories = clean_eu_klems_data.get_shared_categories(
+        data_info,
+        industries=["A", "B", "C"],
+    )
+    accounts = []
+    for country_code in ["AT", "DK"]:
+        raw = list(mock_eu_klems_data())
+        for df in raw:
+            df["geo_code"] = country_code
+        accounts.append(
+            clean_eu_klems_data.compact_eu_klems_accounts(
+                clean_eu_klems_data.clean_and_reshape_eu_klems(
+                    raw,
+                    data_info,
+                    years=years_range,
+                ),
+                categories,
+                float32=float32,
+            ),
+        )
+
+    df = pd.concat(accounts)
+
+    for name in ["industry_code", "country_code"]:
+        level = df.index.get_level_values(name)
+        assert isinstance(level.dtype, pd.CategoricalDtype)
+        assert list(level.categories) == categories[name]
+    assert list(df.columns.categories) == categories["variable_name"]
+    assert df.index.get_level_values("year").dtype == pd.Int16Dtype()
+    assert (df.dtypes == (np.float32 if float32 else np.float64)).all()
+
+
+def test_compact_eu_klems_accounts_same_values(data_info, years_range):
+    df = clean_eu_klems_data.clean_and_reshape_eu_klems(
+        list(mock_eu_klems_data()),
+        data_info,
+        years=years_range,
+    )
+
+    compact = clean_eu_klems_data.compact_eu_klems_accounts(
+        df,
+        clean_eu_klems_data.get_shared_categories(data_info),
+    )
+
+    pd.testing.assert_frame_equal(compact, df, check_categorical=False)
+
+
+def test_compact_eu_klems_accounts_ids_missing_from_categories(
+    data_info,
+    years_range,
+):
+    df = clean_eu_klems_data.clean_and_reshape_eu_klems(
+        list(mock_eu_klems_data()),
+        data_info,
+        years=years_range,
+    )
+
+    with pytest.raises(ValueError, match=r"industry_code ids \['C'\] are not in"):
+        clean_eu_klems_data.compact_eu_klems_accounts(
+            df,
+            clean_eu_klems_data.get_shared_categories(data_info, industries=["A", "B"]),
+        )
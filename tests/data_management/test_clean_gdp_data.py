@@ -113,3 +113,44 @@ def test_clean_gdp_per_capita_country_code_dtype(gdp_data, data_info):
     )
 
     assert gdp_data_clean.reset_index()["country_code"].dtype == "category"
+
+
+def test_read_data_cache_engine_same_as_openpyxl(data_info, tmp_path):
+    expected = clean_gdp_data.read_data(
+        data_info=data_info,
+        path=GDP_FIXTURE_PATH,
+        engine="openpyxl",
+    )
+
+    for _ in range(2):
+        gdp = clean_gdp_data.read_data(
+            data_info=data_info,
+            path=GDP_FIXTURE_PATH,
+            engine="cache",
+            path_to_cache=tmp_path,
+        )
+        pd.testing.assert_frame_equal(gdp, expected)
+
+
+def test_read_data_explicit_engine_through_cache(data_info, tmp_path):
+    gdp = clean_gdp_data.read_data(
+        data_info=data_info,
+        path=GDP_FIXTURE_PATH,
+        engine="openpyxl",
+        path_to_cache=tmp_path,
+    )
+
+    assert list(tmp_path.glob("*/*.parquet"))
+    pd.testing.assert_frame_equal(
+        gdp,
+        clean_gdp_data.read_data(data_info=data_info, path=GDP_FIXTURE_PATH),
+    )
+
+
+def test_read_data_invalid_engine(data_info):
+    with pytest.raises(ValueError, match="The engine must be one of"):
+        clean_gdp_data.read_data(
+            data_info=data_info,
+            path=GDP_FIXTURE_PATH,
+            engine="banana",
+        )
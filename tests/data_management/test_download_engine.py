@@ -0,0 +1,346 @@
+"""Tests for download_engine."""
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from measuring_intangible_capital.config import RNG_FOR_TESTING
+from measuring_intangible_capital.data_management.download.download_engine import (
+    HostLimits,
+    download_files,
+    download_to_memory,
+    format_download_statistics,
+    read_manifest,
+    verify_file,
+)
+from measuring_intangible_capital.data_management.download.retry import TokenBucket
+
+from tests.data_management.mocks.mock import start_mock_http_server
+
+
+@pytest.fixture()
+def requests_made():
+    return []
+
+
+@pytest.fixture()
+def served_files():
+    return {
+        f"/{country}_national%20accounts.xlsx": RNG_FOR_TESTING.bytes(10_000)
+        for country in ["AT", "CZ", "DK", "EL", "SK"]
+    }
+
+
+@pytest.fixture()
+def base_url(served_files, requests_made):
+    server, base_url = start_mock_http_server(served_files)
+    server.RequestHandlerClass.requests = requests_made
+    yield base_url
+    server.shutdown()
+
+
+@pytest.fixture()
+def downloads(served_files, base_url, tmp_path):
+    return [
+        (f"{base_url}{url_path}", tmp_path / f"{index}" / "national_accounts.xlsx")
+        for index, url_path in enumerate(served_files)
+    ]
+
+
+@pytest.fixture()
+def path_to_manifest(tmp_path):
+    return tmp_path / "manifest.json"
+
+
+@pytest.mark.parametrize("downloads", [None, 1, "banana", {}])
+def test_download_files_downloads_not_list(downloads):
+    with pytest.raises(ValueError, match="<class 'list'>"):
+        download_files(downloads)
+
+
+@pytest.mark.parametrize("max_workers", [0, -1, 1.5, True, None])
+def test_download_files_max_workers_invalid(max_workers):
+    with pytest.raises(ValueError, match="max_workers must be a positive integer"):
+        download_files([], max_workers=max_workers)
+
+
+def test_download_files_content(downloads, served_files):
+    download_files(downloads, max_workers=3, max_per_host=2)
+
+    for (_, path), content in zip(downloads, served_files.values()):
+        assert path.read_bytes() == content
+
+
+def test_download_files_statistics(downloads, served_files):
+    statistics = download_files(downloads)
+
+    assert statistics["files"] == len(served_files)
+    assert statistics["bytes"] == sum(map(len, served_files.values()))
+    assert statistics["throughput"] > 0
+    assert "Downloaded 5 files" in format_download_statistics(statistics)
+
+
+def _write_part_file(path, content, etag):
+    path.parent.mkdir(parents=True)
+    path.with_name(f"{path.name}.part").write_bytes(content)
+    path.with_name(f"{path.name}.part.validator").write_text(etag)
+
+
+def _get_etag(content):
+    return f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+
+
+def test_download_files_resumes_partial_file(downloads, served_files, requests_made):
+    _, path = downloads[0]
+    content = next(iter(served_files.values()))
+    _write_part_file(path, content[:4_000], _get_etag(content))
+
+    statistics = download_files(downloads[:1])
+
+    assert path.read_bytes() == content
+    assert statistics["bytes"] == len(content) - 4_000
+    assert requests_made[0][1]["Range"] == "bytes=4000-"
+    assert requests_made[0][1]["If-Range"] == _get_etag(content)
+    assert not path.with_name(f"{path.name}.part").exists()
+    assert not path.with_name(f"{path.name}.part.validator").exists()
+
+
+def test_download_files_restarts_partial_file_without_validator(
+    downloads,
+    served_files,
+    requests_made,
+):
+    _, path = downloads[0]
+    content = next(iter(served_files.values()))
+    path.parent.mkdir(parents=True)
+    path.with_name(f"{path.name}.part").write_bytes(b"stale" * 1_000)
+
+    download_files(downloads[:1])
+
+    assert path.read_bytes() == content
+    assert "Range" not in requests_made[0][1]
+
+
+@pytest.mark.parametrize("surplus", [0, 1_000])
+def test_download_files_restarts_partial_file_not_smaller_than_file(
+    downloads,
+    served_files,
+    requests_made,
+    surplus,
+):
+    _, path = downloads[0]
+    content = next(iter(served_files.values()))
+    _write_part_file(path, content + b"x" * surplus, _get_etag(content))
+
+    statistics = download_files(downloads[:1])
+
+    assert path.read_bytes() == content
+    assert statistics["bytes"] == len(content)
+    assert [headers.get("Range") for _, headers in requests_made] == [
+        f"bytes={len(content) + surplus}-",
+        None,
+    ]
+    assert not path.with_name(f"{path.name}.part").exists()
+
+
+def test_download_files_restarts_partial_file_changed_on_server(
+    downloads,
+    served_files,
+    requests_made,
+):
+    url_path = next(iter(served_files))
+    _, path = downloads[0]
+    old_content = served_files[url_path]
+    _write_part_file(path, old_content[:4_000], _get_etag(old_content))
+    served_files[url_path] = new_content = RNG_FOR_TESTING.bytes(10_000)
+
+    statistics = download_files(downloads[:1])
+
+    assert path.read_bytes() == new_content
+    assert statistics["bytes"] == len(new_content)
+    assert len(requests_made) == 1
+
+
+def test_download_files_manifest_entries(downloads, served_files, path_to_manifest):
+    download_files(downloads, path_to_manifest=path_to_manifest)
+
+    manifest = read_manifest(path_to_manifest)
+
+    for (_, path), content in zip(downloads, served_files.values()):
+        entry = manifest[path.relative_to(path_to_manifest.parent).as_posix()]
+        assert entry["size"] == len(content)
+        assert verify_file(path, entry, thorough=True)
+
+
+def test_download_files_skips_verified_files(
+    downloads,
+    path_to_manifest,
+    requests_made,
+):
+    download_files(downloads, path_to_manifest=path_to_manifest)
+    statistics = download_files(downloads, path_to_manifest=path_to_manifest)
+
+    assert statistics["files"] == 0
+    assert statistics["skipped"] == len(downloads)
+    assert len(requests_made) == len(downloads)
+
+
+def test_download_files_refetches_changed_files(
+    downloads,
+    served_files,
+    path_to_manifest,
+):
+    download_files(downloads, path_to_manifest=path_to_manifest)
+    _, path = downloads[0]
+    path.write_bytes(b"truncated")
+
+    statistics = download_files(downloads, path_to_manifest=path_to_manifest)
+
+    assert statistics["files"] == 1
+    assert path.read_bytes() == next(iter(served_files.values()))
+
+
+def test_download_files_revalidate_not_modified(
+    downloads,
+    path_to_manifest,
+    requests_made,
+):
+    download_files(downloads, path_to_manifest=path_to_manifest)
+    mtimes = [path.stat().st_mtime_ns for _, path in downloads]
+
+    statistics = download_files(
+        downloads,
+        path_to_manifest=path_to_manifest,
+        revalidate=True,
+    )
+
+    assert set(statistics["decisions"].values()) == {"unchanged"}
+    assert statistics["bytes"] == 0
+    assert all("If-None-Match" in headers for _, headers in requests_made[5:])
+    assert [path.stat().st_mtime_ns for _, path in downloads] == mtimes
+
+
+def test_download_files_revalidate_changed_on_server(
+    downloads,
+    served_files,
+    path_to_manifest,
+):
+    download_files(downloads, path_to_manifest=path_to_manifest)
+    url_path = next(iter(served_files))
+    served_files[url_path] = b"new release"
+
+    statistics = download_files(
+        downloads,
+        path_to_manifest=path_to_manifest,
+        revalidate=True,
+    )
+
+    _, path = downloads[0]
+    assert statistics["decisions"][str(path)] == "downloaded"
+    assert statistics["files"] == 1
+    assert path.read_bytes() == b"new release"
+
+
+def test_download_files_revalidate_identical_content_keeps_file(
+    downloads,
+    path_to_manifest,
+):
+    download_files(downloads, path_to_manifest=path_to_manifest)
+    manifest = json.loads(path_to_manifest.read_text())
+    for entry in manifest.values():
+        entry["etag"] = '"outdated"'
+    path_to_manifest.write_text(json.dumps(manifest))
+    mtimes = [path.stat().st_mtime_ns for _, path in downloads]
+
+    statistics = download_files(
+        downloads,
+        path_to_manifest=path_to_manifest,
+        revalidate=True,
+    )
+
+    assert set(statistics["decisions"].values()) == {"unchanged"}
+    assert statistics["bytes"] > 0
+    assert [path.stat().st_mtime_ns for _, path in downloads] == mtimes
+
+
+def test_download_files_retries_throttled_requests(served_files, tmp_path):
+    server, base_url = start_mock_http_server(served_files, errors=[429, 503])
+    url_path = next(iter(served_files))
+
+    download_files(
+        [(f"{base_url}{url_path}", tmp_path / "national_accounts.xlsx")],
+        backoff=0.01,
+    )
+    server.shutdown()
+
+    assert (tmp_path / "national_accounts.xlsx").read_bytes() == served_files[url_path]
+    assert len(server.RequestHandlerClass.requests) == 3
+
+
+def test_download_to_memory_content(downloads, served_files, tmp_path):
+    urls = {f"file_{index}": url for index, (url, _) in enumerate(downloads)}
+
+    buffers = download_to_memory(urls)
+
+    assert [buffer.read() for buffer in buffers.values()] == list(
+        served_files.values(),
+    )
+    assert not any(tmp_path.iterdir())
+
+
+class _CountingTokenBucket(TokenBucket):
+    def __init__(self):
+        super().__init__(rate=1_000, burst=1)
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+        super().acquire()
+
+
+def test_download_to_memory_shared_rate_limiter(downloads):
+    urls = {f"file_{index}": url for index, (url, _) in enumerate(downloads)}
+    rate_limiter = _CountingTokenBucket()
+
+    download_to_memory(urls, rate_limiter=rate_limiter)
+    download_to_memory(urls, rate_limiter=rate_limiter)
+
+    assert rate_limiter.acquired == 2 * len(urls)
+
+
+def test_download_to_memory_shared_host_limits(served_files):
+    server, base_url = start_mock_http_server(served_files, latency=0.05)
+    urls = {url_path: f"{base_url}{url_path}" for url_path in served_files}
+    host_limits = HostLimits(max_per_host=1)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(
+            executor.map(
+                lambda urls: download_to_memory(urls, host_limits=host_limits),
+                [urls, urls],
+            ),
+        )
+    seconds = time.perf_counter() - start
+    server.shutdown()
+
+    # One request at a time over both calls.
+    assert seconds >= 2 * len(urls) * 0.05
+
+
+def test_host_limits_per_host():
+    host_limits = HostLimits(max_per_host=2)
+
+    assert host_limits.for_url("https://a.org/x") is host_limits.for_url(
+        "https://a.org/y"
+    )
+    assert host_limits.for_url("https://a.org/x") is not host_limits.for_url(
+        "https://b.org/x",
+    )
+
+
+@pytest.mark.parametrize("max_per_host", [0, -1, True])
+def test_host_limits_invalid(max_per_host):
+    with pytest.raises(ValueError, match="max_per_host must be a positive integer"):
+        HostLimits(max_per_host)
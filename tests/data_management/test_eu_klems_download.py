@@ -0,0 +1,163 @@
+"""Tests for eu_klems_download."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from measuring_intangible_capital.data_management.download.eu_klems_download import (
+    download_eu_klems_country_to_memory,
+    get_downloads_for_countries,
+    get_eu_klems_link_index,
+    get_link_index,
+)
+from measuring_intangible_capital.utilities import get_eu_klems_download_paths
+
+from tests.data_management.mocks.mock import (
+    mock_eu_klems_download_page,
+    mock_eu_klems_workbook,
+    start_mock_http_server,
+)
+
+COUNTRY_CODES_ON_PAGE = ["AT", "SK"]
+
+
+@pytest.fixture()
+def server():
+    files = {}
+    server, base_url = start_mock_http_server(files)
+    files["/download/"] = mock_eu_klems_download_page(base_url, COUNTRY_CODES_ON_PAGE)
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture()
+def page_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/download/"
+
+
+@pytest.fixture()
+def requests_made(server):
+    return server.RequestHandlerClass.requests
+
+
+@pytest.fixture()
+def path_to_cache(tmp_path):
+    return tmp_path / "link_index.json"
+
+
+def test_get_link_index_skips_other_links():
+    html = (
+        '<p><a href="#AT_national%20accounts.xlsx">National Accounts</a></p>'
+        '<a href="https://host/s/xyz/AT_statistical%20notes.pdf">Notes</a>'
+        '<a href="https://host/s/xyz/AT_national%20accounts.xlsx?dl=1">'
+        "National Accounts</a>"
+    )
+
+    link_index = get_link_index(html, country_codes=["AT", "CZ"])
+
+    assert link_index == {
+        "AT": {
+            "national_accounts": "https://host/s/xyz/AT_national%20accounts.xlsx?dl=1"
+        },
+        "CZ": {},
+    }
+
+
+def test_get_eu_klems_link_index_result(page_url, path_to_cache):
+    link_index = get_eu_klems_link_index(path_to_cache=path_to_cache, url=page_url)
+
+    assert set(link_index["AT"]) == {
+        "national_accounts",
+        "capital_accounts",
+        "labour_accounts",
+        "intangible_analytical",
+        "growth_accounts",
+    }
+    assert link_index["SK"]["national_accounts"].endswith(
+        "SK_national%20accounts.xlsx?dl=1",
+    )
+    assert link_index["US"] == {}
+
+
+def test_get_eu_klems_link_index_cached_within_ttl(
+    page_url,
+    path_to_cache,
+    requests_made,
+):
+    first = get_eu_klems_link_index(path_to_cache=path_to_cache, url=page_url)
+    second = get_eu_klems_link_index(path_to_cache=path_to_cache, url=page_url)
+
+    assert first == second
+    assert len(requests_made) == 1
+
+
+def test_get_eu_klems_link_index_revalidated_after_ttl(
+    page_url,
+    path_to_cache,
+    requests_made,
+):
+    first = get_eu_klems_link_index(path_to_cache=path_to_cache, url=page_url)
+    second = get_eu_klems_link_index(path_to_cache=path_to_cache, url=page_url, ttl=0)
+
+    assert first == second
+    assert len(requests_made) == 2
+    assert "If-None-Match" in requests_made[1][1]
+
+
+def test_get_eu_klems_link_index_concurrent_writers(page_url, path_to_cache):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        link_indices = list(
+            executor.map(
+                lambda _: get_eu_klems_link_index(
+                    path_to_cache=path_to_cache,
+                    url=page_url,
+                    ttl=0,
+                ),
+                range(32),
+            ),
+        )
+
+    assert all(link_index == link_indices[0] for link_index in link_indices)
+    assert list(path_to_cache.parent.glob("*.tmp")) == []
+
+
+def test_get_downloads_for_countries_result(page_url, path_to_cache):
+    link_index = get_eu_klems_link_index(path_to_cache=path_to_cache, url=page_url)
+    paths = {"SK": get_eu_klems_download_paths("SK")}
+
+    downloads = get_downloads_for_countries(link_index, paths)
+
+    assert len(downloads) == len(paths["SK"])
+    assert downloads[0] == (
+        link_index["SK"]["capital_accounts"],
+        paths["SK"]["capital_accounts"],
+    )
+
+
+def test_get_downloads_for_countries_link_missing(page_url, path_to_cache):
+    link_index = get_eu_klems_link_index(path_to_cache=path_to_cache, url=page_url)
+    paths = {"US": get_eu_klems_download_paths("US")}
+
+    with pytest.raises(KeyError, match="No download link for capital_accounts of US"):
+        get_downloads_for_countries(link_index, paths)
+
+
+def test_download_eu_klems_country_to_memory_uses_link_index(
+    server,
+    page_url,
+    path_to_cache,
+    requests_made,
+):
+    link_index = get_eu_klems_link_index(path_to_cache=path_to_cache, url=page_url)
+    url_path = link_index["SK"]["national_accounts"].removeprefix(
+        f"http://127.0.0.1:{server.server_address[1]}",
+    )
+    workbook = mock_eu_klems_workbook("SK")
+    server.RequestHandlerClass.files[url_path.split("?")[0]] = workbook
+
+    buffers = download_eu_klems_country_to_memory(
+        "SK",
+        ["national_accounts"],
+        link_index=link_index,
+    )
+
+    assert buffers["national_accounts"].getvalue() == workbook
+    assert [path for path, _ in requests_made] == ["/download/", url_path]
@@ -0,0 +1,165 @@
+"""Tests for pipeline."""
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from measuring_intangible_capital.config import TEST_DIR
+from measuring_intangible_capital.data_management.accounts_dataset import (
+    read_accounts,
+)
+from measuring_intangible_capital.data_management.pipeline import (
+    clean_and_save_eu_klems_accounts,
+    run_download_and_clean_pipeline,
+)
+from measuring_intangible_capital.utilities import get_account_data_paths, read_yaml
+
+from tests.data_management.mocks.mock import MOCK_YEARS_RANGE, mock_eu_klems_workbook
+
+COUNTRY_CODES = ["AT", "CZ", "DK"]
+
+
+@pytest.fixture(scope="module")
+def workbook():
+    return {
+        country_code: mock_eu_klems_workbook(country_code)
+        for country_code in COUNTRY_CODES
+    }
+
+
+@pytest.fixture()
+def data_info():
+    return read_yaml(TEST_DIR / "data_management" / "eu_klems_data_info_fixture.yaml")
+
+
+@pytest.fixture()
+def paths_to_clean_data(tmp_path):
+    return {
+        country_code: get_account_data_paths(country_code, tmp_path / "clean")
+        for country_code in COUNTRY_CODES
+    }
+
+
+def _download_country(workbook, failing_country_code=None):
+    def download_country(country_code):
+        if country_code == failing_country_code:
+            msg = "Connection reset"
+            raise ConnectionError(msg)
+        return {
+            "intangible_analytical": BytesIO(workbook[country_code]),
+            "national_accounts": BytesIO(workbook[country_code]),
+        }
+
+    return download_country
+
+
+def test_run_download_and_clean_pipeline_saves_all_countries(
+    workbook,
+    data_info,
+    paths_to_clean_data,
+):
+    statistics = run_download_and_clean_pipeline(
+        country_codes=COUNTRY_CODES,
+        download_country=_download_country(workbook),
+        data_info=data_info,
+        years=MOCK_YEARS_RANGE,
+        paths_to_clean_data=paths_to_clean_data,
+        max_download_workers=2,
+        max_clean_workers=2,
+        queue_size=1,
+    )
+
+    assert statistics["countries"] == len(COUNTRY_CODES)
+    for paths in paths_to_clean_data.values():
+        assert all(path.exists() for path in paths.values())
+
+
+def test_run_download_and_clean_pipeline_same_as_sequential(
+    workbook,
+    data_info,
+    paths_to_clean_data,
+    tmp_path,
+):
+    run_download_and_clean_pipeline(
+        country_codes=COUNTRY_CODES,
+        download_country=_download_country(workbook),
+        data_info=data_info,
+        years=MOCK_YEARS_RANGE,
+        paths_to_clean_data=paths_to_clean_data,
+        max_clean_workers=2,
+    )
+    clean_and_save_eu_klems_accounts(
+        data_info=data_info,
+        raw_files=_download_country(workbook)("AT"),
+        years=MOCK_YEARS_RANGE,
+        paths_to_clean_data=get_account_data_paths("AT", tmp_path / "sequential"),
+    )
+
+    for key in ["capital", "national"]:
+        pd.testing.assert_frame_equal(
+            read_accounts(tmp_path / "clean", key, country_codes=["AT"]),
+            read_accounts(tmp_path / "sequential", key),
+        )
+
+
+def test_run_download_and_clean_pipeline_download_fails(
+    workbook,
+    data_info,
+    paths_to_clean_data,
+):
+    with pytest.raises(RuntimeError, match="Downloading the data of DK failed"):
+        run_download_and_clean_pipeline(
+            country_codes=COUNTRY_CODES,
+            download_country=_download_country(workbook, failing_country_code="DK"),
+            data_info=data_info,
+            years=MOCK_YEARS_RANGE,
+            paths_to_clean_data=paths_to_clean_data,
+            max_clean_workers=2,
+            queue_size=1,
+        )
+
+
+def test_run_download_and_clean_pipeline_paths_missing(workbook, data_info):
+    with pytest.raises(KeyError, match="clean data of AT"):
+        run_download_and_clean_pipeline(
+            country_codes=COUNTRY_CODES,
+            download_country=_download_country(workbook),
+            data_info=data_info,
+            years=MOCK_YEARS_RANGE,
+            paths_to_clean_data={},
+        )
+
+
+def test_clean_and_save_eu_klems_accounts_full_store(workbook, data_info, tmp_path):
+    paths_to_clean_data = get_account_data_paths("AT", tmp_path / "clean")
+    paths_to_full_data = get_account_data_paths("AT", tmp_path / "full")
+
+    clean_and_save_eu_klems_accounts(
+        data_info=data_info,
+        raw_files=_download_country(workbook)("AT"),
+        years=MOCK_YEARS_RANGE,
+        paths_to_clean_data=paths_to_clean_data,
+        industries=["A"],
+        paths_to_full_data=paths_to_full_data,
+    )
+
+    full = read_accounts(tmp_path / "full", "capital")
+    clean = read_accounts(tmp_path / "clean", "capital")
+    assert set(full.index.get_level_values("industry_code")) == {"A", "B", "C"}
+    assert set(clean.index.get_level_values("industry_code")) == {"A"}
+    pd.testing.assert_frame_equal(clean, full.loc[["A"]], check_categorical=False)
+
+
+def test_clean_and_save_eu_klems_accounts_compact(workbook, data_info, tmp_path):
+    clean_and_save_eu_klems_accounts(
+        data_info=data_info,
+        raw_files=_download_country(workbook)("AT"),
+        years=MOCK_YEARS_RANGE,
+        paths_to_clean_data=get_account_data_paths("AT", tmp_path),
+        industries=["A", "B"],
+        compact=True,
+        float32=True,
+    )
+
+    clean = read_accounts(tmp_path, "capital")
+    assert list(clean.index.levels[0]) == ["A", "B"]
+    assert (clean.dtypes == "float32").all()
@@ -0,0 +1,153 @@
+"""Tests for raw_cache."""
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from measuring_intangible_capital.data_management.raw_cache import (
+    get_content_hash,
+    read_excel_sheets_cached,
+)
+from measuring_intangible_capital.data_management.utilities import read_excel_sheets
+
+from tests.data_management.mocks.mock import mock_eu_klems_workbook
+
+SHEET_NAMES = ["Capital_Variable", "National_Variable"]
+
+
+@pytest.fixture()
+def path_to_workbook(tmp_path):
+    path = tmp_path / "intangible_analytical.xlsx"
+    path.write_bytes(mock_eu_klems_workbook())
+    return path
+
+
+@pytest.fixture()
+def path_to_cache(tmp_path):
+    return tmp_path / "raw_cache"
+
+
+@pytest.fixture()
+def parsed(monkeypatch):
+    parsed = []
+
+    def mock_read_excel_sheets(path, sheet_names, **kwargs):
+        parsed.append(sheet_names)
+        return read_excel_sheets(path, sheet_names, **kwargs)
+
+    monkeypatch.setattr(
+        "measuring_intangible_capital.data_management.raw_cache.read_excel_sheets",
+        mock_read_excel_sheets,
+    )
+    return parsed
+
+
+def test_read_excel_sheets_cached_same_as_workbook(path_to_workbook, path_to_cache):
+    expected = read_excel_sheets(path_to_workbook, SHEET_NAMES)
+
+    first = read_excel_sheets_cached(path_to_workbook, SHEET_NAMES, path_to_cache)
+    second = read_excel_sheets_cached(path_to_workbook, SHEET_NAMES, path_to_cache)
+
+    for df_expected, df_first, df_second in zip(expected, first, second):
+        pd.testing.assert_frame_equal(df_first, df_expected)
+        pd.testing.assert_frame_equal(df_second, df_expected)
+
+
+def test_read_excel_sheets_cached_keyed_by_content(path_to_workbook, path_to_cache):
+    read_excel_sheets_cached(path_to_workbook, SHEET_NAMES, path_to_cache)
+
+    path_to_workbook_cache = path_to_cache / get_content_hash(path_to_workbook)
+    assert sorted(path.name for path in path_to_workbook_cache.iterdir()) == [
+        f"{sheet}.parquet" for sheet in SHEET_NAMES
+    ]
+
+
+def test_read_excel_sheets_cached_parses_only_missing_sheets(
+    path_to_workbook,
+    path_to_cache,
+    parsed,
+):
+    read_excel_sheets_cached(path_to_workbook, SHEET_NAMES[:1], path_to_cache)
+    read_excel_sheets_cached(path_to_workbook, SHEET_NAMES, path_to_cache)
+    read_excel_sheets_cached(path_to_workbook, SHEET_NAMES, path_to_cache)
+
+    assert parsed == [SHEET_NAMES[:1], SHEET_NAMES[1:]]
+
+
+def test_read_excel_sheets_cached_new_content_parsed_again(
+    path_to_workbook,
+    path_to_cache,
+    parsed,
+):
+    read_excel_sheets_cached(path_to_workbook, SHEET_NAMES, path_to_cache)
+    path_to_workbook.write_bytes(mock_eu_klems_workbook())
+
+    read_excel_sheets_cached(path_to_workbook, SHEET_NAMES, path_to_cache)
+
+    assert len(parsed) == 2
+
+
+def test_read_excel_sheets_cached_buffer(path_to_workbook, path_to_cache):
+    read_excel_sheets_cached(path_to_workbook, SHEET_NAMES, path_to_cache)
+    buffer = BytesIO(path_to_workbook.read_bytes())
+
+    assert get_content_hash(buffer) == get_content_hash(path_to_workbook)
+    assert len(read_excel_sheets_cached(buffer, SHEET_NAMES, path_to_cache)) == 2
+
+
+def test_read_excel_sheets_cached_path_to_cache_not_path(path_to_workbook):
+    with pytest.raises(ValueError, match="<class 'pathlib.Path'>"):
+        read_excel_sheets_cached(path_to_workbook, SHEET_NAMES, "banana")
+
+
+def test_read_excel_sheets_cached_usecols(path_to_workbook, path_to_cache):
+    def usecols(column):
+        return column in ["nace_r2_code", "var"]
+
+    first = read_excel_sheets_cached(
+        path_to_workbook,
+        SHEET_NAMES,
+        path_to_cache,
+        usecols,
+    )
+    second = read_excel_sheets_cached(
+        path_to_workbook,
+        SHEET_NAMES,
+        path_to_cache,
+        usecols,
+    )
+
+    for df_first, df_second in zip(first, second):
+        assert list(df_first.columns) == ["nace_r2_code", "var"]
+        pd.testing.assert_frame_equal(df_first, df_second)
+
+
+@pytest.mark.parametrize(
+    ("engine", "expected"),
+    [("openpyxl", "openpyxl"), (None, "calamine"), ("cache", "calamine")],
+)
+def test_read_excel_sheets_cached_parses_with_engine(
+    path_to_workbook,
+    path_to_cache,
+    monkeypatch,
+    engine,
+    expected,
+):
+    engines = []
+
+    def mock_read_excel_sheets(path, sheet_names, engine, **kwargs):
+        engines.append(engine)
+        return read_excel_sheets(path, sheet_names, engine="openpyxl", **kwargs)
+
+    monkeypatch.setattr(
+        "measuring_intangible_capital.data_management.raw_cache.read_excel_sheets",
+        mock_read_excel_sheets,
+    )
+    monkeypatch.setattr(
+        "measuring_intangible_capital.data_management.utilities.is_calamine_available",
+        lambda: True,
+    )
+    read_excel_sheets_cached(
+        path_to_workbook, SHEET_NAMES, path_to_cache, engine=engine
+    )
+
+    assert engines == [expected]
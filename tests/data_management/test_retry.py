@@ -0,0 +1,153 @@
+"""Tests for retry."""
+import threading
+import time
+
+import pytest
+import requests
+from measuring_intangible_capital.data_management.download.retry import (
+    TokenBucket,
+    call_with_retries,
+    get_backoff_delay,
+    parse_retry_after,
+)
+
+
+def _raise_http_error(status_code: int, headers: dict | None = None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    raise requests.HTTPError(response=response)
+
+
+@pytest.fixture()
+def calls():
+    return []
+
+
+@pytest.mark.parametrize("attempt", [0, 1, 5, 20])
+def test_get_backoff_delay_bounds(attempt):
+    delay = get_backoff_delay(attempt, backoff=1.0, max_backoff=10.0)
+
+    assert 0 <= delay <= min(10.0, 2**attempt)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(None, None), ("120", 120.0), ("banana", None)],
+)
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+@pytest.mark.parametrize(("rate", "burst"), [(0, 1), (-1.0, 1), (1.0, 0)])
+def test_token_bucket_invalid(rate, burst):
+    with pytest.raises(ValueError, match="The rate must be positive"):
+        TokenBucket(rate=rate, burst=burst)
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50.0, burst=1)
+
+    start = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+
+    assert time.perf_counter() - start >= 0.09
+
+
+def test_call_with_retries_succeeds_after_throttling(calls):
+    def function():
+        calls.append(1)
+        if len(calls) < 3:
+            _raise_http_error(429, {"Retry-After": "0"})
+        return "done"
+
+    assert call_with_retries(function, max_retries=3, backoff=0.001) == "done"
+    assert len(calls) == 3
+
+
+def test_call_with_retries_gives_up(calls):
+    def function():
+        calls.append(1)
+        _raise_http_error(503)
+
+    with pytest.raises(requests.HTTPError):
+        call_with_retries(function, max_retries=2, backoff=0.001)
+    assert len(calls) == 3
+
+
+def test_call_with_retries_client_error_not_retried(calls):
+    def function():
+        calls.append(1)
+        _raise_http_error(404)
+
+    with pytest.raises(requests.HTTPError):
+        call_with_retries(function, max_retries=2, backoff=0.001)
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("max_retries", [-1, 1.5, True, None])
+def test_call_with_retries_max_retries_invalid(calls, max_retries):
+    with pytest.raises(ValueError, match="max_retries must be a non-negative integer"):
+        call_with_retries(lambda: calls.append(1), max_retries=max_retries)
+    assert calls == []
+
+
+def test_call_with_retries_retry_after_capped(calls, monkeypatch):
+    delays = []
+    monkeypatch.setattr(time, "sleep", delays.append)
+
+    def function():
+        calls.append(1)
+        if len(calls) < 2:
+            _raise_http_error(503, {"Retry-After": "86400"})
+        return "done"
+
+    bucket = TokenBucket(rate=1_000.0, burst=1)
+    result = call_with_retries(
+        function,
+        max_retries=1,
+        backoff=0.001,
+        rate_limiter=bucket,
+        max_retry_after=2.0,
+    )
+
+    # The retry waits for the capped Retry-After, and so does the paused rate limiter.
+    assert result == "done"
+    assert delays[0] == 2.0
+    assert max(delays) <= 2.0
+
+
+def test_call_with_retries_releases_host_limit_while_waiting(calls, monkeypatch):
+    host_limit = threading.BoundedSemaphore(1)
+    held_while_waiting = []
+
+    def sleep(_):
+        acquired = host_limit.acquire(blocking=False)
+        held_while_waiting.append(not acquired)
+        if acquired:
+            host_limit.release()
+
+    monkeypatch.setattr(time, "sleep", sleep)
+
+    def function():
+        calls.append(host_limit.acquire(blocking=False))
+        if len(calls) < 2:
+            _raise_http_error(429, {"Retry-After": "300"})
+        return "done"
+
+    result = call_with_retries(
+        function,
+        max_retries=1,
+        backoff=0.001,
+        host_limit=host_limit,
+    )
+
+    # Each attempt holds the host limit, the wait between them does not.
+    assert result == "done"
+    assert calls == [False, False]
+    assert held_while_waiting == [False]
@@ -0,0 +1,108 @@
+"""Tests for stream_eu_klems_data."""
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from measuring_intangible_capital.config import TEST_DIR
+from measuring_intangible_capital.data_management.clean_eu_klems_data import (
+    clean_and_reshape_eu_klems,
+    clean_eu_klems_accounts,
+)
+from measuring_intangible_capital.data_management.stream_eu_klems_data import (
+    stream_and_reshape_eu_klems,
+)
+from measuring_intangible_capital.data_management.utilities import read_excel_sheets
+from measuring_intangible_capital.utilities import read_yaml
+
+from tests.data_management.mocks.mock import MOCK_YEARS_RANGE, mock_eu_klems_workbook
+
+SHEET_NAMES = ["Capital_Variable", "National_Variable", "Growth_Variable"]
+
+
+@pytest.fixture(scope="module")
+def workbook():
+    return mock_eu_klems_workbook()
+
+
+@pytest.fixture()
+def data_info():
+    return read_yaml(TEST_DIR / "data_management" / "eu_klems_data_info_fixture.yaml")
+
+
+@pytest.mark.parametrize("sheet_names", [SHEET_NAMES[:1], SHEET_NAMES])
+@pytest.mark.parametrize("years", [MOCK_YEARS_RANGE, range(1996, 1998)])
+def test_stream_and_reshape_eu_klems_same_as_clean_and_reshape(
+    workbook,
+    data_info,
+    sheet_names,
+    years,
+):
+    expected = clean_and_reshape_eu_klems(
+        read_excel_sheets(BytesIO(workbook), sheet_names),
+        data_info,
+        years=years,
+    )
+
+    df = stream_and_reshape_eu_klems(BytesIO(workbook), sheet_names, data_info, years)
+
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_stream_and_reshape_eu_klems_industries(workbook, data_info):
+    df = stream_and_reshape_eu_klems(
+        BytesIO(workbook),
+        SHEET_NAMES,
+        data_info,
+        MOCK_YEARS_RANGE,
+        industries=["A", "C"],
+    )
+
+    assert list(df.index.get_level_values("industry_code").unique()) == ["A", "C"]
+
+
+def test_stream_and_reshape_eu_klems_no_industries_match(workbook, data_info):
+    df = stream_and_reshape_eu_klems(
+        BytesIO(workbook),
+        SHEET_NAMES,
+        data_info,
+        MOCK_YEARS_RANGE,
+        industries=["banana"],
+    )
+
+    assert df.empty
+
+
+def test_stream_and_reshape_eu_klems_year_missing(workbook, data_info):
+    with pytest.raises(KeyError, match="The column 1998 is not in the sheet"):
+        stream_and_reshape_eu_klems(
+            BytesIO(workbook),
+            SHEET_NAMES,
+            data_info,
+            range(1997, 1999),
+        )
+
+
+@pytest.mark.parametrize("path", [None, 1, "banana"])
+def test_stream_and_reshape_eu_klems_path_invalid(path, data_info):
+    with pytest.raises(ValueError, match="<class 'pathlib.Path'>"):
+        stream_and_reshape_eu_klems(path, SHEET_NAMES, data_info, MOCK_YEARS_RANGE)
+
+
+def test_clean_eu_klems_accounts_streaming_same_as_data_frames(workbook, data_info):
+    accounts = {
+        streaming: clean_eu_klems_accounts(
+            data_info=data_info,
+            raw_files={
+                "intangible_analytical": BytesIO(workbook),
+                "national_accounts": BytesIO(workbook),
+                "growth_accounts": BytesIO(workbook),
+            },
+            years=MOCK_YEARS_RANGE,
+            industries=["B"],
+            streaming=streaming,
+        )
+        for streaming in [False, True]
+    }
+
+    for key in ["capital", "national", "growth"]:
+        pd.testing.assert_frame_equal(accounts[True][key], accounts[False][key])
@@ -0,0 +1,108 @@
+"""Tests for data_management utilities."""
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from measuring_intangible_capital.data_management.utilities import (
+    get_excel_engine,
+    is_calamine_available,
+    read_excel_sheets,
+    select_rows_and_columns,
+)
+
+from tests.data_management.mocks.mock import mock_eu_klems_workbook
+
+SHEET_NAMES = ["Capital_Variable", "National_Variable"]
+ENGINES = ["openpyxl", "calamine"] if is_calamine_available() else ["openpyxl"]
+
+
+@pytest.fixture(scope="module")
+def workbook():
+    return mock_eu_klems_workbook()
+
+
+def test_get_excel_engine_auto_with_cache(tmp_path):
+    assert get_excel_engine("auto", tmp_path) == "cache"
+
+
+def test_get_excel_engine_auto_without_cache():
+    assert get_excel_engine("auto") == ENGINES[-1]
+
+
+def test_get_excel_engine_explicit(tmp_path):
+    assert get_excel_engine("openpyxl", tmp_path) == "openpyxl"
+
+
+@pytest.mark.parametrize("engine", ["banana", None, "xlrd"])
+def test_get_excel_engine_invalid(engine):
+    with pytest.raises(ValueError, match="The engine must be one of"):
+        get_excel_engine(engine)
+
+
+def test_get_excel_engine_cache_without_path():
+    with pytest.raises(ValueError, match="needs a path_to_cache"):
+        get_excel_engine("cache")
+
+
+@pytest.mark.skipif(is_calamine_available(), reason="python-calamine is installed.")
+def test_get_excel_engine_calamine_not_installed():
+    with pytest.raises(ValueError, match="python-calamine"):
+        get_excel_engine("calamine")
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_read_excel_sheets_filters_same_as_select(workbook, engine):
+    def usecols(column):
+        return column in ["nace_r2_code", "1995"]
+
+    filters = {"nace_r2_code": ["A", "C"]}
+
+    sheets = read_excel_sheets(BytesIO(workbook), SHEET_NAMES, usecols, filters, engine)
+
+    for sheet, df in zip(SHEET_NAMES, sheets):
+        expected = select_rows_and_columns(
+            pd.read_excel(BytesIO(workbook), sheet_name=sheet),
+            usecols,
+            filters,
+        )
+        pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_read_excel_sheets_parses_selected_columns_only(workbook, engine, monkeypatch):
+    parsed_columns = []
+    parse = pd.ExcelFile.parse
+
+    def parse_and_record(self, *args, **kwargs):
+        df = parse(self, *args, **kwargs)
+        parsed_columns.append(list(df.columns))
+        return df
+
+    monkeypatch.setattr(pd.ExcelFile, "parse", parse_and_record)
+
+    def usecols(column):
+        return column in ["var", "1995"]
+
+    read_excel_sheets(
+        BytesIO(workbook),
+        SHEET_NAMES,
+        usecols,
+        {"nace_r2_code": ["A", "C"]},
+        engine,
+        nrows=10,
+    )
+
+    assert parsed_columns == [["1995", "nace_r2_code", "var"]] * len(SHEET_NAMES)
+
+
+def test_read_excel_sheets_nrows(workbook):
+    (df,) = read_excel_sheets(BytesIO(workbook), SHEET_NAMES[:1], nrows=2)
+
+    assert len(df) == 2
+
+
+def test_select_rows_and_columns_filter_column_missing(workbook):
+    df = pd.read_excel(BytesIO(workbook), sheet_name=SHEET_NAMES[0])
+
+    with pytest.raises(KeyError, match="banana"):
+        select_rows_and_columns(df, filters={"banana": ["A"]})
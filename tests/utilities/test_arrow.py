@@ -0,0 +1,75 @@
+"""Tests for write_arrow and read_arrow."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from measuring_intangible_capital.utilities import read_arrow, write_arrow
+
+
+@pytest.fixture()
+def shares():
+    index = pd.MultiIndex.from_product(
+        [
+            pd.array([1995, 1996], dtype=pd.Int16Dtype()),
+            pd.CategoricalIndex(["AT", "DK"]),
+        ],
+        names=["year", "country_code"],
+    )
+    return pd.DataFrame(
+        {"share_intangible": [0.1, 0.2, 0.3, np.nan], "investment_level": 1.0},
+        index=index,
+    )
+
+
+def test_roundtrip(shares, tmp_path):
+    path = tmp_path / "share_intangible" / "gdp_aggregate.arrow"
+    write_arrow(shares, path)
+
+    pd.testing.assert_frame_equal(read_arrow(path), shares)
+
+
+def test_roundtrip_country_index(tmp_path):
+    df = pd.DataFrame(
+        {"mfp": [1.0, 2.0]},
+        index=pd.Index(["AT", "DK"], name="country_code"),
+    )
+    path = tmp_path / "composition.arrow"
+    write_arrow(df, path)
+
+    pd.testing.assert_frame_equal(read_arrow(path), df)
+
+
+def test_read_columns_keeps_index(shares, tmp_path):
+    path = tmp_path / "gdp_aggregate.arrow"
+    write_arrow(shares, path)
+
+    pd.testing.assert_frame_equal(
+        read_arrow(path, columns=["investment_level"]),
+        shares[["investment_level"]],
+    )
+
+
+def test_read_is_memory_mapped(shares, tmp_path):
+    path = tmp_path / "gdp_aggregate.arrow"
+    write_arrow(shares, path)
+
+    values = read_arrow(path)["investment_level"].to_numpy()
+
+    assert not values.flags.writeable, "The values are copied, not memory-mapped."
+
+
+def test_write_df_not_data_frame(tmp_path):
+    with pytest.raises(ValueError, match="df"):
+        write_arrow(pd.Series([1.0]), tmp_path / "sr.arrow")
+
+
+@pytest.mark.parametrize("path", ["gdp_aggregate.arrow", None])
+def test_read_path_not_path(path):
+    with pytest.raises(ValueError, match="path"):
+        read_arrow(path)
+
+
+def test_write_path_not_path(shares):
+    with pytest.raises(ValueError, match="path"):
+        write_arrow(shares, str(Path("gdp_aggregate.arrow")))
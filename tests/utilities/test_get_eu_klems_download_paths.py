@@ -48,3 +48,11 @@ def test_return_type_SK():
 
     for path in paths:
         assert country_code in str(path), "The country code is not in the path."
+
+
+def test_return_selected_file_names():
+    file_names = ["intangible_analytical", "growth_accounts"]
+
+    result = get_eu_klems_download_paths("AT", file_names)
+
+    assert list(result.keys()) == file_names
@@ -0,0 +1,35 @@
+"""Tests for get_eu_klems_file_names_to_download."""
+import pytest
+from measuring_intangible_capital.config import SRC
+from measuring_intangible_capital.utilities import (
+    get_eu_klems_file_names_to_download,
+    read_yaml,
+)
+
+
+@pytest.fixture()
+def data_info():
+    """Use real file."""
+    return read_yaml(SRC / "data_management" / "eu_klems_data_info.yaml")
+
+
+@pytest.mark.parametrize("data_info", [None, 1, 1.0, True, "banana", []])
+def test_data_info_not_dict(data_info):
+    with pytest.raises(TypeError, match="The data_info argument must be a dictionary."):
+        get_eu_klems_file_names_to_download(data_info)
+
+
+def test_data_names_missing():
+    with pytest.raises(KeyError, match="data_names"):
+        get_eu_klems_file_names_to_download({})
+
+
+def test_data_names_unknown():
+    with pytest.raises(ValueError, match="Unknown data name banana"):
+        get_eu_klems_file_names_to_download({"data_names": ["banana"]})
+
+
+def test_unused_files_not_downloaded(data_info):
+    result = get_eu_klems_file_names_to_download(data_info)
+
+    assert result == ["intangible_analytical", "national_accounts", "growth_accounts"]